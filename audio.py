@@ -3,11 +3,17 @@ Audio management for App Volume Control.
 Handles audio sessions, volume control, and system volume operations.
 """
 
-import time
-from typing import List, Dict, Any, Optional
-from pycaw.pycaw import AudioUtilities, ISimpleAudioVolume, IAudioEndpointVolume
-from comtypes import CLSCTX_ALL, cast, POINTER
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
 import logging
+import threading
+
+from audio_backend import AudioBackend, AudioDevice, BackendSession, create_default_backend
+from fade import FadeScheduler, LevelSetter
+from meter import PeakMeter
+from session_index import SessionIndex
+from tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -15,63 +21,335 @@ logger = logging.getLogger(__name__)
 class AudioSession:
     """Represents an audio session with volume control capabilities"""
     
-    def __init__(self, session_info: Dict[str, Any]):
-        self.session = session_info['session']
-        self.volume_interface = session_info['volume_interface']
-        self.pid = session_info['pid']
-        self.name = session_info['name']
-        self.session_id = session_info['session_id']
+    def __init__(self, backend: AudioBackend, backend_session: BackendSession):
+        self.backend = backend
+        self.backend_session = backend_session
+        self.pid = backend_session.pid
+        self.name = backend_session.name
+        self.session_id = backend_session.key
     
-    def set_volume(self, volume_percent: int) -> bool:
-        """Set volume for this session"""
+    def set_volume(self, volume_percent: int, verify: bool = True) -> bool:
+        """Set volume for this session, reading it back to verify unless verify=False"""
         try:
             volume_float = volume_percent / 100.0
-            self.volume_interface.SetMasterVolume(volume_float, None)
+            started = tracer.start()
+            self.backend.set_session_volume(self.backend_session, volume_float)
+            tracer.stop('session.set_volume', started)
             
-            # Verify the change was applied
-            current_volume = self.volume_interface.GetMasterVolume()
-            if abs(current_volume - volume_float) < 0.01:
-                logger.debug(f"Session {self.pid} set to {volume_percent}%")
+            if not verify:
+                logger.debug(f"Session {self.pid} set to {volume_percent}% (not verified)")
                 return True
-            else:
-                logger.warning(f"Session {self.pid} - volume mismatch: {current_volume*100:.0f}%")
-                return False
+            
+            # Verify the change was applied
+            return self.check_volume(volume_percent)
                 
         except Exception as e:
             logger.error(f"Error setting volume for {self.name} (PID: {self.pid}): {e}")
             return False
+    
+    def check_volume(self, volume_percent: int) -> bool:
+        """Check that the session volume is within 1% of the expected value"""
+        started = tracer.start()
+        current_volume = self.backend.get_session_volume(self.backend_session)
+        tracer.stop('session.verify', started)
+        if abs(current_volume - volume_percent / 100.0) < 0.01:
+            logger.debug(f"Session {self.pid} set to {volume_percent}%")
+            return True
+        logger.warning(f"Session {self.pid} - volume mismatch: {current_volume*100:.0f}%")
+        return False
+
+
+VERIFY_POLICIES = ('immediate', 'deferred', 'off')
+
+
+class VerificationStats:
+    """Thread-safe counters of volume read-back checks"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.mismatches = 0
+        self.errors = 0
+    
+    def record(self, checked: int, mismatches: int, errors: int) -> None:
+        with self._lock:
+            self.checked += checked
+            self.mismatches += mismatches
+            self.errors += errors
+    
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {'checked': self.checked, 'mismatches': self.mismatches, 'errors': self.errors}
+
+
+class VolumePlan:
+    """
+    Volume targets of several profiles merged into one set of writes.
+    Profiles must be added in execution order: a later profile overrides the
+    target of an app (or of the system volume) set by an earlier one.
+    """
+    
+    def __init__(self):
+        self.app_volumes: Dict[str, int] = {}        # lowercase app name: volume
+        self.app_owners: Dict[str, Hashable] = {}    # lowercase app name: owner that set it
+        self.app_fades: Dict[str, Tuple[float, str]] = {}  # lowercase app name: (seconds, curve), faded apps only
+        self.system_volume: Optional[int] = None
+        self.system_owner: Optional[Hashable] = None
+        self.system_fade: Optional[Tuple[float, str]] = None
+    
+    def add(self, owner: Hashable, apps: Iterable[str], volume_percent: int,
+            fade_ms: int = 0, fade_curve: str = 'linear') -> None:
+        """Add the targets of one profile, faded over fade_ms when it is positive"""
+        fade = (fade_ms / 1000.0, fade_curve) if fade_ms > 0 else None
+        for app in apps:
+            app_lc = app.lower()
+            if app_lc == 'system':
+                self.system_volume = volume_percent
+                self.system_owner = owner
+                self.system_fade = fade
+            else:
+                self.app_volumes[app_lc] = volume_percent
+                self.app_owners[app_lc] = owner
+                if fade is None:
+                    self.app_fades.pop(app_lc, None)
+                else:
+                    self.app_fades[app_lc] = fade
 
 
 class AudioManager:
     """Manages audio sessions and volume control operations"""
     
-    def __init__(self):
-        self.session_cache_duration = 10  # seconds (больше не используется)
+    def __init__(self, backend: Optional[AudioBackend] = None, write_concurrency: int = 1,
+                 verify_policy: str = 'immediate'):
+        self._backend = backend
+        self._session_index: Optional[SessionIndex] = None
+        self.write_concurrency = max(1, write_concurrency)
+        self._write_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.verify_policy = 'immediate'
+        self.set_verify_policy(verify_policy)
+        self.verify_stats = VerificationStats()
+        self._verify_pool: Optional[ThreadPoolExecutor] = None
+        # Endpoint volume interface of the default device, dropped when the default changes
+        self._endpoint = None
+        self._endpoint_generation = 0
+        self._device_notifications = False    # subscribed; the cached endpoint is invalidated on changes
+        self._notifications_tried = False
+        self._fader: Optional[FadeScheduler] = None
+        self._meter: Optional[PeakMeter] = None
+        self.meter_rate_hz = 30.0
+    
+    @property
+    def backend(self) -> AudioBackend:
+        """Audio backend, created on first use"""
+        if self._backend is None:
+            self._backend = create_default_backend()
+        return self._backend
+    
+    @property
+    def session_index(self) -> SessionIndex:
+        """Session index kept current by backend notifications, started on first use"""
+        if self._session_index is None:
+            self._session_index = SessionIndex(self.backend)
+            self._session_index.start()
+        return self._session_index
+    
+    @property
+    def fader(self) -> FadeScheduler:
+        """Fade scheduler, created on first use"""
+        with self._lock:
+            if self._fader is None:
+                self._fader = FadeScheduler(self._write_levels,
+                                            thread_init=self.backend.thread_init,
+                                            thread_uninit=self.backend.thread_uninit)
+            return self._fader
+    
+    @property
+    def meter(self) -> PeakMeter:
+        """Peak meter of all sessions, started (paused until made visible) on first use"""
+        with self._lock:
+            if self._meter is None:
+                self._meter = PeakMeter(self.backend, self.session_index, rate_hz=self.meter_rate_hz)
+                self._meter.start()
+            return self._meter
+    
+    def set_meter_rate(self, rate_hz: float) -> None:
+        """Set the peak meter sampling rate used while levels are on screen"""
+        try:
+            rate_hz = float(rate_hz)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid meter rate {rate_hz!r}, keeping {self.meter_rate_hz} Hz")
+            return
+        self.meter_rate_hz = max(1.0, rate_hz)
+        if self._meter is not None:
+            self._meter.rate_hz = self.meter_rate_hz
+    
+    def set_write_concurrency(self, workers: int) -> None:
+        """Set how many sessions are written in parallel (1 = serial, no worker threads)"""
+        try:
+            workers = max(1, int(workers))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid write concurrency {workers!r}, keeping {self.write_concurrency}")
+            return
+        with self._lock:
+            if workers == self.write_concurrency:
+                return
+            self.write_concurrency = workers
+            old_pool, self._write_pool = self._write_pool, None
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+        logger.info(f"Session write concurrency set to {workers}")
+    
+    def _get_write_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._write_pool is None:
+                # Each worker joins the backend's threading model (COM apartment for pycaw)
+                self._write_pool = ThreadPoolExecutor(max_workers=self.write_concurrency,
+                                                      thread_name_prefix="SessionWriter",
+                                                      initializer=self.backend.thread_init)
+            return self._write_pool
+    
+    def set_verify_policy(self, policy: str) -> None:
+        """
+        Choose how written volumes are read back:
+        'immediate' checks each session right after its write, 'deferred' checks all
+        sessions of a press in one pass on a background thread after the writes,
+        'off' skips the read-back.
+        """
+        policy = policy.lower()
+        if policy not in VERIFY_POLICIES:
+            raise ValueError(f"Unknown verification policy: {policy}")
+        self.verify_policy = policy
+    
+    def _write_session(self, session: AudioSession, volume_percent: int, verify: bool) -> bool:
+        if not session.set_volume(volume_percent, verify=False):
+            return False
+        if not verify:
+            return True
+        mismatches, errors = self._check_session(session, volume_percent)
+        self.verify_stats.record(1, mismatches, errors)
+        return not (mismatches or errors)
+    
+    def _check_session(self, session: AudioSession, volume_percent: int) -> Tuple[int, int]:
+        """Read one session back; returns (mismatches, errors)"""
+        try:
+            return (0, 0) if session.check_volume(volume_percent) else (1, 0)
+        except Exception as e:
+            logger.debug(f"Could not verify volume of {session.name} (PID: {session.pid}): {e}")
+            return 0, 1
+    
+    def _write_sessions(self, writes: List[Tuple[AudioSession, int]]) -> List[bool]:
+        """Set session volumes, fanning out to the worker pool when enabled"""
+        verify = self.verify_policy == 'immediate'
+        if self.write_concurrency <= 1 or len(writes) <= 1:
+            results = [self._write_session(session, volume, verify) for session, volume in writes]
+        else:
+            pool = self._get_write_pool()
+            futures = [pool.submit(self._write_session, session, volume, verify) for session, volume in writes]
+            results = [future.result() for future in futures]
+        if self.verify_policy == 'deferred':
+            written = [write for write, ok in zip(writes, results) if ok]
+            if written:
+                self._get_verify_pool().submit(self._verify_batch, written)
+        return results
+    
+    def _write_levels(self, batch: List[Tuple[LevelSetter, float]]) -> List[bool]:
+        """Fade tick writer: apply raw levels without read-back, in parallel when enabled"""
+        def write(setter: LevelSetter, level: float) -> bool:
+            try:
+                setter(level)
+                return True
+            except Exception as e:
+                logger.debug(f"Fade write failed: {e}")
+                return False
+        if self.write_concurrency <= 1 or len(batch) <= 1:
+            return [write(setter, level) for setter, level in batch]
+        pool = self._get_write_pool()
+        futures = [pool.submit(write, setter, level) for setter, level in batch]
+        return [future.result() for future in futures]
+    
+    def _start_fade(self, key: Hashable, setter: LevelSetter, read_level, volume_percent: int,
+                    fade: Tuple[float, str]) -> bool:
+        """Start (or retarget) a fade; False if the current level could not be read"""
+        fader = self.fader
+        start = fader.current_level(key)
+        if start is None:
+            try:
+                start = read_level()
+            except Exception as e:
+                logger.debug(f"Could not read volume to fade from, setting it directly: {e}")
+                return False
+        duration, curve = fade
+        fader.start_ramp(key, setter, start, volume_percent / 100.0, duration, curve)
+        return True
+    
+    def _get_verify_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._verify_pool is None:
+                self._verify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VolumeVerifier",
+                                                       initializer=self.backend.thread_init)
+            return self._verify_pool
+    
+    def _verify_batch(self, writes: List[Tuple[AudioSession, int]]) -> None:
+        """Deferred verification of all sessions written by one press"""
+        mismatches = errors = 0
+        for session, volume in writes:
+            session_mismatches, session_errors = self._check_session(session, volume)
+            mismatches += session_mismatches
+            errors += session_errors
+        self.verify_stats.record(len(writes), mismatches, errors)
+        if mismatches or errors:
+            logger.warning(f"Deferred verification: {mismatches} of {len(writes)} sessions off target, {errors} unreadable")
+            if errors:
+                self.session_index.request_reconcile()
+        else:
+            logger.debug(f"Deferred verification: {len(writes)} sessions on target")
+    
+    def get_verification_stats(self) -> Dict[str, int]:
+        """Counts of verified sessions, volume mismatches and read-back errors so far"""
+        return self.verify_stats.snapshot()
+    
+    def shutdown(self) -> None:
+        """Stop fades, metering, background session and device tracking and the worker pools"""
+        if self._meter is not None:
+            self._meter.stop()
+            self._meter = None
+        if self._fader is not None:
+            self._fader.stop()
+            self._fader = None
+        if self._session_index is not None:
+            self._session_index.stop()
+            self._session_index = None
+        self._notifications_tried = False
+        if self._device_notifications:
+            self._device_notifications = False
+            try:
+                self.backend.stop_device_notifications()
+            except Exception as e:
+                logger.debug(f"Error stopping device notifications: {e}")
+            with self._lock:
+                self._endpoint = None
+        with self._lock:
+            pools = [self._write_pool, self._verify_pool]
+            self._write_pool = self._verify_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        stats = self.verify_stats.snapshot()
+        if stats['checked']:
+            logger.info(f"Volume verification: {stats['checked']} checked, "
+                        f"{stats['mismatches']} mismatches, {stats['errors']} errors")
     
     def get_app_sessions(self, app_names: List[str]) -> List[AudioSession]:
-        """Get audio sessions for specified app names (без кэша, всегда свежий список)"""
-        app_key = tuple(sorted([n.lower() for n in app_names]))
-        sessions = AudioUtilities.GetAllSessions()
-        found_sessions = []
-        for session in sessions:
-            proc = session.Process
-            if proc and proc.name().lower() in app_key:
-                try:
-                    volume_interface = session._ctl.QueryInterface(ISimpleAudioVolume)
-                    session_info = {
-                        'session': session,
-                        'volume_interface': volume_interface,
-                        'pid': proc.pid,
-                        'name': proc.name(),
-                        'session_id': session._ctl.GetSessionIdentifier()
-                    }
-                    found_sessions.append(AudioSession(session_info))
-                except Exception as e:
-                    logger.debug(f"Failed to get volume interface for {proc.name()}: {e}")
-        return found_sessions
+        """Get audio sessions for specified app names from the session index"""
+        backend = self.backend
+        started = tracer.start()
+        sessions = [AudioSession(backend, s) for s in self.session_index.lookup_or_reconcile(app_names)]
+        tracer.stop('sessions.lookup', started)
+        return sessions
     
     def set_app_volumes(self, app_names: List[str], volume_percent: int, profile_name: str = "Unknown") -> bool:
-        """Set volume for all sessions of specified apps (без кэша, всегда свежий список)"""
+        """Set volume for all sessions of specified apps"""
         app_targets = [t for t in app_names if t.lower() != 'system']
         if not app_targets:
             return True  # No app targets to set
@@ -79,22 +357,126 @@ class AudioManager:
         if not sessions:
             logger.warning(f"[{profile_name}] No sessions found for: {', '.join(app_targets)}")
             return False
-        success_count = 0
-        for session in sessions:
-            if session.set_volume(volume_percent):
-                success_count += 1
+        success_count = sum(self._write_sessions([(session, volume_percent) for session in sessions]))
+        if success_count < len(sessions):
+            # A failed write usually means a session expired without notification
+            self.session_index.request_reconcile()
         if success_count == 0:
             logger.warning(f"[{profile_name}] No sessions were controlled successfully.")
             return False
         return True
     
-    def set_system_volume(self, volume_percent: int) -> bool:
-        """Set system master volume"""
+    def resolve_sessions(self, plan: VolumePlan) -> List[AudioSession]:
+        """Sessions of the apps targeted by a plan"""
+        if not plan.app_volumes:
+            return []
+        backend = self.backend
+        started = tracer.start()
+        sessions = [AudioSession(backend, s) for s in self.session_index.lookup_or_reconcile(plan.app_volumes)]
+        tracer.stop('sessions.lookup', started)
+        return sessions
+    
+    def apply_plan(self, plan: VolumePlan, sessions: Optional[List[AudioSession]] = None) -> Dict[str, int]:
+        """
+        Apply a volume plan with a single session lookup and one write per session.
+        sessions may be passed to reuse the result of an earlier resolve_sessions().
+        Returns the number of successfully written sessions per lowercase app name
+        ('system' is 1 when the system volume was set).
+        """
+        results: Dict[str, int] = {}
+        if plan.system_volume is not None:
+            results['system'] = 1 if self.set_system_volume(plan.system_volume, plan.system_fade) else 0
+        if not plan.app_volumes:
+            return results
+        backend = self.backend
+        if sessions is None:
+            sessions = self.resolve_sessions(plan)
+        else:
+            sessions = [session for session in sessions if session.name.lower() in plan.app_volumes]
+        faded: List[AudioSession] = []
+        writes: List[Tuple[AudioSession, int]] = []
+        for session in sessions:
+            app_lc = session.name.lower()
+            fade = plan.app_fades.get(app_lc)
+            if fade is not None and self._start_fade(
+                    session.session_id, partial(backend.set_session_volume, session.backend_session),
+                    partial(backend.get_session_volume, session.backend_session),
+                    plan.app_volumes[app_lc], fade):
+                faded.append(session)
+            else:
+                writes.append((session, plan.app_volumes[app_lc]))
+        if writes and self._fader is not None:
+            # A direct write wins over a fade still running on the same session
+            self._fader.cancel([session.session_id for session, _ in writes])
+        failed = False
+        outcomes = [(session, True) for session in faded]
+        outcomes.extend(zip((session for session, _ in writes), self._write_sessions(writes)))
+        for session, ok in outcomes:
+            app_lc = session.name.lower()
+            if ok:
+                results[app_lc] = results.get(app_lc, 0) + 1
+            else:
+                results.setdefault(app_lc, 0)
+                failed = True
+        if failed:
+            # A failed write usually means a session expired without notification
+            self.session_index.request_reconcile()
+        return results
+    
+    def _get_endpoint(self):
+        """Cached endpoint volume interface of the default output device"""
+        endpoint = self._endpoint
+        if endpoint is not None:
+            return endpoint
+        if not self._notifications_tried:
+            self._notifications_tried = True
+            try:
+                self.backend.start_device_notifications(self._on_default_device_changed)
+                self._device_notifications = True
+            except Exception as e:
+                logger.warning(f"Device notifications unavailable, system volume interface will not be cached: {e}")
+        generation = self._endpoint_generation
+        endpoint = self.backend.get_default_endpoint()
+        # Only cache when invalidation is delivered and no device change raced the activation
+        with self._lock:
+            if self._device_notifications and generation == self._endpoint_generation:
+                self._endpoint = endpoint
+        return endpoint
+    
+    def _on_default_device_changed(self) -> None:
+        """Backend callback: drop everything tied to the old default device"""
+        with self._lock:
+            self._endpoint = None
+            self._endpoint_generation += 1
+        logger.info("Default audio device changed")
+        if self._session_index is not None:
+            self._session_index.request_resubscribe()
+    
+    def set_system_volume(self, volume_percent: int, fade: Optional[Tuple[float, str]] = None) -> bool:
+        """Set system master volume, optionally fading to it over fade = (seconds, curve)"""
+        level = volume_percent / 100.0
+        if fade is not None:
+            try:
+                endpoint = self._get_endpoint()
+                if self._start_fade('system', partial(self.backend.set_endpoint_volume, endpoint),
+                                    partial(self.backend.get_endpoint_volume, endpoint), volume_percent, fade):
+                    logger.info(f"System volume fading to {volume_percent}%")
+                    return True
+            except Exception as e:
+                logger.debug(f"Could not fade system volume, setting it directly: {e}")
+        elif self._fader is not None:
+            self._fader.cancel(['system'])
+        started = tracer.start()
         try:
-            devices = AudioUtilities.GetSpeakers()
-            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            volume = cast(interface, POINTER(IAudioEndpointVolume))
-            volume.SetMasterVolumeLevelScalar(volume_percent / 100.0, None)
+            try:
+                self.backend.set_endpoint_volume(self._get_endpoint(), level)
+            except Exception as e:
+                # The cached interface may belong to a device that went away unnoticed
+                logger.debug(f"Retrying system volume with a fresh endpoint: {e}")
+                with self._lock:
+                    self._endpoint = None
+                self.backend.set_endpoint_volume(self._get_endpoint(), level)
+            tracer.stop('system.set_volume', started)
             logger.info(f"System volume set to {volume_percent}%")
             return True
         except Exception as e:
@@ -104,16 +486,19 @@ class AudioManager:
     def get_available_apps(self) -> List[str]:
         """Get list of all apps with audio sessions"""
         try:
-            sessions = AudioUtilities.GetAllSessions()
-            audio_names = set()
-            for session in sessions:
-                proc = session.Process
-                if proc:
-                    audio_names.add(proc.name())
-            return sorted(audio_names)
+            self.session_index.reconcile()
+            return self.session_index.names()
         except Exception as e:
             logger.error(f"Error getting available apps: {e}")
             return []
+    
+    def get_output_devices(self) -> List[AudioDevice]:
+        """Get list of output devices"""
+        try:
+            return self.backend.list_devices()
+        except Exception as e:
+            logger.error(f"Error listing audio devices: {e}")
+            return []
 
 
 # Global audio manager instance
@@ -0,0 +1,122 @@
+"""
+Audio backend interface for App Volume Control.
+Defines the operations the audio layer needs from the platform so that the
+pycaw implementation can be swapped for an in-memory one.
+"""
+
+import os
+from typing import Any, Callable, List
+
+
+class BackendSession:
+    """Lightweight descriptor of one audio session exposed by a backend"""
+
+    __slots__ = ('key', 'pid', 'name', 'handle')
+
+    def __init__(self, key: str, pid: int, name: str, handle: Any = None):
+        self.key = key          # Unique per session instance
+        self.pid = pid
+        self.name = name        # Process name as reported by the OS
+        self.handle = handle    # Backend-specific session object
+
+    def __repr__(self) -> str:
+        return f"BackendSession({self.name!r}, pid={self.pid}, key={self.key!r})"
+
+
+class AudioDevice:
+    """Output device as reported by a backend"""
+
+    __slots__ = ('device_id', 'name', 'is_default')
+
+    def __init__(self, device_id: str, name: str, is_default: bool = False):
+        self.device_id = device_id
+        self.name = name
+        self.is_default = is_default
+
+    def __repr__(self) -> str:
+        return f"AudioDevice({self.name!r}, default={self.is_default})"
+
+
+class AudioBackendError(Exception):
+    """Raised by backends when a call into the audio system fails"""
+
+
+SessionCreatedCallback = Callable[[BackendSession], None]
+SessionExpiredCallback = Callable[[str], None]
+DefaultDeviceChangedCallback = Callable[[], None]
+
+
+class AudioBackend:
+    """Base class for audio backends"""
+
+    def thread_init(self) -> None:
+        """Prepare the calling worker thread for backend calls"""
+
+    def thread_uninit(self) -> None:
+        """Release per-thread backend state before a worker thread exits"""
+
+    def list_sessions(self) -> List[BackendSession]:
+        """Enumerate all current audio sessions that belong to a process"""
+        raise NotImplementedError
+
+    def start_session_notifications(self, on_created: SessionCreatedCallback,
+                                    on_expired: SessionExpiredCallback) -> None:
+        """Start delivering session created/expired events (may be called from any thread)"""
+        raise NotImplementedError
+
+    def stop_session_notifications(self) -> None:
+        """Stop delivering session events"""
+        raise NotImplementedError
+
+    def get_session_volume(self, session: BackendSession) -> float:
+        """Get session volume as a scalar in the 0.0-1.0 range"""
+        raise NotImplementedError
+
+    def set_session_volume(self, session: BackendSession, level: float) -> None:
+        """Set session volume as a scalar in the 0.0-1.0 range"""
+        raise NotImplementedError
+
+    def get_session_peak(self, session: BackendSession) -> float:
+        """Get the current peak level of a session's audio in the 0.0-1.0 range"""
+        raise NotImplementedError
+
+    def get_default_endpoint(self) -> Any:
+        """Activate the endpoint volume control of the default output device"""
+        raise NotImplementedError
+
+    def get_endpoint_volume(self, endpoint: Any) -> float:
+        """Get endpoint master volume as a scalar in the 0.0-1.0 range"""
+        raise NotImplementedError
+
+    def set_endpoint_volume(self, endpoint: Any, level: float) -> None:
+        """Set endpoint master volume as a scalar in the 0.0-1.0 range"""
+        raise NotImplementedError
+
+    def list_devices(self) -> List[AudioDevice]:
+        """List audio devices known to the backend"""
+        raise NotImplementedError
+
+    def start_device_notifications(self, on_default_changed: DefaultDeviceChangedCallback) -> None:
+        """Call on_default_changed whenever the default output device changes or disappears"""
+        raise NotImplementedError
+
+    def stop_device_notifications(self) -> None:
+        """Stop delivering device events"""
+        raise NotImplementedError
+
+
+def create_backend(name: str) -> AudioBackend:
+    """Create an audio backend by name ('pycaw' or 'simulated')"""
+    name = name.lower()
+    if name == 'pycaw':
+        from pycaw_backend import PycawAudioBackend
+        return PycawAudioBackend()
+    if name == 'simulated':
+        from audio_sim import SimulatedAudioBackend
+        return SimulatedAudioBackend()
+    raise ValueError(f"Unknown audio backend: {name}")
+
+
+def create_default_backend() -> AudioBackend:
+    """Create the audio backend selected by APP_VOLUME_BACKEND (pycaw by default)"""
+    return create_backend(os.environ.get('APP_VOLUME_BACKEND', 'pycaw'))
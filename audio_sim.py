@@ -0,0 +1,260 @@
+"""
+Simulated audio backend for App Volume Control.
+Keeps audio sessions and devices in memory so the audio layer can run,
+be benchmarked and be load-tested without Windows.
+"""
+
+import threading
+import itertools
+import random
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from audio_backend import (AudioBackend, AudioBackendError, AudioDevice, BackendSession,
+                           DefaultDeviceChangedCallback, SessionCreatedCallback, SessionExpiredCallback)
+
+
+class SimulatedAudioBackend(AudioBackend):
+    """
+    In-memory audio backend that emits session created/expired events.
+
+    latency and failure_rate accept either a single value applied to every
+    backend call or a dict keyed by operation name (e.g. 'set_session_volume').
+    Latency is applied outside the internal lock, so concurrent callers
+    overlap the way they do against the real audio service.
+    """
+
+    def __init__(self, latency: Union[float, Dict[str, float]] = 0.0,
+                 jitter: float = 0.0,
+                 failure_rate: Union[float, Dict[str, float]] = 0.0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.call_counts: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, BackendSession] = {}
+        self._volumes: Dict[str, float] = {}
+        self._pinned: Dict[str, float] = {}
+        self._peaks: Dict[str, float] = {}
+        # key: (levels, seconds per level, start time, loop)
+        self._peak_traces: Dict[str, Tuple[Sequence[float], float, float, bool]] = {}
+        self._devices: Dict[str, AudioDevice] = {}
+        self._endpoint_volumes: Dict[str, float] = {}
+        self._default_device_id: Optional[str] = None
+        self._on_created: Optional[SessionCreatedCallback] = None
+        self._on_expired: Optional[SessionExpiredCallback] = None
+        self._on_default_changed: Optional[DefaultDeviceChangedCallback] = None
+        self._key_counter = itertools.count(1)
+        self._pid_counter = itertools.count(1000)
+        self._device_counter = itertools.count(1)
+        self.add_device("Simulated Speakers", default=True)
+
+    # --- Scenario control ---
+
+    def add_session(self, name: str, pid: Optional[int] = None, volume: float = 1.0) -> BackendSession:
+        """Create a session and notify subscribers"""
+        if pid is None:
+            pid = next(self._pid_counter)
+        key = f"sim|{name}|{pid}|{next(self._key_counter)}"
+        session = BackendSession(key, pid, name)
+        with self._lock:
+            self._sessions[key] = session
+            self._volumes[key] = volume
+            callback = self._on_created
+        if callback is not None:
+            callback(session)
+        return session
+
+    def remove_session(self, key: str, notify: bool = True) -> None:
+        """Expire a session; notify=False simulates a lost notification"""
+        with self._lock:
+            if self._sessions.pop(key, None) is None:
+                return
+            self._volumes.pop(key, None)
+            self._pinned.pop(key, None)
+            self._peaks.pop(key, None)
+            self._peak_traces.pop(key, None)
+            callback = self._on_expired
+        if notify and callback is not None:
+            callback(key)
+
+    def populate(self, app_names: Iterable[str], sessions_per_app: int = 1) -> List[BackendSession]:
+        """Create sessions_per_app sessions for every app name"""
+        created = []
+        for name in app_names:
+            for _ in range(sessions_per_app):
+                created.append(self.add_session(name))
+        return created
+
+    def add_device(self, name: str, default: bool = False, volume: float = 1.0) -> AudioDevice:
+        """Add an output device, optionally making it the default"""
+        with self._lock:
+            device_id = f"sim-device-{next(self._device_counter)}"
+            device = AudioDevice(device_id, name)
+            self._devices[device_id] = device
+            self._endpoint_volumes[device_id] = volume
+            if default or self._default_device_id is None:
+                self._default_device_id = device_id
+        return device
+
+    def pin_session_volume(self, key: str, level: Optional[float]) -> None:
+        """Make a session ignore writes and stay at level (None releases it)"""
+        with self._lock:
+            if level is None:
+                self._pinned.pop(key, None)
+            else:
+                self._pinned[key] = level
+                self._volumes[key] = level
+
+    def set_session_peak(self, key: str, level: float) -> None:
+        """Set the constant peak level a session reports (replaces any trace)"""
+        with self._lock:
+            self._peak_traces.pop(key, None)
+            self._peaks[key] = level
+
+    def play_peak_trace(self, key: str, levels: Sequence[float], interval: float, loop: bool = False) -> None:
+        """
+        Script a session's peak level: levels[i] is reported from i * interval seconds
+        after this call; afterwards the trace repeats (loop=True) or holds its last level.
+        """
+        with self._lock:
+            self._peak_traces[key] = (levels, interval, time.monotonic(), loop)
+
+    def set_default_device(self, device_id: str) -> None:
+        """Switch the default output device and notify subscribers"""
+        with self._lock:
+            if device_id not in self._devices:
+                raise KeyError(device_id)
+            if device_id == self._default_device_id:
+                return
+            self._default_device_id = device_id
+            callback = self._on_default_changed
+        if callback is not None:
+            callback()
+
+    def remove_device(self, device_id: str) -> None:
+        """Unplug a device; the first remaining device becomes the default"""
+        with self._lock:
+            if self._devices.pop(device_id, None) is None:
+                return
+            self._endpoint_volumes.pop(device_id, None)
+            was_default = device_id == self._default_device_id
+            if was_default:
+                self._default_device_id = next(iter(self._devices), None)
+            callback = self._on_default_changed
+        if was_default and callback is not None:
+            callback()
+
+    def endpoint_volume(self, device_id: str) -> Optional[float]:
+        """Current volume of a device without counting it as a backend call"""
+        with self._lock:
+            return self._endpoint_volumes.get(device_id)
+
+    def session_volume(self, key: str) -> Optional[float]:
+        """Current volume of a session without counting it as a backend call"""
+        with self._lock:
+            return self._volumes.get(key)
+
+    def reset_counters(self) -> None:
+        """Clear per-operation call counts"""
+        with self._lock:
+            self.call_counts.clear()
+
+    def _call(self, op: str) -> None:
+        """Account for a backend call, applying simulated latency and failures"""
+        with self._lock:
+            self.call_counts[op] += 1
+            latency = self.latency.get(op, 0.0) if isinstance(self.latency, dict) else self.latency
+            failure_rate = self.failure_rate.get(op, 0.0) if isinstance(self.failure_rate, dict) else self.failure_rate
+            if self.jitter:
+                latency = max(0.0, latency + self._random.uniform(-self.jitter, self.jitter))
+            failed = failure_rate > 0 and self._random.random() < failure_rate
+        if latency > 0:
+            # Sleeping releases the GIL like a blocking COM call does
+            time.sleep(latency)
+        if failed:
+            raise AudioBackendError(f"Simulated failure in {op}")
+
+    # --- AudioBackend ---
+
+    def list_sessions(self) -> List[BackendSession]:
+        self._call('list_sessions')
+        with self._lock:
+            return list(self._sessions.values())
+
+    def start_session_notifications(self, on_created: SessionCreatedCallback,
+                                    on_expired: SessionExpiredCallback) -> None:
+        with self._lock:
+            self._on_created = on_created
+            self._on_expired = on_expired
+
+    def stop_session_notifications(self) -> None:
+        with self._lock:
+            self._on_created = None
+            self._on_expired = None
+
+    def get_session_volume(self, session: BackendSession) -> float:
+        self._call('get_session_volume')
+        with self._lock:
+            if session.key not in self._volumes:
+                raise AudioBackendError(f"Session expired: {session.key}")
+            return self._volumes[session.key]
+
+    def set_session_volume(self, session: BackendSession, level: float) -> None:
+        self._call('set_session_volume')
+        with self._lock:
+            if session.key not in self._volumes:
+                raise AudioBackendError(f"Session expired: {session.key}")
+            self._volumes[session.key] = self._pinned.get(session.key, level)
+
+    def get_session_peak(self, session: BackendSession) -> float:
+        self._call('get_session_peak')
+        with self._lock:
+            if session.key not in self._volumes:
+                raise AudioBackendError(f"Session expired: {session.key}")
+            trace = self._peak_traces.get(session.key)
+            if trace is None:
+                return self._peaks.get(session.key, 0.0)
+            levels, interval, started, loop = trace
+            step = int((time.monotonic() - started) / interval)
+            if step >= len(levels):
+                step = step % len(levels) if loop else len(levels) - 1
+            return levels[step]
+
+    def get_default_endpoint(self) -> str:
+        self._call('get_default_endpoint')
+        with self._lock:
+            if self._default_device_id is None:
+                raise AudioBackendError("No default output device")
+            return self._default_device_id
+
+    def get_endpoint_volume(self, endpoint: str) -> float:
+        self._call('get_endpoint_volume')
+        with self._lock:
+            if endpoint not in self._endpoint_volumes:
+                raise AudioBackendError(f"Device removed: {endpoint}")
+            return self._endpoint_volumes[endpoint]
+
+    def set_endpoint_volume(self, endpoint: str, level: float) -> None:
+        self._call('set_endpoint_volume')
+        with self._lock:
+            if endpoint not in self._endpoint_volumes:
+                raise AudioBackendError(f"Device removed: {endpoint}")
+            self._endpoint_volumes[endpoint] = level
+
+    def list_devices(self) -> List[AudioDevice]:
+        self._call('list_devices')
+        with self._lock:
+            return [AudioDevice(d.device_id, d.name, d.device_id == self._default_device_id)
+                    for d in self._devices.values()]
+
+    def start_device_notifications(self, on_default_changed: DefaultDeviceChangedCallback) -> None:
+        with self._lock:
+            self._on_default_changed = on_default_changed
+
+    def stop_device_notifications(self) -> None:
+        with self._lock:
+            self._on_default_changed = None
@@ -0,0 +1,771 @@
+"""
+Benchmarks for App Volume Control.
+Measures hot-path costs against the simulated audio backend, so they run
+anywhere (including Linux CI) without real audio devices.
+
+Usage: python benchmark.py [--latency MS] [--repeat N] [--recording FILE] [benchmark ...]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import config as config_module
+from audio import AudioManager, VolumePlan
+from audio_sim import SimulatedAudioBackend
+from fade import FadeScheduler
+from meter import PeakMeter
+from tracing import tracer
+from hotkeys import HotkeyManager, compile_profiles
+from keyboard_backend import FakeKeyboardBackend, typing_session
+from hotkey_matcher import HotkeyMatcher
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], None]] = {}
+FAILURES: List[str] = []
+
+
+def benchmark(name: str):
+    """Register a benchmark function under the given name"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def measure(func: Callable[[], object], repeat: int) -> List[float]:
+    """Run func repeat times and return the duration of each run in seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: List[float], unit: str = 'ms') -> None:
+    """Print p50/p95/max of the samples in milliseconds (or microseconds with unit='us')"""
+    scale = 1e6 if unit == 'us' else 1e3
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"  {label:<40} p50 {statistics.median(ordered) * scale:9.3f} {unit}"
+          f"   p95 {p95 * scale:9.3f} {unit}   max {ordered[-1] * scale:9.3f} {unit}")
+
+
+def check(condition: bool, message: str) -> None:
+    """Record an expectation of a benchmark; main() exits non-zero if any failed"""
+    if not condition:
+        FAILURES.append(message)
+        print(f"  FAILED: {message}")
+
+
+def simulated_backend(args: argparse.Namespace, **kwargs) -> SimulatedAudioBackend:
+    """Create a simulated backend with the latency requested on the command line"""
+    return SimulatedAudioBackend(latency=args.latency / 1000.0, seed=1, **kwargs)
+
+
+@benchmark('hot_path')
+def bench_hot_path(args: argparse.Namespace) -> None:
+    """Session lookup and volume write for one hotkey press at growing session counts"""
+    targets = ['Discord.exe']
+    for total in (60, 1000, 5000):
+        backend = simulated_backend(args)
+        backend.populate([f"app{i}.exe" for i in range(total - 4)])
+        backend.populate(targets, sessions_per_app=4)
+        manager = AudioManager(backend)
+        manager.session_index.start()
+        print(f"{total} sessions, {args.latency} ms per backend call:")
+
+        def full_scan():
+            return [s for s in backend.list_sessions() if s.name.lower() == 'discord.exe']
+
+        report("full enumeration (previous behaviour)", measure(full_scan, args.repeat))
+        report("indexed lookup", measure(lambda: manager.get_app_sessions(targets), args.repeat))
+        report("set_app_volumes", measure(lambda: manager.set_app_volumes(targets, 20), args.repeat))
+        manager.shutdown()
+
+
+def profile_config(count: int, hotkey: str = 'f9', apps_per_profile: int = 2) -> Dict:
+    """Config dict with count profiles on one hotkey targeting overlapping apps"""
+    profiles = []
+    for i in range(count):
+        profiles.append({
+            "name": f"Profile {i + 1}",
+            "hotkey": hotkey,
+            "low_volume": 20,
+            "high_volume": 100,
+            "apps": [f"app{(i + j) % (count + 1)}.exe" for j in range(apps_per_profile)],
+            "enabled": True,
+            "priority": i + 1,
+        })
+    return {"version": 3, "profiles": profiles}
+
+
+@benchmark('multi_profile')
+def bench_multi_profile(args: argparse.Namespace) -> None:
+    """One hotkey bound to several profiles: per-profile execution vs one merged plan"""
+    for count in (1, 5, 20):
+        backend = simulated_backend(args)
+        backend.populate([f"app{i}.exe" for i in range(count + 1)], sessions_per_app=4)
+        manager = HotkeyManager(AudioManager(backend))
+        manager.reload_profiles(profile_config(count))
+        manager.audio_manager.session_index.start()
+        indices = manager.hotkey_profiles['f9']
+        state = {"volume_low": False}
+        print(f"{count} profile(s) on one hotkey, {args.latency} ms per backend call:")
+
+        def per_profile():
+            for idx in indices:
+                manager.toggle_profile_volume(idx, state)
+
+        report("profile by profile", measure(per_profile, args.repeat))
+        backend.reset_counters()
+        report("merged plan", measure(lambda: manager.execute_hotkey_profiles('f9'), args.repeat))
+        print(f"  session writes per press (merged): {backend.call_counts['set_session_volume'] / args.repeat:.0f}")
+        manager.audio_manager.shutdown()
+
+
+@benchmark('dispatch')
+def bench_dispatch(args: argparse.Namespace) -> None:
+    """Keyboard hook callback cost with a slow backend, and coalescing of press bursts"""
+    backend = SimulatedAudioBackend(latency=max(args.latency, 5.0) / 1000.0, seed=1)
+    backend.populate(['app0.exe', 'app1.exe', 'app2.exe'], sessions_per_app=4)
+    manager = HotkeyManager(AudioManager(backend))
+    manager.reload_profiles(profile_config(2))
+    manager.audio_manager.session_index.start()
+    manager.dispatcher.start()
+    print(f"{max(args.latency, 5.0)} ms per backend call:")
+
+    def tap():
+        manager.on_hotkey('f9')
+        manager.on_hotkey_release('f9')
+
+    report("hook callbacks (press + release)", measure(tap, args.repeat), unit='us')
+    manager.dispatcher.wait_idle()
+    backend.reset_counters()
+    start = time.perf_counter()
+    for _ in range(9):
+        tap()
+    manager.dispatcher.wait_idle()
+    print(f"  burst of 9 presses handled in {(time.perf_counter() - start) * 1000:.1f} ms with "
+          f"{backend.call_counts['set_session_volume']} session writes, "
+          f"final state volume_low={manager.hotkey_states['f9']['volume_low']}")
+    manager.shutdown()
+    manager.audio_manager.shutdown()
+
+
+@benchmark('parallel_writes')
+def bench_parallel_writes(args: argparse.Namespace) -> None:
+    """Serial vs parallel session writes for apps exposing many sessions"""
+    latency = max(args.latency, 0.5)
+    for sessions in (20, 40):
+        print(f"{sessions} sessions, {latency} ms per backend call:")
+        for workers in (1, 2, 4, 8):
+            backend = SimulatedAudioBackend(latency=latency / 1000.0, seed=1)
+            backend.populate(['chrome.exe'], sessions_per_app=sessions)
+            manager = AudioManager(backend, write_concurrency=workers)
+            manager.session_index.start()
+            label = "serial" if workers == 1 else f"{workers} workers"
+            report(label, measure(lambda: manager.set_app_volumes(['chrome.exe'], 30), max(1, args.repeat // 10)))
+            manager.shutdown()
+
+
+@benchmark('verification')
+def bench_verification(args: argparse.Namespace) -> None:
+    """Press latency and read-back results for each volume verification policy"""
+    latency = max(args.latency, 0.5)
+    print(f"30 sessions (2 ignore writes), {latency} ms per backend call:")
+    for policy in ('immediate', 'deferred', 'off'):
+        backend = SimulatedAudioBackend(latency=latency / 1000.0, seed=1)
+        sessions = backend.populate(['chrome.exe'], sessions_per_app=30)
+        for session in sessions[:2]:
+            backend.pin_session_volume(session.key, 1.0)
+        manager = AudioManager(backend, verify_policy=policy)
+        manager.session_index.start()
+        report(policy, measure(lambda: manager.set_app_volumes(['chrome.exe'], 30), max(1, args.repeat // 10)))
+        manager.shutdown()
+        print(f"    {manager.get_verification_stats()}")
+
+
+@benchmark('system_volume')
+def bench_system_volume(args: argparse.Namespace) -> None:
+    """System volume write with the cached endpoint vs activating it on every press"""
+    latency = max(args.latency, 0.5)
+    backend = SimulatedAudioBackend(latency=latency / 1000.0, seed=1)
+    manager = AudioManager(backend)
+    print(f"{latency} ms per backend call:")
+
+    def uncached():
+        manager._on_default_device_changed()
+        manager.set_system_volume(50)
+
+    report("activate per press (previous behaviour)", measure(uncached, max(1, args.repeat // 10)))
+    report("cached endpoint", measure(lambda: manager.set_system_volume(50), max(1, args.repeat // 10)))
+    manager.shutdown()
+
+    # Default device switch and removal must drop the cached endpoint
+    backend = SimulatedAudioBackend(seed=1)
+    manager = AudioManager(backend)
+    speakers = backend.get_default_endpoint()
+    headphones = backend.add_device("Simulated Headphones").device_id
+    for volume in (40, 50, 60):
+        manager.set_system_volume(volume)
+    check(backend.call_counts['get_default_endpoint'] == 2,
+          f"endpoint activated {backend.call_counts['get_default_endpoint'] - 1} times for 3 presses, expected 1")
+    backend.set_default_device(headphones)
+    manager.set_system_volume(30)
+    check(backend.endpoint_volume(headphones) == 0.3 and backend.endpoint_volume(speakers) == 0.6,
+          "system volume after a default device switch did not go to the new device")
+    backend.remove_device(headphones)
+    manager.set_system_volume(70)
+    check(backend.endpoint_volume(speakers) == 0.7, "system volume after removing the default device was lost")
+    manager.shutdown()
+
+
+@benchmark('fade')
+def bench_fade(args: argparse.Namespace) -> None:
+    """Per-tick cost of the fade scheduler and CPU used by a full fade at growing session counts"""
+    for sessions in (10, 50, 200):
+        print(f"{sessions} sessions fading:")
+        # Batched tick math alone, with a writer that does nothing
+        fader = FadeScheduler(lambda batch: [True] * len(batch), tick=3600.0)
+        for i in range(sessions):
+            fader.start_ramp(i, None, 1.0, 0.2, 60.0, 'logarithmic' if i % 2 else 'linear')
+        clock = [time.monotonic()]
+
+        def tick():
+            clock[0] += 0.02
+            fader.step(clock[0])
+
+        report("tick (levels + batch, no writes)", measure(tick, args.repeat), unit='us')
+        fader.stop()
+        # Whole 500 ms fade through the audio manager and the simulated backend
+        backend = simulated_backend(args)
+        backend.populate(['chrome.exe'], sessions_per_app=sessions)
+        manager = AudioManager(backend)
+        manager.session_index.start()
+        plan = VolumePlan()
+        plan.add('bench', ['chrome.exe'], 20, fade_ms=500)
+        backend.reset_counters()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        manager.apply_plan(plan)
+        manager.fader.wait_idle()
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+        writes = backend.call_counts['set_session_volume']
+        print(f"  500 ms fade: {wall * 1000:.0f} ms wall, {cpu * 1000:.1f} ms CPU, "
+              f"{writes} session writes ({writes / sessions:.0f} per session)")
+        manager.shutdown()
+
+
+@benchmark('meter')
+def bench_meter(args: argparse.Namespace) -> None:
+    """Peak meter CPU cost at 100 sessions x 30 Hz, visible and hidden"""
+    backend = simulated_backend(args)
+    sessions = backend.populate([f"app{i}.exe" for i in range(50)], sessions_per_app=2)
+    for i, session in enumerate(sessions):
+        backend.play_peak_trace(session.key, [(i * 7 + j) % 10 / 10 for j in range(20)], 0.05, loop=True)
+    manager = AudioManager(backend)
+    meter = PeakMeter(backend, manager.session_index, rate_hz=30.0)
+    print(f"{len(sessions)} sessions, {args.latency} ms per backend call:")
+    report("sample_once", measure(meter.sample_once, args.repeat), unit='us')
+    report("snapshot (30 points)", measure(lambda: meter.snapshot(30), args.repeat), unit='us')
+    report("app_levels", measure(lambda: meter.app_levels(5), args.repeat), unit='us')
+    meter.start()
+    for visible in (True, False):
+        meter.set_visible(visible)
+        backend.reset_counters()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        time.sleep(2.0)
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+        samples = backend.call_counts['get_session_peak'] / len(sessions)
+        print(f"  {'visible' if visible else 'hidden':<8} {samples / wall:5.1f} Hz, "
+              f"CPU {cpu / wall * 100:5.1f}% of one core")
+    meter.stop()
+    manager.shutdown()
+
+
+@benchmark('ducking')
+def bench_ducking(args: argparse.Namespace) -> None:
+    """Ducking control loop cost per sample and reaction time to a scripted trigger trace"""
+    backend = simulated_backend(args)
+    backend.populate([f"app{i}.exe" for i in range(50)], sessions_per_app=2)
+    trigger = backend.add_session('Discord.exe')
+    manager = HotkeyManager(AudioManager(backend))
+    profiles = [{"name": f"Duck {i}", "type": "duck", "trigger_apps": ["discord.exe", f"app{i}.exe"],
+                 "apps": [f"app{i + 10}.exe"], "low_volume": 20, "high_volume": 100,
+                 "hold_ms": 100, "release_ms": 0, "threshold": 0.1} for i in range(10)]
+    manager.reload_profiles({"version": 3, "profiles": profiles})
+    meter = manager.audio_manager.meter
+    # Grab one level vector from the sampling thread, then drive the control loop directly
+    captured = []
+    meter.add_listener(lambda levels, now: captured.append(levels.copy()))
+    while not captured:
+        time.sleep(0.01)
+    meter.stop()
+    levels = captured[0]
+    print(f"101 sessions, 10 duck profiles, {args.latency} ms per backend call:")
+    report("control loop per sample (no change)",
+           measure(lambda: manager.ducking._on_sample(levels, time.monotonic()), args.repeat), unit='us')
+    meter.start()
+    target = manager.audio_manager.session_index.lookup(['app10.exe'])[0]
+    backend.play_peak_trace(trigger.key, [0.0, 0.8], 0.2)
+    start = time.perf_counter()
+    while backend.session_volume(target.key) > 0.5 and time.perf_counter() - start < 2.0:
+        time.sleep(0.001)
+    duck_ms = (time.perf_counter() - start - 0.2) * 1000
+    print(f"  trigger loud -> target ducked in {duck_ms:.0f} ms at {meter.rate_hz:.0f} Hz sampling")
+    # A few sample periods of slack for a loaded CI machine
+    check(backend.session_volume(target.key) == 0.2 and duck_ms < 500,
+          f"target not ducked to 20% within 500 ms of the trigger getting loud ({duck_ms:.0f} ms)")
+    backend.play_peak_trace(trigger.key, [0.0], 0.2)
+    start = time.perf_counter()
+    while backend.session_volume(target.key) < 0.5 and time.perf_counter() - start < 2.0:
+        time.sleep(0.001)
+    restore_ms = (time.perf_counter() - start) * 1000
+    print(f"  trigger quiet -> target restored in {restore_ms:.0f} ms (hold 100 ms)")
+    # The last loud sample may predate the trace change by up to one sample period
+    earliest = 100 - 1000 / meter.rate_hz
+    check(backend.session_volume(target.key) == 1.0 and earliest <= restore_ms < 600,
+          f"target not restored to 100% between the 100 ms hold and 600 ms ({restore_ms:.0f} ms)")
+    manager.shutdown()
+    manager.audio_manager.shutdown()
+
+
+@benchmark('tracing')
+def bench_tracing(args: argparse.Namespace) -> None:
+    """Hotkey path with latency tracing off and on, and the per-stage breakdown it records"""
+    backend = simulated_backend(args)
+    backend.populate(['app0.exe', 'app1.exe', 'app2.exe'], sessions_per_app=4)
+    manager = HotkeyManager(AudioManager(backend))
+    manager.reload_profiles(profile_config(2))
+    manager.audio_manager.session_index.start()
+    manager.dispatcher.start()
+
+    def press():
+        manager.on_hotkey('f9')
+        manager.on_hotkey_release('f9')
+        manager.dispatcher.wait_idle()
+
+    print(f"{args.latency} ms per backend call:")
+    tracer.disable()
+    report("press, tracing off", measure(press, args.repeat), unit='us')
+    tracer.reset()
+    tracer.enable()
+    report("press, tracing on", measure(press, args.repeat), unit='us')
+    tracer.disable()
+    for stage, stats in tracer.summary().items():
+        print(f"    {stage:<20} n={stats['count']:<6} p50 {stats['p50'] * 1000:9.1f} us"
+              f"   p99 {stats['p99'] * 1000:9.1f} us   max {stats['max'] * 1000:9.1f} us")
+    manager.shutdown()
+    manager.audio_manager.shutdown()
+
+
+@benchmark('repeat')
+def bench_repeat(args: argparse.Namespace) -> None:
+    """
+    Backend calls caused by a held hotkey (OS auto-repeat) and by bouncing taps.
+    Checks that a held key acts once and that debounce merges the taps.
+    """
+    latency = max(args.latency, 0.2)
+    sessions = 8
+    print(f"{sessions} sessions, {latency} ms per backend call:")
+    # label, profile fields, expected actions (held 1 s, bouncy tap); None = not checked
+    for label, profile_extra, expected in (("repeat allowed (previous behaviour)", {"ignore_repeat": False}, None),
+                                           ("repeat ignored (default)", {}, (1, 3)),
+                                           ("repeat ignored, debounce 150 ms", {"debounce_ms": 150}, (1, 1))):
+        backend = SimulatedAudioBackend(latency=latency / 1000.0, seed=1)
+        backend.populate(['app0.exe', 'app1.exe'], sessions_per_app=sessions // 2)
+        manager = HotkeyManager(AudioManager(backend))
+        config = profile_config(1)
+        config['profiles'][0].update(profile_extra)
+        manager.reload_profiles(config)
+        manager.audio_manager.session_index.start()
+        manager.dispatcher.start()
+        backend.reset_counters()
+        # Key held for 1 s: key-down after 500 ms repeat delay, then every 33 ms, one release
+        manager.on_hotkey('f9')
+        time.sleep(0.5)
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            manager.on_hotkey('f9')
+            time.sleep(0.033)
+        manager.on_hotkey_release('f9')
+        manager.dispatcher.wait_idle()
+        held_writes = backend.call_counts['set_session_volume']
+        backend.reset_counters()
+        # Switch bounce: three taps within 40 ms
+        for _ in range(3):
+            manager.on_hotkey('f9')
+            manager.on_hotkey_release('f9')
+            time.sleep(0.02)
+        manager.dispatcher.wait_idle()
+        tap_writes = backend.call_counts['set_session_volume']
+        print(f"  {label:<40} held 1 s: {held_writes:3} session writes   "
+              f"bouncy tap: {tap_writes:3} session writes")
+        if expected is not None:
+            check(held_writes == expected[0] * sessions,
+                  f"{label}, held 1 s: expected {expected[0] * sessions} session writes, got {held_writes}")
+            check(tap_writes == expected[1] * sessions,
+                  f"{label}, bouncy tap: expected {expected[1] * sessions} session writes, got {tap_writes}")
+        manager.shutdown()
+        manager.audio_manager.shutdown()
+
+
+def replay_profiles() -> Dict:
+    """Realistic profile set: chorded toggles, a shared hotkey, a hold hotkey and a system profile"""
+    profiles = [{"name": f"Chord {i}", "hotkey": f"ctrl+alt+{i}", "apps": [f"app{i}.exe"],
+                 "low_volume": 20, "high_volume": 100} for i in range(1, 10)]
+    profiles += [
+        {"name": "Voice", "hotkey": "f9", "apps": ["discord.exe"], "low_volume": 10, "high_volume": 100},
+        {"name": "Music", "hotkey": "f9", "apps": ["spotify.exe"], "low_volume": 30, "high_volume": 80, "priority": 2},
+        {"name": "Push to talk", "hotkey": "f8", "mode": "hold", "apps": ["game.exe"], "low_volume": 15, "high_volume": 100},
+        {"name": "Master", "hotkey": "ctrl+shift+m", "apps": ["system"], "low_volume": 30, "high_volume": 70},
+    ]
+    return {"version": 3, "profiles": profiles}
+
+
+@benchmark('replay')
+def bench_replay(args: argparse.Namespace) -> None:
+    """Replay a typing session with hotkeys through the fake keyboard: hook cost and action latency"""
+    if args.recording:
+        with open(args.recording, encoding='utf-8') as f:
+            events = [tuple(event) for event in json.load(f)]
+        source = args.recording
+    else:
+        text = "The quick brown fox jumps over the lazy dog. " * 12
+        events = typing_session(text, chars_per_second=8.0, seed=1,
+                                hotkeys=['f9', 'ctrl+alt+3', 'ctrl+shift+m', 'ctrl+alt+7'], hotkey_every=40)
+        source = f"synthetic typing, {len(text)} chars"
+    backend = simulated_backend(args)
+    backend.populate([f"app{i}.exe" for i in range(1, 10)] + ['discord.exe', 'spotify.exe', 'game.exe'],
+                     sessions_per_app=2)
+    keyboard = FakeKeyboardBackend(measure=True)
+    manager = HotkeyManager(AudioManager(backend), keyboard=keyboard)
+    manager.register_all_profile_hotkeys(replay_profiles())
+    manager.audio_manager.session_index.start()
+    tracer.reset()
+    tracer.enable()
+    speed = 10.0
+    print(f"{source}: {len(events)} key events at {speed:.0f}x speed, {len(manager.registered)} hotkeys, "
+          f"{args.latency} ms per backend call:")
+    keyboard.play(events, speed=speed)
+    manager.dispatcher.wait_idle()
+    tracer.disable()
+    report("hook dispatch per key event", keyboard.callback_durations, unit='us')
+    summary = tracer.summary()
+    if 'hotkey.end_to_end' in summary:
+        stats = summary['hotkey.end_to_end']
+        print(f"  {'key event -> volume applied':<40} p50 {stats['p50'] * 1000:9.3f} us   "
+              f"p99 {stats['p99'] * 1000:9.3f} us   max {stats['max'] * 1000:9.3f} us   (n={stats['count']})")
+    print(f"  session writes: {backend.call_counts['set_session_volume']}, "
+          f"system volume writes: {backend.call_counts['set_endpoint_volume']}")
+    manager.shutdown()
+    manager.audio_manager.shutdown()
+
+
+def many_hotkeys(count: int) -> List[str]:
+    """count distinct hotkeys: chords over letters, digits and F-keys, then two-step sequences"""
+    keys = [chr(c) for c in range(ord('a'), ord('z') + 1)] + [str(d) for d in range(10)] + [f"f{n}" for n in range(1, 25)]
+    chords = [f"{mods}+{key}" for mods in ('ctrl+alt', 'ctrl+shift', 'alt+shift', 'ctrl+alt+shift') for key in keys]
+    sequences = [f"ctrl+alt+{first}, {second}" for first in 'vbnm' for second in keys]
+    return (chords + sequences)[:count]
+
+
+@benchmark('matcher')
+def bench_matcher(args: argparse.Namespace) -> None:
+    """Per-keystroke cost of one hook per hotkey vs the single-hook matcher as hotkeys grow"""
+    text = "The quick brown fox jumps over the lazy dog. " * 20
+    events = typing_session(text, seed=1, hotkeys=['ctrl+alt+v', '1', 'ctrl+shift+f9'], hotkey_every=30)
+    print(f"{len(events)} key events of typing with hotkeys:")
+    for count in (5, 50, 500):
+        hotkeys = many_hotkeys(count)
+        fired = [0]
+
+        def action():
+            fired[0] += 1
+
+        per_hotkey = FakeKeyboardBackend(measure=True)
+        for hotkey in hotkeys:
+            if ',' not in hotkey:  # add_hotkey cannot express sequences
+                per_hotkey.add_hotkey(hotkey, action)
+        per_hotkey.play(events, speed=0)
+        report(f"{count} hotkeys, one hook each", per_hotkey.callback_durations, unit='us')
+
+        single = FakeKeyboardBackend(measure=True)
+        matcher = HotkeyMatcher(scan_codes=single.scan_codes)
+        for hotkey in hotkeys:
+            matcher.add(hotkey, action)
+        single.hook(matcher.feed, suppress=True)
+        single.play(events, speed=0)
+        report(f"{count} hotkeys, single-hook matcher", single.callback_durations, unit='us')
+    print(f"  actions fired: {fired[0]}")
+
+    # The hook names keys as typed (shift+1 arrives as '!'); hotkeys must still match them
+    keyboard = FakeKeyboardBackend()
+    matcher = HotkeyMatcher(scan_codes=keyboard.scan_codes)
+    shifted = {'ctrl+shift+1': ['ctrl+shift+1'], 'alt+shift+a': ['alt+shift+a'],
+               'ctrl+alt+v, shift+2': ['ctrl+alt+v', 'shift+2']}
+    presses = {hotkey: [0, 0] for hotkey in shifted}
+    for hotkey in shifted:
+        matcher.add(hotkey, lambda h=hotkey: presses[h].__setitem__(0, presses[h][0] + 1),
+                    lambda h=hotkey: presses[h].__setitem__(1, presses[h][1] + 1))
+    keyboard.hook(matcher.feed, suppress=True)
+    for hotkey, taps in shifted.items():
+        for tap in taps:
+            keyboard.tap(tap)
+        check(presses[hotkey] == [1, 1], f"{hotkey}: expected 1 press and 1 release, got {presses[hotkey]}")
+    print(f"  shifted key names: {sum(p == [1, 1] for p in presses.values())}/{len(shifted)} hotkeys matched")
+
+
+@benchmark('config_load')
+def bench_config_load(args: argparse.Namespace) -> None:
+    """Config load latency: parsing on every call vs the stat-validated cache"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'config.json')
+        for count in (1, 100, 1000):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(profile_config(count), f, indent=4)
+            config_module.clear_config_cache()
+            print(f"{count} profiles ({os.path.getsize(path) // 1024} KiB):")
+
+            def first_load():
+                config_module.clear_config_cache()
+                return config_module.load_config_view(path)
+
+            report("parse every load (previous behaviour)",
+                   measure(lambda: config_module._parse_config(path), args.repeat), unit='us')
+            report("first load (parse + freeze)", measure(first_load, args.repeat), unit='us')
+            report("cached read-only view", measure(lambda: config_module.load_config_view(path), args.repeat), unit='us')
+            report("cached mutable copy", measure(lambda: config_module.load_config(path), args.repeat), unit='us')
+        config_module.clear_config_cache()
+
+
+
+@benchmark('config_writer')
+def bench_config_writer(args: argparse.Namespace) -> None:
+    """Write-behind config saves: cost of save(), coalescing of bursts and skipping unchanged content"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'config.json')
+        writer = config_module.ConfigWriter(delay=0.05)
+        views = [config_module.freeze_config(profile_config(100, apps_per_profile=i % 3 + 1)) for i in range(20)]
+        samples = []
+        for view in views:
+            start = time.perf_counter()
+            writer.save(path, view)
+            samples.append(time.perf_counter() - start)
+        report("save() of 100 profiles, burst of 20", samples, unit='us')
+        deadline = time.perf_counter() + 2.0
+        while writer.unwritten(path) is not None and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        print(f"  burst of 20 saves -> {writer.writes} write(s)")
+        check(writer.writes == 1, f"burst of 20 saves was written {writer.writes} times, expected once")
+        with open(path, encoding='utf-8') as f:
+            check(json.load(f) == config_module.thaw_config(views[-1]), "coalesced write does not hold the last save")
+        check(writer.is_own_write(path), "the writer's own write was reported as an external change")
+
+        writer.save(path, config_module.freeze_config(config_module.thaw_config(views[-1])))
+        writer.flush()
+        check(writer.writes == 1 and writer.skipped == 1, "saving unchanged content rewrote the file")
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(profile_config(1), f)
+        writer.save(path, views[0])
+        check(not writer.is_own_write(path), "external edit while a save was pending counted as the writer's own")
+        writer.flush()
+
+
+@benchmark('state_store')
+def bench_state_store(args: argparse.Namespace) -> None:
+    """Toggle state persistence: cost of record() and restoring states after a restart"""
+    from state_store import StateStore
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.jsonl')
+        store = StateStore(path, flush_interval=0.01, compact_lines=50)
+        store.load()
+        store.start()
+        toggles = [(f"f{i % 12 + 1}", i % 2 == 0) for i in range(args.repeat)]
+        samples = []
+        for hotkey, volume_low in toggles:
+            start = time.perf_counter()
+            store.record(hotkey, [f"Profile {hotkey}"], volume_low)
+            samples.append(time.perf_counter() - start)
+        store.stop()
+        report("record() (writes on the background thread)", samples, unit='us')
+        expected = dict(store.states)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"hotkey": "f1", "prof')  # torn last write
+        reloaded = StateStore(path, compact_lines=50).load()
+        check(reloaded == expected, "states read back after a restart differ from the recorded ones")
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        check(len(lines) == len(expected), f"state file not compacted after a torn write ({len(lines)} lines)")
+
+        config = profile_config(1)
+        store = StateStore(path)
+        store.record('f9', ['Profile 1'], True)
+        store.flush()
+        manager = HotkeyManager(AudioManager(simulated_backend(args)))
+        manager.set_state_store(StateStore(path))
+        manager.reload_profiles(config)
+        check(manager.hotkey_states.get('f9') == {"volume_low": True},
+              "saved toggle state was not restored on reload")
+        config['profiles'][0]['name'] = 'Renamed'
+        manager.reload_profiles(config)
+        check('f9' not in manager.hotkey_states, "toggle state restored for a hotkey whose profiles changed")
+        manager.set_state_store(None)
+        manager.shutdown()
+        manager.audio_manager.shutdown()
+
+
+@benchmark('profile_store')
+def bench_profile_store(args: argparse.Namespace) -> None:
+    """Profile edits and lookups as profiles grow: full recompile and linear scans vs the indexed store"""
+    for count in (10, 100, 1000):
+        hotkeys = many_hotkeys(count)
+        config = profile_config(count)
+        for i, profile in enumerate(config['profiles']):
+            profile['hotkey'] = hotkeys[i % len(hotkeys)]
+        profiles = config['profiles']
+        manager = HotkeyManager(AudioManager(simulated_backend(args)))
+        manager.reload_profiles(config)
+        edited = profiles[count // 2]
+        print(f"{count} profiles, {len(manager.snapshot.hotkeys)} hotkeys:")
+
+        def edit_and_reload():
+            edited['low_volume'] = 50 if edited['low_volume'] == 20 else 20
+            return manager.reload_profiles(config)
+
+        def scan(name):
+            for i, profile in enumerate(profiles):
+                if profile.get('name', f'Profile {i+1}') == name:
+                    return i
+
+        last = profiles[-1]['name']
+        report("edit one profile, full recompile (previous behaviour)",
+               measure(lambda: compile_profiles(config), args.repeat), unit='us')
+        report("edit one profile, incremental reload", measure(edit_and_reload, args.repeat), unit='us')
+        report("name -> index, linear scan (previous behaviour)", measure(lambda: scan(last), args.repeat), unit='us')
+        report("name -> index, store index", measure(lambda: manager.store.index_of(last), args.repeat), unit='us')
+        report("hotkey conflicts lookup", measure(lambda: manager.profiles_for_hotkey(hotkeys[0].upper()), args.repeat),
+               unit='us')
+
+        def scan_app(app):
+            app = app.lower()
+            return [i for i, profile in enumerate(profiles)
+                    if app in (target.lower() for target in profile.get('apps', []))]
+
+        app = edited['apps'][0].upper()
+        report("app -> profiles, linear scan (previous behaviour)", measure(lambda: scan_app(app), args.repeat),
+               unit='us')
+        report("app -> profiles, store index", measure(lambda: manager.store.by_app(app), args.repeat), unit='us')
+        edited['apps'] = ['moved.exe'] + edited['apps'][1:]
+        manager.reload_profiles(config)
+        check(all([p.index for p in manager.store.by_app(name)] == scan_app(name)
+                  for name in ('moved.exe', app, 'app0.exe')),
+              f"app index out of step with the profiles after an edit ({count} profiles)")
+
+
+class _StubControl:
+    """IAudioSessionControl2 stand-in: the calls PycawAudioBackend makes on session._ctl"""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def QueryInterface(self, interface):
+        return self
+
+    def GetSessionInstanceIdentifier(self) -> str:
+        return self.key
+
+
+class _StubAudioSession:
+    """pycaw AudioSession stand-in as passed to OnSessionCreated and returned by GetAllSessions"""
+
+    def __init__(self, key: str):
+        import psutil
+        self.Process = psutil.Process(os.getpid())
+        self.ProcessId = self.Process.pid
+        self._ctl = _StubControl(key)
+        self.listener = None
+
+    def register_notification(self, callback) -> None:
+        self.listener = callback
+
+    def unregister_notification(self) -> None:
+        self.listener = None
+
+
+@benchmark('session_events')
+def bench_session_events(args: argparse.Namespace) -> None:
+    """pycaw session notifications and reconciliation feeding the session index (needs pycaw)"""
+    try:
+        from pycaw_backend import PycawAudioBackend, _SessionCreatedListener
+    except ImportError as e:
+        print(f"  skipped: {e}")
+        return
+    from session_index import SessionIndex
+
+    live: List[_StubAudioSession] = []
+
+    class StubBackend(PycawAudioBackend):
+        def _enumerate(self):
+            return [wrapped for wrapped in map(self._wrap_session, live) if wrapped is not None]
+
+    backend = StubBackend()
+    index = SessionIndex(backend)
+    # What start_session_notifications wires up, without a session manager
+    backend._on_created = index._on_session_created
+    backend._on_expired = index._on_session_expired
+    listener = _SessionCreatedListener(backend)
+
+    created = _StubAudioSession('created')
+    live.append(created)
+    listener.on_session_created(created)
+    check([s.key for s in index.sessions()] == ['created'], "created notification did not reach the session index")
+    check(created.listener is not None, "created session is not watched for expiry")
+
+    found = _StubAudioSession('found')
+    live.append(found)
+    index.reconcile()
+    check('found' in backend._known, "session found by reconcile is not tracked by the backend")
+    check(found.listener is not None, "session found by reconcile is not watched for expiry")
+
+    live.remove(created)
+    index.reconcile()
+    check('created' not in backend._known, "session dropped by reconcile is still tracked by the backend")
+    check(created.listener is None, "session dropped by reconcile is still watched")
+
+    if found.listener is not None:
+        found.listener.on_state_changed("Expired", 2)
+        check(not index.sessions(), "expired session is still in the session index")
+    print(f"  sessions indexed {len(index.sessions())}, tracked by the backend {len(backend._known)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="App Volume Control benchmarks")
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--latency', type=float, default=0.0, help="simulated latency per backend call in ms")
+    parser.add_argument('--repeat', type=int, default=200, help="iterations per measurement")
+    parser.add_argument('--recording', help="JSON list of [time, key, 'down'|'up'] events for the replay benchmark")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        print(f"=== {name} ===")
+        BENCHMARKS[name](args)
+        print()
+    if FAILURES:
+        print(f"{len(FAILURES)} check(s) failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,11 @@ Handles loading, saving, and migrating configuration files.
 import os
 import json
 import sys
-from typing import Dict, Any, List
+import hashlib
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 
 
 CONFIG_VERSION = 3
@@ -22,9 +26,9 @@ def get_exe_directory() -> str:
         return os.path.abspath(".")
 
 
-def create_default_config(config_path: str) -> None:
-    """Create a default configuration file"""
-    default_config = {
+def default_config() -> Dict[str, Any]:
+    """Configuration written on first start"""
+    return {
         "version": CONFIG_VERSION,
         "profiles": [
             {
@@ -42,8 +46,22 @@ def create_default_config(config_path: str) -> None:
         "autostart": False,
         "minimize_on_start": False
     }
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(default_config, f, indent=4, ensure_ascii=False)
+
+
+def write_file_atomic(path: str, text: str) -> None:
+    """Replace path with text via a synced temp file, so readers see the old or the new file, never a torn one"""
+    temp_path = path + '.tmp'
+    # newline='' keeps the bytes equal to text, so file digests match the digest of text on Windows too
+    with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def create_default_config(config_path: str) -> None:
+    """Create a default configuration file"""
+    write_file_atomic(config_path, json.dumps(default_config(), indent=4, ensure_ascii=False))
     print(f"Default configuration file created: {config_path}\nEdit it to customize the program!")
 
 
@@ -77,43 +95,208 @@ def migrate_old_config(old_config: Dict[str, Any]) -> Dict[str, Any]:
     return old_config
 
 
-def load_config() -> Dict[str, Any]:
-    """Load configuration from file, creating default if needed"""
-    exe_dir = get_exe_directory()
-    config_path = os.path.join(exe_dir, "config.json")
+def freeze_config(value: Any) -> Any:
+    """Read-only copy of parsed JSON: dicts become mappingproxies and lists tuples"""
+    kind = type(value)
+    if kind is dict:
+        return MappingProxyType({k: v if type(v) not in _CONTAINERS else freeze_config(v) for k, v in value.items()})
+    if kind is list or kind is tuple:
+        return tuple(v if type(v) not in _CONTAINERS else freeze_config(v) for v in value)
+    if isinstance(value, Mapping):
+        return freeze_config(dict(value))
+    return value
+
+
+def thaw_config(value: Any) -> Any:
+    """Mutable copy of a frozen config (inverse of freeze_config)"""
+    kind = type(value)
+    if kind is MappingProxyType or kind is dict:
+        return {k: v if type(v) not in _FROZEN else thaw_config(v) for k, v in value.items()}
+    if kind is tuple or kind is list:
+        return [v if type(v) not in _FROZEN else thaw_config(v) for v in value]
+    return value
+
+
+_CONTAINERS = (dict, list, tuple, MappingProxyType)
+_FROZEN = (MappingProxyType, tuple, dict, list)
+
+
+# path: ((mtime_ns, size), frozen config)
+_config_cache: Dict[str, Tuple[Tuple[int, int], Mapping[str, Any]]] = {}
+_config_cache_lock = threading.Lock()
+
+
+def _stat_key(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _parse_config(config_path: str) -> Dict[str, Any]:
+    """Read and migrate a config file in memory (migrations are saved with the next save_config)"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    # Migrate if needed
+    if 'profiles' not in config:
+        config = migrate_old_config(config)
     
+    # Ensure version
+    if 'version' not in config or config['version'] < CONFIG_VERSION:
+        config['version'] = CONFIG_VERSION
+    
+    return config
+
+
+def load_config_view(config_path: Optional[str] = None) -> Mapping[str, Any]:
+    """
+    Read-only view of the configuration, parsed again only when the file's
+    modification time or size changed. Nothing is written while reading,
+    except the default config when the file does not exist yet.
+    """
+    config_path = config_path or get_config_path()
+    # A save still waiting for the writer is newer than the file
+    unwritten = config_writer.unwritten(config_path)
+    if unwritten is not None:
+        return unwritten
     try:
         if not os.path.exists(config_path):
             create_default_config(config_path)
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # Migrate if needed
-        if 'profiles' not in config:
-            config = migrate_old_config(config)
-            save_config(config)
-        
-        # Ensure version
-        if 'version' not in config or config['version'] < CONFIG_VERSION:
-            config['version'] = CONFIG_VERSION
-            save_config(config)
-        
-        return config
+        key = _stat_key(config_path)
+        cached = _config_cache.get(config_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        view = freeze_config(_parse_config(config_path))
+        with _config_cache_lock:
+            _config_cache[config_path] = (key, view)
+        return view
         
     except Exception as e:
         print(f"Error reading configuration: {e}")
-        create_default_config(config_path)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # Fall back to the defaults without overwriting the unreadable file
+        cached = _config_cache.get(config_path)
+        return cached[1] if cached is not None else freeze_config(default_config())
+
+
+def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """Load configuration as a mutable dict (a copy of the cached view)"""
+    return thaw_config(load_config_view(config_path))
+
+
+def clear_config_cache() -> None:
+    """Forget cached configs so the next load parses the file"""
+    with _config_cache_lock:
+        _config_cache.clear()
+
+
+def _file_digest(path: str) -> Optional[str]:
+    """sha256 of a file's content, None if it cannot be read"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _serialize(view: Mapping[str, Any]) -> Tuple[str, str]:
+    """Config file text for a frozen config and its sha256"""
+    text = json.dumps(thaw_config(view), indent=4, ensure_ascii=False)
+    return text, hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ConfigWriter:
+    """
+    Write-behind saving of config files on a background thread.
+
+    save() only snapshots the config and returns. Saves arriving within delay
+    seconds of each other are written once, with the last content; a write
+    whose serialized content matches what the file already holds is skipped.
+    Files are replaced atomically (temp file, fsync, rename).
+    """
+
+    def __init__(self, delay: float = 0.3):
+        self.delay = delay
+        self.writes = 0
+        self.skipped = 0
+        self._pending: Dict[str, Mapping[str, Any]] = {}  # path: frozen config to write
+        self._unwritten: Dict[str, Mapping[str, Any]] = {}  # path: newest saved config not on disk yet
+        self._hashes: Dict[str, str] = {}                 # path: sha256 of what this writer last wrote
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def save(self, path: str, view: Mapping[str, Any]) -> None:
+        """Queue a frozen config to be written to path"""
+        with self._lock:
+            self._pending[path] = view
+            self._unwritten[path] = view
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ConfigWriter", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def unwritten(self, path: str) -> Optional[Mapping[str, Any]]:
+        """Newest config saved for path that has not reached the disk yet"""
+        return self._unwritten.get(path)
+
+    def is_own_write(self, path: str) -> bool:
+        """True if path holds exactly what this writer last wrote there (or is about to write)"""
+        on_disk = _file_digest(path)
+        if on_disk is not None and on_disk == self._hashes.get(path):
+            return True
+        pending = self._unwritten.get(path)
+        # A save still queued only accounts for the change if the file already has its content
+        return pending is not None and on_disk == _serialize(pending)[1]
+
+    def flush(self) -> None:
+        """Write everything queued so far (call on exit)"""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for path, view in pending.items():
+                try:
+                    self._write(path, view)
+                except Exception as e:
+                    print(f"Error saving configuration: {e}")
+                with self._lock:
+                    if self._unwritten.get(path) is view:
+                        del self._unwritten[path]
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            # Let a burst of saves collect into one write
+            time.sleep(self.delay)
+            self._wake.clear()
+            self.flush()
+
+    def _write(self, path: str, view: Mapping[str, Any]) -> None:
+        text, digest = _serialize(view)
+        # Compare with the file as it is now: another program may have changed it since our last write
+        if digest == _file_digest(path):
+            self._hashes[path] = digest
+            self.skipped += 1
+            return
+        write_file_atomic(path, text)
+        self._hashes[path] = digest
+        self.writes += 1
+        # What was just written is what the next load would parse
+        with _config_cache_lock:
+            _config_cache[path] = (_stat_key(path), view)
+
+
+# Global config writer instance
+config_writer = ConfigWriter()
 
 
 def save_config(config_data: Dict[str, Any]) -> None:
-    """Save configuration to file"""
-    exe_dir = get_exe_directory()
-    config_path = os.path.join(exe_dir, "config.json")
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config_data, f, indent=4, ensure_ascii=False)
+    """Save configuration to file in the background (see ConfigWriter)"""
+    config_writer.save(get_config_path(), freeze_config(config_data))
+
+
+def flush_config() -> None:
+    """Write pending config saves to disk now"""
+    config_writer.flush()
 
 
 def get_config_path() -> str:
@@ -0,0 +1,180 @@
+"""
+Config file watching for App Volume Control.
+Notices changes to config.json made outside the app (inotify on Linux,
+stat polling elsewhere) and reports them once the file has settled.
+"""
+
+import os
+import sys
+import select
+import struct
+import threading
+import time
+import logging
+from typing import Callable, Optional, Tuple
+
+from config import config_writer
+
+logger = logging.getLogger(__name__)
+
+WATCH_BACKENDS = ('auto', 'inotify', 'poll')
+
+# <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class _InotifyWait:
+    """Waits for writes to one file through an inotify watch on its directory (survives atomic replaces)"""
+
+    def __init__(self, path: str):
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._name = os.fsencode(os.path.basename(path))
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.fsencode(os.path.dirname(os.path.abspath(path)))
+        if libc.inotify_add_watch(self._fd, directory, _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, "inotify_add_watch failed")
+
+    def wait(self, timeout: float) -> bool:
+        """True if the file was written within timeout seconds (events for other files are skipped)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self._fd], [], [], remaining)[0]:
+                return False
+            if self._read_events():
+                return True
+
+    def _read_events(self) -> bool:
+        changed = False
+        try:
+            while True:
+                data = os.read(self._fd, 4096)
+                offset = 0
+                while offset < len(data):
+                    _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                    offset += _EVENT_HEADER.size
+                    if data[offset:offset + length].rstrip(b'\0') == self._name:
+                        changed = True
+                    offset += length
+        except BlockingIOError:
+            pass
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollWait:
+    """Waits for changes to a file's modification time, size or inode by polling os.stat"""
+
+    def __init__(self, path: str, interval: float, stopping: threading.Event):
+        self._path = path
+        self._interval = interval
+        self._stopping = stopping
+        self._key = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def wait(self, timeout: float) -> bool:
+        waited = 0.0
+        while waited < timeout:
+            step = min(self._interval, timeout - waited)
+            if self._stopping.wait(step):
+                return False
+            waited += step
+            key = self._stat()
+            if key != self._key:
+                self._key = key
+                return True
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class ConfigWatcher:
+    """
+    Calls on_change from a background thread when the config file changes.
+
+    A burst of writes is reported once, after no further write arrived for
+    debounce seconds. Writes made by this process through save_config are
+    recognized by their content hash and not reported.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[], None], debounce: float = 0.5,
+                 backend: str = 'auto', poll_interval: float = 1.0):
+        if backend not in WATCH_BACKENDS:
+            raise ValueError(f"Unknown config watch backend: {backend}")
+        self.path = path
+        self.on_change = on_change
+        self.debounce = debounce
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.ignored_own_writes = 0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._waiter = None
+
+    def start(self) -> None:
+        """Start watching (the backend is picked here: inotify on Linux unless 'poll' was asked for)"""
+        if self._thread is not None:
+            return
+        self._waiter = None
+        if self.backend in ('auto', 'inotify') and sys.platform.startswith('linux'):
+            try:
+                self._waiter = _InotifyWait(self.path)
+                self.backend = 'inotify'
+            except (OSError, AttributeError) as e:
+                if self.backend == 'inotify':
+                    raise
+                logger.debug(f"inotify unavailable, polling config file instead: {e}")
+        elif self.backend == 'inotify':
+            raise OSError(f"inotify is not available on {sys.platform}")
+        if self._waiter is None:
+            self._waiter = _PollWait(self.path, self.poll_interval, self._stopping)
+            self.backend = 'poll'
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.path} for changes ({self.backend})")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop watching"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping.set()
+        thread.join(timeout)
+        self._thread = None
+        self._waiter.close()
+
+    def _run(self) -> None:
+        waiter = self._waiter
+        while not self._stopping.is_set():
+            if not waiter.wait(1.0):
+                continue
+            # Wait until the file has been quiet for the debounce time
+            while not self._stopping.is_set() and waiter.wait(self.debounce):
+                pass
+            if self._stopping.is_set():
+                return
+            if config_writer.is_own_write(self.path):
+                self.ignored_own_writes += 1
+                continue
+            try:
+                self.on_change()
+            except Exception as e:
+                logger.error(f"❌ Error applying config change: {e}")
@@ -0,0 +1,106 @@
+"""
+Hotkey dispatching for App Volume Control.
+Moves profile execution off the global keyboard hook onto a worker thread.
+"""
+
+import queue
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Barrier:
+    """Queue marker that is signalled once everything queued before it was handled"""
+
+    __slots__ = ('event',)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+
+_STOP = object()
+
+
+class HotkeyDispatcher:
+    """
+    Runs hotkey actions on a dedicated worker thread.
+
+    The keyboard hook only calls submit(), which enqueues the hotkey name and
+    returns immediately. The worker drains everything queued while it was busy
+    and calls handler(hotkey, presses) once per hotkey with the number of
+    presses that were coalesced into that call.
+    """
+
+    def __init__(self, handler: Callable[[str, int], None],
+                 thread_init: Optional[Callable[[], None]] = None,
+                 thread_uninit: Optional[Callable[[], None]] = None):
+        self.handler = handler
+        self.thread_init = thread_init
+        self.thread_uninit = thread_uninit
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="HotkeyDispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the worker after the already queued presses were handled"""
+        with self._start_lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def submit(self, hotkey: str) -> None:
+        """Queue one press of hotkey (called from the keyboard hook)"""
+        self._queue.put(hotkey)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every press submitted so far was handled"""
+        barrier = _Barrier()
+        self._queue.put(barrier)
+        return barrier.event.wait(timeout)
+
+    def _run(self) -> None:
+        if self.thread_init is not None:
+            self.thread_init()
+        try:
+            while True:
+                item = self._queue.get()
+                pending: Dict[str, int] = {}
+                while True:
+                    if item is _STOP:
+                        self._handle(pending)
+                        return
+                    if isinstance(item, _Barrier):
+                        self._handle(pending)
+                        pending = {}
+                        item.event.set()
+                    else:
+                        pending[item] = pending.get(item, 0) + 1
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                self._handle(pending)
+        finally:
+            if self.thread_uninit is not None:
+                self.thread_uninit()
+
+    def _handle(self, pending: Dict[str, int]) -> None:
+        for hotkey, presses in pending.items():
+            if presses > 1:
+                logger.debug(f"Coalesced {presses} presses of '{hotkey}'")
+            try:
+                self.handler(hotkey, presses)
+            except Exception as e:
+                logger.error(f"❌ Error handling hotkey '{hotkey}': {e}")
@@ -0,0 +1,143 @@
+"""
+Automatic ducking for App Volume Control.
+Lowers target apps while a trigger app (e.g. Discord) is producing sound and
+restores them once it has been quiet for the profile's hold time.
+"""
+
+import threading
+import logging
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from audio import AudioManager, VolumePlan
+from meter import PeakMeter
+
+logger = logging.getLogger(__name__)
+
+
+class DuckingController:
+    """
+    Runs the enabled "duck" profiles off the peak meter's sampling thread.
+
+    Profiles are compiled once in configure(); per sample the controller only
+    compares the meter's level vector against a (profiles x rows) trigger mask
+    and per-profile thresholds, so nothing is looked up or allocated per session.
+    """
+
+    def __init__(self, audio: AudioManager):
+        self.audio_manager = audio
+        self._lock = threading.Lock()
+        self._meter: Optional[PeakMeter] = None
+        self._profiles: Tuple[Any, ...] = ()
+        self._thresholds = np.zeros(0, dtype=np.float32)
+        self._holds = np.zeros(0)                          # seconds
+        self._ducked = np.zeros(0, dtype=np.bool_)
+        self._last_active = np.zeros(0)                    # monotonic time a trigger was last loud
+        self._masks = np.zeros((0, 0), dtype=np.bool_)     # profile x meter row: row is a trigger session
+        self._rows_version = -1
+
+    def configure(self, profiles: Sequence[Any],
+                  by_app: Optional[Callable[[str], Sequence[Any]]] = None) -> None:
+        """
+        Use the enabled duck profiles among the given compiled profiles.
+        Profiles that did not change keep their ducked state; ducked profiles
+        that were removed or changed are restored first. With by_app (app ->
+        profiles controlling it, e.g. ProfileStore.by_app) new duck profiles
+        whose targets are also switched by a hotkey profile are reported.
+        """
+        profiles = tuple(p for p in profiles if p.kind == 'duck' and p.enabled and p.trigger_set)
+        with self._lock:
+            previous = {p: i for i, p in enumerate(self._profiles)}
+            ducked = np.zeros(len(profiles), dtype=np.bool_)
+            last_active = np.zeros(len(profiles))
+            added = []
+            for i, profile in enumerate(profiles):
+                old = previous.pop(profile, None)
+                if old is not None:
+                    ducked[i] = self._ducked[old]
+                    last_active[i] = self._last_active[old]
+                else:
+                    added.append(profile)
+            restore = [self._profiles[i] for i in previous.values() if self._ducked[i]]
+            self._profiles = profiles
+            self._thresholds = np.array([p.threshold for p in profiles], dtype=np.float32)
+            self._holds = np.array([p.hold_ms / 1000.0 for p in profiles])
+            self._ducked = ducked
+            self._last_active = last_active
+            self._rows_version = -1
+        for profile in restore:
+            self._apply(profile, duck=False)
+        if by_app is not None:
+            for profile in added:
+                self._report_overlap(profile, by_app)
+
+        if profiles and self._meter is None:
+            self._meter = self.audio_manager.meter
+            self._meter.add_listener(self._on_sample)
+            logger.info(f"✅ Ducking active for: {', '.join(p.name for p in profiles)}")
+        elif not profiles and self._meter is not None:
+            self._meter.remove_listener(self._on_sample)
+            self._meter = None
+
+    def _report_overlap(self, profile: Any, by_app: Callable[[str], Sequence[Any]]) -> None:
+        """Warn when a hotkey profile also sets the volume of a duck profile's targets"""
+        apps = profile.app_targets + ('system',) if profile.has_system else profile.app_targets
+        for app in apps:
+            others = [p.name for p in by_app(app) if p.kind == 'toggle' and p.enabled]
+            if others:
+                logger.warning(f"⚠️ [{profile.name}] {app} is also switched by hotkey profile(s): "
+                               f"{', '.join(others)}; ducking and the hotkey will override each other")
+
+    def stop(self) -> None:
+        """Restore every ducked app and stop listening to the meter"""
+        self.configure(())
+
+    def _build_masks(self, rows: int) -> None:
+        """Map meter rows to the profiles they trigger (lock held)"""
+        meter = self._meter
+        self._rows_version = meter.rows_version
+        masks = np.zeros((len(self._profiles), rows), dtype=np.bool_)
+        for row, name in meter.row_names().items():
+            if row >= rows:
+                continue
+            for i, profile in enumerate(self._profiles):
+                if name in profile.trigger_set:
+                    masks[i, row] = True
+        self._masks = masks
+
+    def _on_sample(self, levels: np.ndarray, now: float) -> None:
+        """Meter listener: duck or restore profiles whose triggers crossed their threshold"""
+        with self._lock:
+            if not self._profiles:
+                return
+            if self._rows_version != self._meter.rows_version or self._masks.shape[1] != len(levels):
+                self._build_masks(len(levels))
+            active = ((levels > self._thresholds[:, None]) & self._masks).any(axis=1)
+            self._last_active[active] = now
+            to_duck = np.flatnonzero(active & ~self._ducked)
+            to_restore = np.flatnonzero(self._ducked & ~active & (now - self._last_active >= self._holds))
+            self._ducked[to_duck] = True
+            self._ducked[to_restore] = False
+            changes = [(self._profiles[i], True) for i in to_duck]
+            changes.extend((self._profiles[i], False) for i in to_restore)
+        for profile, duck in changes:
+            self._apply(profile, duck)
+
+    def _apply(self, profile: Any, duck: bool) -> None:
+        """Ramp a profile's targets down to low_volume or back up to high_volume"""
+        apps = profile.app_targets + ('system',) if profile.has_system else profile.app_targets
+        plan = VolumePlan()
+        if duck:
+            plan.add(profile.index, apps, profile.low, profile.fade_ms, profile.fade_curve)
+        else:
+            plan.add(profile.index, apps, profile.high, profile.release_ms, profile.fade_curve)
+        try:
+            self.audio_manager.apply_plan(plan)
+        except Exception as e:
+            logger.error(f"❌ [{profile.name}] Error {'ducking' if duck else 'restoring'} volume: {e}")
+            return
+        if duck:
+            logger.info(f"🔉 [{profile.name}] Ducked to {profile.low}%: {', '.join(apps)}")
+        else:
+            logger.info(f"🔊 [{profile.name}] Restored to {profile.high}%: {', '.join(apps)}")
@@ -0,0 +1,248 @@
+"""
+Volume fades for App Volume Control.
+Ramps session and system volumes over time from a single scheduler thread.
+"""
+
+import threading
+import time
+import logging
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FADE_CURVES = ('linear', 'logarithmic')
+
+# Volume setter of one ramp target (session or endpoint), level is 0.0-1.0
+LevelSetter = Callable[[float], None]
+# Writes a batch of (setter, level) pairs, returns success per pair
+BatchWriter = Callable[[List[Tuple[LevelSetter, float]]], List[bool]]
+
+# Floor of the logarithmic curve; levels below it fade as if they were silent
+_LOG_FLOOR_DB = -60.0
+# Smallest level change worth a backend write
+_MIN_STEP = 0.002
+
+
+class FadeScheduler:
+    """
+    Advances all in-flight volume ramps on one fixed-tick thread.
+
+    Ramps are keyed by their target (session key or 'system'); starting a ramp
+    on a key that is already fading retargets it from its current level, so a
+    hotkey pressed again mid-fade turns the fade around instead of jumping.
+    Per-tick levels of all ramps are computed together in NumPy arrays and each
+    target is written at most once per tick, only when its level moved.
+    """
+
+    _ARRAYS = ('_start', '_target', '_begin', '_duration', '_last', '_log')
+
+    def __init__(self, write_batch: BatchWriter, tick: float = 0.02,
+                 thread_init: Optional[Callable[[], None]] = None,
+                 thread_uninit: Optional[Callable[[], None]] = None):
+        self.write_batch = write_batch
+        self.tick = tick
+        self.thread_init = thread_init
+        self.thread_uninit = thread_uninit
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        # Ramp slots: keys/setters are lists aligned with the arrays, _slots maps key -> slot
+        self._slots: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        self._setters: List[LevelSetter] = []
+        self._count = 0
+        self._start = np.zeros(16)       # level at ramp start
+        self._target = np.zeros(16)      # level at ramp end
+        self._begin = np.zeros(16)       # monotonic start time
+        self._duration = np.zeros(16)    # seconds
+        self._last = np.zeros(16)        # last written level
+        self._log = np.zeros(16, dtype=np.bool_)
+
+    def _grow(self) -> None:
+        """Double the capacity of the ramp arrays (lock held)"""
+        for name in self._ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    def start_ramp(self, key: Hashable, setter: LevelSetter, start: float, target: float,
+                   duration: float, curve: str = 'linear') -> None:
+        """
+        Fade key from start to target over duration seconds. If key is already
+        fading, the new ramp starts from its current level and start is ignored.
+        """
+        if curve not in FADE_CURVES:
+            raise ValueError(f"Unknown fade curve: {curve}")
+        now = time.monotonic()
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                if self._count == len(self._start):
+                    self._grow()
+                slot = self._count
+                self._count += 1
+                self._slots[key] = slot
+                self._keys.append(key)
+                self._setters.append(setter)
+                self._last[slot] = start
+            else:
+                start = float(self._levels(now, slot, slot + 1)[0])
+                self._setters[slot] = setter
+            self._start[slot] = start
+            self._target[slot] = target
+            self._begin[slot] = now
+            self._duration[slot] = max(duration, 1e-6)
+            self._log[slot] = curve == 'logarithmic'
+            self._idle.clear()
+            self._ensure_thread()
+        self._wake.set()
+
+    def current_level(self, key: Hashable) -> Optional[float]:
+        """Level a fading key is at right now, None if it is not fading"""
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return None
+            return float(self._levels(time.monotonic(), slot, slot + 1)[0])
+
+    def cancel(self, keys) -> None:
+        """Stop fading the given keys, leaving them at their last written level"""
+        with self._lock:
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is not None:
+                    self._remove(slot)
+            if not self._count:
+                self._idle.set()
+
+    def active(self) -> int:
+        """Number of ramps in flight"""
+        return self._count
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every ramp has finished or was cancelled"""
+        return self._idle.wait(timeout)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Drop all ramps and stop the scheduler thread"""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+            self._thread = None
+            self._slots.clear()
+            self._keys.clear()
+            self._setters.clear()
+            self._count = 0
+            self._idle.set()
+        self._wake.set()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        self._stopping = False
+
+    def step(self, now: Optional[float] = None) -> int:
+        """Advance all ramps to now and write the targets that moved; returns the write count"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            count = self._count
+            if not count:
+                return 0
+            levels = self._levels(now, 0, count)
+            done = now >= self._begin[:count] + self._duration[:count]
+            levels[done] = self._target[:count][done]
+            moved = done | (np.abs(levels - self._last[:count]) >= _MIN_STEP)
+            slots = np.flatnonzero(moved)
+            self._last[slots] = levels[slots]
+            keys = [self._keys[slot] for slot in slots]
+            batch = [(self._setters[slot], float(levels[slot])) for slot in slots]
+            begins = {self._keys[slot]: self._begin[slot] for slot in slots}
+            finished = [self._keys[slot] for slot in np.flatnonzero(done)]
+        if not batch:
+            return 0
+        results = self.write_batch(batch)
+        # Finished ramps and targets that could not be written (e.g. expired sessions) stop fading
+        failed = [key for key, ok in zip(keys, results) if not ok]
+        if failed:
+            logger.debug(f"Cancelled {len(failed)} fade(s) after failed writes")
+        self._retire(finished + failed, begins)
+        return len(batch)
+
+    def _retire(self, keys: List[Hashable], begins: Dict[Hashable, float]) -> None:
+        """Remove ramps unless they were retargeted since begins was taken"""
+        with self._lock:
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is not None and self._begin[slot] == begins[key]:
+                    self._remove(slot)
+            if not self._count:
+                self._idle.set()
+
+    def _levels(self, now: float, lo: int, hi: int) -> np.ndarray:
+        """Current levels of slots lo..hi-1 (lock held)"""
+        start = self._start[lo:hi]
+        target = self._target[lo:hi]
+        progress = np.clip((now - self._begin[lo:hi]) / self._duration[lo:hi], 0.0, 1.0)
+        levels = start + (target - start) * progress
+        log = self._log[lo:hi]
+        if log.any():
+            # Interpolate in decibels so the fade sounds even to the ear
+            start_db = 20.0 * np.log10(np.maximum(start, 10 ** (_LOG_FLOOR_DB / 20)))
+            target_db = 20.0 * np.log10(np.maximum(target, 10 ** (_LOG_FLOOR_DB / 20)))
+            log_levels = 10 ** ((start_db + (target_db - start_db) * progress) / 20.0)
+            levels = np.where(log, log_levels, levels)
+        return levels
+
+    def _remove(self, slot: int) -> None:
+        """Remove a ramp by moving the last slot into its place (lock held)"""
+        last = self._count - 1
+        del self._slots[self._keys[slot]]
+        if slot != last:
+            for name in self._ARRAYS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            self._keys[slot] = self._keys[last]
+            self._setters[slot] = self._setters[last]
+            self._slots[self._keys[slot]] = slot
+        self._keys.pop()
+        self._setters.pop()
+        self._count = last
+
+    def _ensure_thread(self) -> None:
+        """Start the tick thread if it is not running (lock held)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="FadeScheduler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        if self.thread_init is not None:
+            self.thread_init()
+        try:
+            next_tick = time.monotonic()
+            while not self._stopping:
+                if not self._count:
+                    # Sleep without ticking until a ramp is started
+                    self._wake.wait()
+                    self._wake.clear()
+                    next_tick = time.monotonic()
+                    continue
+                try:
+                    self.step()
+                except Exception as e:
+                    logger.error(f"❌ Error advancing fades: {e}")
+                next_tick += self.tick
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    self._wake.wait(delay)
+                    self._wake.clear()
+                else:
+                    # Fell behind (slow writes): skip missed ticks instead of bursting
+                    next_tick = time.monotonic()
+        finally:
+            if self.thread_uninit is not None:
+                self.thread_uninit()
@@ -13,9 +13,12 @@ from typing import Dict, Any, List, Optional
 import pystray
 from PIL import Image
 
-from config import load_config, save_config
+from config import load_config, save_config, get_config_path
+from config_watcher import ConfigWatcher
+from models import Profile, config_model
 from audio import audio_manager
 from hotkeys import hotkey_manager
+from tracing import tracer
 from autostart import add_to_startup, remove_from_startup, is_in_startup
 from single_instance import single_instance_manager
 from utils import load_icon, get_icon_path, format_tooltip, get_all_processes
@@ -30,6 +33,7 @@ class AppVolumeControlGUI:
         self.root = None
         self.config = None
         self.tray_icon = None
+        self.config_watcher: Optional[ConfigWatcher] = None
         self.log_text = None
         self._log_buffer = []  # Буфер для логов до инициализации log_text
         self._log_handler = None  # Для кастомного лог-хендлера
@@ -434,16 +438,9 @@ class AppVolumeControlGUI:
             return
         
         self.conflicts_text.delete(1.0, tk.END)
-        profiles = self.config.get('profiles', [])
         
-        # Group profiles by hotkey
-        hotkey_groups = {}
-        for idx, profile in enumerate(profiles):
-            hotkey = profile.get('hotkey', '').lower()
-            if hotkey:
-                if hotkey not in hotkey_groups:
-                    hotkey_groups[hotkey] = []
-                hotkey_groups[hotkey].append((idx, profile))
+        # Profiles grouped by canonical hotkey (spellings like SHIFT+CTRL+A and CTRL+SHIFT+A match)
+        hotkey_groups = hotkey_manager.snapshot.by_hotkey
         
         if not hotkey_groups:
             self.conflicts_text.insert(tk.END, "No hotkeys configured.\n")
@@ -456,25 +453,22 @@ class AppVolumeControlGUI:
         for hotkey, profile_list in hotkey_groups.items():
             if len(profile_list) > 1:
                 # Check if any ENABLED profile blocks this hotkey
-                any_enabled_blocks = any(
-                    profile.get('block_hotkey', True) and profile.get('enabled', True) 
-                    for _, profile in profile_list
-                )
+                any_enabled_blocks = any(profile.block_hotkey and profile.enabled for profile in profile_list)
                 
                 # Only show as conflict if there are enabled profiles that block
                 if any_enabled_blocks:
                     conflicts_found = True
                     
                     # Header
-                    self.conflicts_text.insert(tk.END, f"⚠️  CONFLICT: Hotkey '{hotkey.upper()}' will be INTERCEPTED\n", "conflict")
+                    self.conflicts_text.insert(tk.END, f"⚠️  CONFLICT: Hotkey '{str(hotkey).upper()}' will be INTERCEPTED\n", "conflict")
                     
                     self.conflicts_text.insert(tk.END, f"{'='*60}\n")
                     
                     # List profiles
-                    for idx, profile in profile_list:
-                        name = profile.get('name', f'Profile {idx+1}')
-                        enabled = profile.get('enabled', True)
-                        block_hotkey = profile.get('block_hotkey', True)
+                    for profile in profile_list:
+                        name = profile.name
+                        enabled = profile.enabled
+                        block_hotkey = profile.block_hotkey
                         
                         status = "ENABLED" if enabled else "DISABLED"
                         block_status = "INTERCEPTS" if block_hotkey else "PASSES THROUGH"
@@ -492,15 +486,15 @@ class AppVolumeControlGUI:
                     self.conflicts_text.insert(tk.END, "  → This hotkey will NOT reach other applications because at least one ENABLED profile\n    has 'Intercept hotkey' enabled.\n\n", "explanation")
                 else:
                     # Show as shared (no conflict) if no enabled profiles block
-                    self.conflicts_text.insert(tk.END, f"ℹ️  SHARED: Hotkey '{hotkey.upper()}' will be PASSED THROUGH\n", "shared")
+                    self.conflicts_text.insert(tk.END, f"ℹ️  SHARED: Hotkey '{str(hotkey).upper()}' will be PASSED THROUGH\n", "shared")
                     
                     self.conflicts_text.insert(tk.END, f"{'='*60}\n")
                     
                     # List profiles
-                    for idx, profile in profile_list:
-                        name = profile.get('name', f'Profile {idx+1}')
-                        enabled = profile.get('enabled', True)
-                        block_hotkey = profile.get('block_hotkey', True)
+                    for profile in profile_list:
+                        name = profile.name
+                        enabled = profile.enabled
+                        block_hotkey = profile.block_hotkey
                         
                         status = "ENABLED" if enabled else "DISABLED"
                         block_status = "INTERCEPTS" if block_hotkey else "PASSES THROUGH"
@@ -534,8 +528,8 @@ class AppVolumeControlGUI:
 
     def _setup_hotkey_recording(self, hotkey_entry):
         """Set up hotkey recording functionality"""
-        from keyboard import hook, unhook_all
-        from keyboard._canonical_names import all_modifiers
+        keyboard_backend = hotkey_manager.keyboard
+        all_modifiers = keyboard_backend.modifier_names()
         
         def get_key_name(e):
             # Modifiers
@@ -550,6 +544,12 @@ class AppVolumeControlGUI:
             # If nothing matched — use e.name
             return e.name
 
+        def stop_recording_hook():
+            # Only remove the recording hook; registered profile hotkeys stay active
+            handle = self.hotkey_recording.pop('hook', None)
+            if handle is not None:
+                keyboard_backend.unhook(handle)
+
         def on_hotkey_focus_in(event):
             if self.hotkey_recording['active']:
                 return
@@ -557,11 +557,11 @@ class AppVolumeControlGUI:
             self.hotkey_recording['pressed'] = set()
             self.hotkey_recording['last_combo'] = ''
             self.hotkey_recording['old_value'] = self.hotkey_var.get()
-            hook(self.hotkey_hook, suppress=False)
+            self.hotkey_recording['hook'] = keyboard_backend.hook(self.hotkey_hook, suppress=False)
 
         def on_hotkey_focus_out(event):
             if self.hotkey_recording['active']:
-                unhook_all()
+                stop_recording_hook()
                 self.hotkey_recording['active'] = False
                 # If user didn't enter anything — return old value
                 if not self.hotkey_var.get().strip():
@@ -573,7 +573,7 @@ class AppVolumeControlGUI:
             self.hotkey_recording['pressed'].clear()
             self.hotkey_recording['last_combo'] = ''
             self.hotkey_recording['active'] = False
-            unhook_all()
+            stop_recording_hook()
             return 'break'
 
         def hotkey_hook(e):
@@ -604,7 +604,7 @@ class AppVolumeControlGUI:
                     hotkey_entry.delete(0, tk.END)
                     hotkey_entry.insert(0, self.hotkey_recording['last_combo'])
                     self.hotkey_var.set(self.hotkey_recording['last_combo'].lower())
-                    unhook_all()
+                    stop_recording_hook()
                     self.hotkey_recording['active'] = False
                     hotkey_entry.icursor(tk.END)
                     hotkey_entry.selection_clear()
@@ -678,25 +678,41 @@ class AppVolumeControlGUI:
         current = self.profile_var.get()
         if not current:
             return 0
+        index = self._find_profile_index(current)
+        return 0 if index is None else index
+    
+    def _find_profile_index(self, name: str) -> Optional[int]:
+        """Index of the profile with this name in self.config, None if there is none"""
         profiles = self.config.get('profiles', [])
+        index = hotkey_manager.store.index_of(name)
+        if index is not None and index < len(profiles) and profiles[index].get('name', f'Profile {index+1}') == name:
+            return index
+        # The store catches up on the next reload (e.g. right after adding or renaming a profile)
         for i, profile in enumerate(profiles):
-            if profile.get('name', f'Profile {i+1}') == current:
+            if profile.get('name', f'Profile {i+1}') == name:
                 return i
-        return 0
+        return None
+    
+    def _profile_at(self, index: int) -> Profile:
+        """Compiled profile of self.config's profile at index, reusing the hotkey manager's copy"""
+        data = self.config['profiles'][index]
+        profile = hotkey_manager.store.built_from(index, data)
+        # The store catches up on the next reload (e.g. right after an edit)
+        return profile if profile is not None else Profile.from_dict(index, data)
     
     def _load_profile_to_ui(self, profile_index: int) -> None:
         profiles = self.config.get('profiles', [])
         if profile_index >= len(profiles):
             return
-        profile = profiles[profile_index]
-        self.hotkey_var.set(profile.get('hotkey', ''))
-        self.low_var.set(profile.get('low_volume', 20))
-        self.high_var.set(profile.get('high_volume', 100))
-        self.priority_var.set(profile.get('priority', 1))
-        self.app_var.set(','.join(profile.get('apps', [])))
-        self.enabled_var.set(profile.get('enabled', True))
-        self.invert_var.set(profile.get('invert', False))
-        self.block_hotkey_var.set(profile.get('block_hotkey', True))
+        profile = self._profile_at(profile_index)
+        self.hotkey_var.set(profile.hotkey_text)
+        self.low_var.set(profile.low)
+        self.high_var.set(profile.high)
+        self.priority_var.set(profile.priority)
+        self.app_var.set(','.join(profile.apps))
+        self.enabled_var.set(profile.enabled)
+        self.invert_var.set(profile.invert)
+        self.block_hotkey_var.set(profile.block_hotkey)
         
         # Check for hotkey conflicts after loading
         self._check_hotkey_conflicts(profile_index)
@@ -720,9 +736,7 @@ class AppVolumeControlGUI:
         self._update_profile_list()
         self.profile_var.set(new_profile['name'])
         self._load_profile_to_ui(len(profiles) - 1)
-        hotkey_manager.clear_hotkeys()
-        self.log_message("Перерегистрация всех хоткеев после добавления профиля...")
-        hotkey_manager.register_all_profile_hotkeys()
+        hotkey_manager.register_all_profile_hotkeys(self.config)
         self.log_message(f"✅ Added new profile: {new_profile['name']}")
         
         # Update conflicts display
@@ -734,14 +748,12 @@ class AppVolumeControlGUI:
         if current_index >= len(profiles):
             return
         profile = profiles[current_index]
-        old_enabled = profile.get('enabled', True)
+        old_enabled = self._profile_at(current_index).enabled
         new_enabled = self.enabled_var.get()
         if old_enabled != new_enabled:
             profile['enabled'] = new_enabled
             save_config(self.config)
-            hotkey_manager.clear_hotkeys()
-            self.log_message("Перерегистрация всех хоткеев после изменения enabled...")
-            hotkey_manager.register_all_profile_hotkeys()
+            hotkey_manager.register_all_profile_hotkeys(self.config)
             self._load_profile_to_ui(current_index)
             profile_name = profile.get('name', f'Profile {current_index + 1}')
             status = "enabled" if new_enabled else "disabled"
@@ -759,12 +771,13 @@ class AppVolumeControlGUI:
             return
         
         profile = profiles[current_index]
-        old_invert = profile.get('invert', False)
+        old_invert = self._profile_at(current_index).invert
         new_invert = self.invert_var.get()
         
         if old_invert != new_invert:
             profile['invert'] = new_invert
             save_config(self.config)
+            hotkey_manager.reload_profiles(self.config)
             
             # Update profile info
             self._load_profile_to_ui(current_index)
@@ -784,17 +797,15 @@ class AppVolumeControlGUI:
             return
         
         profile = profiles[current_index]
-        old_block_hotkey = profile.get('block_hotkey', True)
+        old_block_hotkey = self._profile_at(current_index).block_hotkey
         new_block_hotkey = self.block_hotkey_var.get()
         
         if old_block_hotkey != new_block_hotkey:
             profile['block_hotkey'] = new_block_hotkey
             save_config(self.config)
             
-            # Re-register hotkeys to apply new blocking behavior
-            hotkey_manager.clear_hotkeys()
-            self.log_message("Перерегистрация всех хоткеев после изменения блокировки...")
-            hotkey_manager.register_all_profile_hotkeys()
+            # Re-hook the affected hotkey to apply new blocking behavior
+            hotkey_manager.register_all_profile_hotkeys(self.config)
             
             # Update profile info
             self._load_profile_to_ui(current_index)
@@ -827,22 +838,19 @@ class AppVolumeControlGUI:
         if not current_hotkey:
             return
         
-        # Find all profiles with the same hotkey (including current one from UI)
-        conflicting_profiles = []
-        for idx, profile in enumerate(profiles):
-            profile_hotkey = profile.get('hotkey', '').lower()
-            if idx != current_profile_index and profile_hotkey == current_hotkey:
-                conflicting_profiles.append((idx, profile))
+        # Other profiles with the same hotkey in any spelling (conflict index lookup)
+        conflicting_profiles = [p for p in hotkey_manager.profiles_for_hotkey(current_hotkey)
+                                if p.index != current_profile_index]
         
         if conflicting_profiles:
             # Check if any conflicting profile blocks the hotkey
-            any_blocks = any(profile.get('block_hotkey', True) for _, profile in conflicting_profiles)
+            any_blocks = any(profile.block_hotkey for profile in conflicting_profiles)
             # Get current block_hotkey from UI
             current_blocks = self.block_hotkey_var.get()
             
             if any_blocks or current_blocks:
                 # Show warning about blocking behavior
-                conflict_names = [profile.get('name', f'Profile {idx+1}') for idx, profile in conflicting_profiles]
+                conflict_names = [profile.name for profile in conflicting_profiles]
                 current_name = profiles[current_profile_index].get('name', f'Profile {current_profile_index+1}')
                 
                 if any_blocks and not current_blocks:
@@ -884,9 +892,7 @@ class AppVolumeControlGUI:
             profiles.pop(current_index)
             self.config['profiles'] = profiles
             save_config(self.config)
-            hotkey_manager.clear_hotkeys()
-            self.log_message("Перерегистрация всех хоткеев после удаления профиля...")
-            hotkey_manager.register_all_profile_hotkeys()
+            hotkey_manager.register_all_profile_hotkeys(self.config)
             self._update_profile_list()
             if current_index >= len(profiles):
                 idx = len(profiles) - 1
@@ -944,14 +950,14 @@ class AppVolumeControlGUI:
                 return
             
             # Check for duplicate names
-            existing_names = [p.get('name', f'Profile {i+1}') for i, p in enumerate(profiles) if i != current_index]
-            if new_name in existing_names:
+            if self._find_profile_index(new_name) not in (None, current_index):
                 messagebox.showwarning("Duplicate Name", f"Profile name '{new_name}' already exists.", parent=self.root)
                 return
             
             profiles[current_index]['name'] = new_name
             self.config['profiles'] = profiles
             save_config(self.config)
+            hotkey_manager.reload_profiles(self.config)
             
             self._update_profile_list()
             self.profile_var.set(new_name)
@@ -988,10 +994,11 @@ class AppVolumeControlGUI:
             if current_index >= len(profiles):
                 return
             profile = profiles[current_index]
-            old_hotkey = profile.get('hotkey', '')
-            old_apps = profile.get('apps', [])
-            old_enabled = profile.get('enabled', True)
-            old_priority = profile.get('priority', 1)
+            old = self._profile_at(current_index)
+            old_hotkey = old.hotkey_text
+            old_apps = list(old.apps)
+            old_enabled = old.enabled
+            old_priority = old.priority
             new_hotkey = self.hotkey_var.get().strip()
             new_low_vol = int(self.low_var.get())
             new_high_vol = int(self.high_var.get())
@@ -1024,13 +1031,19 @@ class AppVolumeControlGUI:
                 self.log_message(f"✅ App/Apps changed to: {', '.join(new_apps)} (session cache cleared)")
             if old_hotkey.lower() != new_hotkey.lower() or old_enabled != new_enabled or old_priority != new_priority:
                 try:
-                    hotkey_manager.clear_hotkeys()
-                    self.log_message("Перерегистрация всех хоткеев после изменения настроек профиля...")
-                    hotkey_manager.register_all_profile_hotkeys()
+                    hotkey_manager.register_all_profile_hotkeys(self.config)
                     self.log_message(f"✅ Hotkeys updated for all profiles")
                 except Exception as e:
                     self.log_message(f"❌ Error updating hotkeys: {e}")
                     messagebox.showwarning("Hotkey Error", f"Could not update hotkeys.\nPlease restart the app.\nError: {e}", parent=self.root)
+            else:
+                hotkey_manager.reload_profiles(self.config)
+            for app in new_apps:
+                if app.lower() in (old_app.lower() for old_app in old_apps):
+                    continue
+                others = [p.name for p in hotkey_manager.store.by_app(app) if p.index != current_index]
+                if others:
+                    self.log_message(f"ℹ️ {app} is also controlled by: {', '.join(others)}")
             self._load_profile_to_ui(current_index)
             self._update_tray_tooltip()
             self.log_message("✅ Configuration saved!")
@@ -1057,24 +1070,24 @@ class AppVolumeControlGUI:
         if current_index >= len(profiles):
             return
         
-        profile = profiles[current_index]
+        profile = self._profile_at(current_index)
         changed = False
         try:
-            if self.hotkey_var.get().strip() != profile.get('hotkey', ''):
+            if self.hotkey_var.get().strip() != profile.hotkey_text:
                 changed = True
-            elif int(self.low_var.get()) != profile.get('low_volume', 20):
+            elif int(self.low_var.get()) != profile.low:
                 changed = True
-            elif int(self.high_var.get()) != profile.get('high_volume', 100):
+            elif int(self.high_var.get()) != profile.high:
                 changed = True
-            elif int(self.priority_var.get()) != profile.get('priority', 1):
+            elif int(self.priority_var.get()) != profile.priority:
                 changed = True
-            elif [t.strip() for t in self.app_var.get().split(',') if t.strip()] != profile.get('apps', []):
+            elif tuple(t.strip() for t in self.app_var.get().split(',') if t.strip()) != profile.apps:
                 changed = True
-            elif self.enabled_var.get() != profile.get('enabled', True):
+            elif self.enabled_var.get() != profile.enabled:
                 changed = True
-            elif self.invert_var.get() != profile.get('invert', False):
+            elif self.invert_var.get() != profile.invert:
                 changed = True
-            elif self.block_hotkey_var.get() != profile.get('block_hotkey', True):
+            elif self.block_hotkey_var.get() != profile.block_hotkey:
                 changed = True
         except Exception:
             changed = True
@@ -1143,11 +1156,33 @@ class AppVolumeControlGUI:
         cb_frame.bind("<Configure>", on_frame_configure)
         
         vars = {}
+        level_checkbuttons = {}
         for idx, name in enumerate(sorted_names):
             var = tk.BooleanVar(value=(name in current))
             cb = ttk.Checkbutton(cb_frame, text=name, variable=var)
             cb.grid(row=idx, column=0, sticky='w', padx=4, pady=2)
             vars[name] = var
+            if name in audio_names:
+                level_checkbuttons[name] = cb
+        
+        # Live level bars next to apps with audio sessions, sampled only while the dialog is open
+        meter = audio_manager.meter
+        meter.set_visible(True)
+        shown_bars = {}
+        
+        def refresh_levels():
+            if not win.winfo_exists():
+                return
+            levels = meter.app_levels(window=5)
+            for name, cb in level_checkbuttons.items():
+                bar = '▮' * int(round(levels.get(name.lower(), 0.0) * 10))
+                if shown_bars.get(name) != bar:
+                    shown_bars[name] = bar
+                    cb.config(text=f"{name}  {bar}" if bar else name)
+            win.after(100, refresh_levels)
+        
+        win.bind('<Destroy>', lambda e: meter.set_visible(False) if e.widget is win else None)
+        refresh_levels()
         
         # Buttons on the right
         def on_set_apps():
@@ -1213,7 +1248,7 @@ class AppVolumeControlGUI:
         """Create system tray icon"""
         try:
             image = load_icon()
-            tooltip = format_tooltip(self.config.get('profiles', []))
+            tooltip = format_tooltip(config_model(self.config).profiles)
             
             def on_clicked(icon, item):
                 if str(item) == "Exit":
@@ -1236,7 +1271,7 @@ class AppVolumeControlGUI:
     def _update_tray_tooltip(self) -> None:
         """Update tray icon tooltip"""
         if self.tray_icon:
-            tooltip = format_tooltip(self.config.get('profiles', []))
+            tooltip = format_tooltip(config_model(self.config).profiles)
             self.tray_icon.title = tooltip
     
     def initialize(self) -> None:
@@ -1257,8 +1292,9 @@ class AppVolumeControlGUI:
             self._load_profile_to_ui(0)
         
         # Set autostart and minimize variables
-        self.autostart_var.set(self.config.get('autostart', False) or is_in_startup())
-        self.minimize_var.set(self.config.get('minimize_on_start', False))
+        model = config_model(self.config)
+        self.autostart_var.set(model.autostart or is_in_startup())
+        self.minimize_var.set(model.minimize_on_start)
         
         # Create tray icon
         self._create_tray_icon()
@@ -1268,48 +1304,40 @@ class AppVolumeControlGUI:
         
         # Initial log messages
         self.log_message("🎵 App Volume Control started!")
-        if self.config.get('profiles', []):
-            profiles = self.config['profiles']
-            enabled_profiles = [p for p in profiles if p.get('enabled', True)]
+        if model.profiles:
+            enabled_profiles = model.enabled_profiles
             
             if enabled_profiles:
                 self.log_message(f"✅ {len(enabled_profiles)} enabled profile(s):")
                 for i, profile in enumerate(enabled_profiles):
-                    profile_name = profile.get('name', f'Profile {i+1}')
-                    hotkey = profile.get('hotkey', '').upper()
-                    self.log_message(f"  {i+1}. {profile_name} ({hotkey})")
+                    self.log_message(f"  {i+1}. {profile.name} ({profile.hotkey.upper()})")
             else:
                 self.log_message("⚠️ No enabled profiles found")
             
             # Show first enabled profile details
             if enabled_profiles:
                 first_profile = enabled_profiles[0]
-                profile_name = first_profile.get('name', 'Profile 1')
-                self.log_message(f"Active Profile: {profile_name} ({first_profile.get('hotkey', '').upper()})")
-                self.log_message(f"Volume: {first_profile.get('low_volume', 20)}% ↔ {first_profile.get('high_volume', 100)}%")
-                self.log_message(f"App/Apps: {', '.join(first_profile.get('apps', []))}")
+                self.log_message(f"Active Profile: {first_profile.name} ({first_profile.hotkey.upper()})")
+                self.log_message(f"Volume: {first_profile.low}% ↔ {first_profile.high}%")
+                self.log_message(f"App/Apps: {', '.join(first_profile.apps)}")
         
         # Check initial app sessions for first enabled profile
-        if self.config.get('profiles', []):
-            profiles = self.config['profiles']
-            enabled_profiles = [p for p in profiles if p.get('enabled', True)]
-            
-            if enabled_profiles:
-                first_profile = enabled_profiles[0]
-                initial_sessions = audio_manager.get_app_sessions(first_profile.get('apps', []))
-                if not initial_sessions:
-                    # Only log if not just system
-                    if not (len(first_profile.get('apps', [])) == 1 and first_profile.get('apps', [])[0].lower() == 'system'):
-                        self.log_message(f"❌ No sessions found at startup for: {', '.join(first_profile.get('apps', []))}!")
-                    self.log_message("💡 Make sure the app is running, playing audio and using the default device!")
-                    self.log_message("   The program will continue checking when you press the hotkey.")
-                else:
-                    self.log_message(f"✅ Found {len(initial_sessions)} sessions at startup:")
-                    for i, session in enumerate(initial_sessions):
-                        self.log_message(f"  {i+1}. PID: {session.pid}")
+        if model.enabled_profiles:
+            first_profile = model.enabled_profiles[0]
+            initial_sessions = audio_manager.get_app_sessions(first_profile.apps)
+            if not initial_sessions:
+                # Only log if not just system
+                if first_profile.app_targets:
+                    self.log_message(f"❌ No sessions found at startup for: {', '.join(first_profile.apps)}!")
+                self.log_message("💡 Make sure the app is running, playing audio and using the default device!")
+                self.log_message("   The program will continue checking when you press the hotkey.")
+            else:
+                self.log_message(f"✅ Found {len(initial_sessions)} sessions at startup:")
+                for i, session in enumerate(initial_sessions):
+                    self.log_message(f"  {i+1}. PID: {session.pid}")
         
         # Auto-minimize if configured
-        if self.config.get('minimize_on_start', False) and self.is_autostart:
+        if model.minimize_on_start and self.is_autostart:
             self.root.after(100, self._minimize_to_tray)
         
         # Call immediately after start for correct button state
@@ -1317,6 +1345,85 @@ class AppVolumeControlGUI:
         
         # Initialize conflicts display
         self._refresh_conflicts_display()
+        
+        # Pick up config.json changes made outside the app
+        self._start_config_watcher()
+    
+    def _start_config_watcher(self) -> None:
+        """Watch config.json for outside changes (disabled with config_watch = 'off')"""
+        backend = config_model(self.config).config_watch
+        if backend == 'off':
+            return
+        try:
+            self.config_watcher = ConfigWatcher(get_config_path(),
+                                                lambda: self.root.after(0, self._reload_config_from_disk),
+                                                backend=backend)
+            self.config_watcher.start()
+        except (OSError, ValueError) as e:
+            self.config_watcher = None
+            self.log_message(f"❌ Config file watching unavailable: {e}")
+    
+    def _reload_config_from_disk(self) -> None:
+        """Apply a config.json changed outside the app, updating only what differs"""
+        new_config = load_config()
+        old_config = self.config
+        if new_config == old_config:
+            return
+        self.config = new_config
+        old_profiles = old_config.get('profiles', [])
+        new_profiles = new_config.get('profiles', [])
+        
+        if new_profiles != old_profiles:
+            # Re-hooks only hotkeys whose profiles changed; toggle states of the others are kept
+            hotkey_manager.register_all_profile_hotkeys(self.config)
+            
+            old_by_name = {p.get('name', f'Profile {i+1}'): p for i, p in enumerate(old_profiles)}
+            new_names = [p.get('name', f'Profile {i+1}') for i, p in enumerate(new_profiles)]
+            changed = [name for name, p in zip(new_names, new_profiles) if old_by_name.get(name) != p]
+            removed = [name for name in old_by_name if name not in new_names]
+            if new_names != list(old_by_name):
+                self._update_profile_list()
+            
+            # Refresh the editor if its profile changed, unless it holds unsaved edits
+            current_name = self.profile_var.get()
+            if current_name in changed or current_name in removed:
+                if str(self.save_btn['state']) == 'normal' and current_name not in removed:
+                    self.log_message(f"⚠️ {current_name} changed on disk; your unsaved edits were kept")
+                else:
+                    self._load_profile_to_ui(self._get_current_profile_index())
+            self._settings_changed()
+            self._refresh_conflicts_display()
+            self._update_tray_tooltip()
+            summary = [f"{len(changed)} changed/added"] if changed else []
+            if removed:
+                summary.append(f"{len(removed)} removed")
+            self.log_message(f"🔄 Config reloaded from disk: {', '.join(summary) or 'profile order changed'}")
+        
+        old, settings = config_model(old_config), config_model(new_config)
+        if settings.minimize_on_start != self.minimize_var.get():
+            self.minimize_var.set(settings.minimize_on_start)
+        if settings.meter_rate_hz != audio_manager.meter_rate_hz:
+            audio_manager.set_meter_rate(settings.meter_rate_hz)
+        if settings.audio_write_workers != audio_manager.write_concurrency:
+            audio_manager.set_write_concurrency(settings.audio_write_workers)
+        if settings.volume_verification != audio_manager.verify_policy:
+            audio_manager.set_verify_policy(settings.volume_verification)
+            self.log_message(f"🔄 Volume verification: {settings.volume_verification}")
+        if settings.latency_tracing != tracer.enabled:
+            if settings.latency_tracing:
+                tracer.enable()
+            else:
+                tracer.disable()
+            self.log_message(f"🔄 Latency tracing {'enabled' if settings.latency_tracing else 'disabled'}")
+        if settings.autostart != old.autostart:
+            self.autostart_var.set(settings.autostart)
+            if settings.autostart:
+                add_to_startup()
+            else:
+                remove_from_startup()
+        if settings.persist_toggle_state != old.persist_toggle_state:
+            # The state store is set up before hotkeys are registered at startup
+            self.log_message("⚠️ persist_toggle_state changed on disk; restart the app to apply it")
     
     def run(self) -> None:
         """Run the GUI main loop"""
@@ -0,0 +1,187 @@
+"""
+Hotkey matching for App Volume Control.
+Matches key events from one global hook against all registered hotkeys,
+including sequences like "ctrl+alt+v, 1", in constant time per event.
+"""
+
+import itertools
+import threading
+import time
+import logging
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+from keyboard_backend import KeyEvent, canonical_key
+from hotkey_parser import MODIFIER_BITS, Hotkey, HotkeyStep, parse_hotkey
+
+logger = logging.getLogger(__name__)
+
+Action = Callable[[], None]
+ScanCodes = Callable[[str], Iterable[int]]
+
+
+class _Binding:
+    __slots__ = ('handle', 'on_press', 'on_release', 'suppress')
+
+    def __init__(self, handle: int, on_press: Optional[Action], on_release: Optional[Action], suppress: bool):
+        self.handle = handle
+        self.on_press = on_press
+        self.on_release = on_release
+        self.suppress = suppress
+
+
+class _Node:
+    """Trie node; bindings complete here, children continue the sequence"""
+
+    __slots__ = ('children', 'bindings')
+
+    def __init__(self):
+        self.children: Dict[HotkeyStep, '_Node'] = {}
+        self.bindings: Tuple[_Binding, ...] = ()
+
+
+class HotkeyMatcher:
+    """
+    Compiled hotkey state machine fed by a single keyboard hook.
+
+    Held modifiers are tracked as a bitmask next to the held keys, so every
+    key-down costs one dictionary lookup in the current trie node no matter
+    how many hotkeys are registered. Multi-step hotkeys advance through the
+    trie and fall back to the root when the next step does not arrive within
+    sequence_timeout seconds.
+
+    Event names depend on the shift state and layout (shift+1 arrives as '!'),
+    so the keys of added hotkeys are resolved to scan codes through scan_codes
+    and events are matched by scan code, falling back to the name for keys
+    that did not resolve.
+    """
+
+    def __init__(self, sequence_timeout: float = 1.0, scan_codes: Optional[ScanCodes] = None):
+        self.sequence_timeout = sequence_timeout
+        self.scan_codes = scan_codes
+        self._lock = threading.Lock()
+        self._root = _Node()
+        self._paths: Dict[int, Tuple[HotkeyStep, ...]] = {}
+        self._handles = itertools.count(1)
+        self._key_names: Dict[int, str] = {}          # scan code: canonical key of added hotkeys
+        self._mask = 0
+        self._held: Dict[Union[int, str], str] = {}   # physical key (scan code or name): canonical key
+        self._node = self._root                       # position inside a sequence
+        self._deadline = 0.0
+        self._active: Dict[Union[int, str], Tuple[_Binding, ...]] = {}  # held physical key: bindings it completed
+
+    def add(self, hotkey: Union[str, Hotkey], on_press: Optional[Action] = None, on_release: Optional[Action] = None,
+            suppress: bool = False) -> int:
+        """Bind actions to a hotkey or hotkey sequence; returns a handle for remove()"""
+        steps = (parse_hotkey(hotkey) if isinstance(hotkey, str) else hotkey).steps
+        codes = {}
+        if self.scan_codes is not None:
+            for key in {key for step in steps for key in step.keys}:
+                try:
+                    codes.update((code, key) for code in self.scan_codes(key))
+                except Exception as e:
+                    logger.debug(f"No scan code for key '{key}', matching it by name: {e}")
+        with self._lock:
+            self._key_names.update(codes)
+            handle = next(self._handles)
+            node = self._root
+            for step in steps:
+                child = node.children.get(step)
+                if child is None:
+                    child = node.children[step] = _Node()
+                node = child
+            node.bindings = node.bindings + (_Binding(handle, on_press, on_release, suppress),)
+            self._paths[handle] = steps
+        return handle
+
+    def remove(self, handle: int) -> None:
+        """Remove a binding added by add() (KeyError if unknown)"""
+        with self._lock:
+            steps = self._paths.pop(handle)
+            trail = [self._root]
+            for step in steps:
+                trail.append(trail[-1].children[step])
+            node = trail[-1]
+            node.bindings = tuple(b for b in node.bindings if b.handle != handle)
+            # Prune nodes left without bindings or children
+            for parent, step, child in zip(reversed(trail[:-1]), reversed(steps), reversed(trail[1:])):
+                if child.bindings or child.children:
+                    break
+                del parent.children[step]
+            self._node = self._root
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def feed(self, event: KeyEvent) -> bool:
+        """Process one key event; returns False when a blocking hotkey consumed it"""
+        key = canonical_key(event.name or '')
+        bit = MODIFIER_BITS.get(key)
+        if event.event_type == 'down':
+            if bit is not None:
+                self._mask |= bit
+                return True
+        elif bit is not None:
+            self._mask &= ~bit
+            return True
+        physical = event.scan_code or key
+        key = self._key_names.get(event.scan_code, key)
+        if event.event_type == 'down':
+            return self._key_down(physical, key)
+        return self._key_up(physical)
+
+    def _key_down(self, physical: Union[int, str], key: str) -> bool:
+        if physical in self._held:
+            # OS auto-repeat of a held key: repeat what it completed, if anything
+            bindings = self._active.get(physical)
+            if not bindings:
+                return True
+            return self._fire(bindings, press=True)
+        self._held[physical] = key
+        # Plain tuple: hashes and compares equal to the HotkeyStep keys of the trie
+        step = (self._mask, tuple(sorted(set(self._held.values()))) if len(self._held) > 1 else (key,))
+        node = self._node
+        now = time.monotonic()
+        if node is not self._root and now > self._deadline:
+            node = self._root
+        child = node.children.get(step)
+        if child is None and node is not self._root:
+            # Broken sequence: the key may start a new one
+            child = self._root.children.get(step)
+        if child is None:
+            self._node = self._root
+            return True
+        if child.children:
+            self._node = child
+            self._deadline = now + self.sequence_timeout
+        else:
+            self._node = self._root
+        if not child.bindings:
+            return True
+        self._active[physical] = child.bindings
+        return self._fire(child.bindings, press=True)
+
+    def _key_up(self, physical: Union[int, str]) -> bool:
+        self._held.pop(physical, None)
+        bindings = self._active.pop(physical, None)
+        if not bindings:
+            return True
+        return self._fire(bindings, press=False)
+
+    def _fire(self, bindings: Tuple[_Binding, ...], press: bool) -> bool:
+        suppress = False
+        for binding in bindings:
+            action = binding.on_press if press else binding.on_release
+            if action is not None:
+                try:
+                    action()
+                except Exception as e:
+                    logger.error(f"❌ Hotkey action failed: {e}")
+            suppress = suppress or binding.suppress
+        return not suppress
+
+    def reset(self) -> None:
+        """Forget held keys and any partial sequence (e.g. after the hook was re-installed)"""
+        self._mask = 0
+        self._held = {}
+        self._active = {}
+        self._node = self._root
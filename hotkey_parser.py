@@ -0,0 +1,82 @@
+"""
+Hotkey parsing for App Volume Control.
+Turns hotkey strings into canonical, hashable Hotkey values so that spellings
+like "shift+ctrl+a" and "Ctrl+Shift+A" compare and hash equal.
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Tuple
+
+from keyboard_backend import canonical_key
+
+MODIFIER_BITS = {'ctrl': 1, 'alt': 2, 'shift': 4, 'windows': 8}
+# Spelling of each modifier in canonical hotkey text, in display order
+_MODIFIER_TEXT = (('ctrl', 1), ('alt', 2), ('shift', 4), ('win', 8))
+# Keys the settings dialog accepts: letters, digits and F1-F24
+_VALID_KEY = re.compile(r'[a-z0-9]|f([1-9]|1[0-9]|2[0-4])')
+
+
+class HotkeyStep(NamedTuple):
+    """One chord of a hotkey: held modifiers plus the other keys pressed with them"""
+    modifiers: int          # bitmask of MODIFIER_BITS
+    keys: Tuple[str, ...]   # sorted canonical key names
+
+    @property
+    def modifier_names(self) -> FrozenSet[str]:
+        return frozenset(name for name, bit in MODIFIER_BITS.items() if self.modifiers & bit)
+
+    def __str__(self) -> str:
+        return '+'.join([name for name, bit in _MODIFIER_TEXT if self.modifiers & bit] + list(self.keys))
+
+
+class Hotkey(NamedTuple):
+    """Parsed hotkey: a single chord, or a sequence of chords pressed one after another"""
+    steps: Tuple[HotkeyStep, ...]
+
+    def __str__(self) -> str:
+        """Canonical lowercase text, e.g. 'ctrl+alt+v, 1'"""
+        return ', '.join(str(step) for step in self.steps)
+
+    @property
+    def is_sequence(self) -> bool:
+        return len(self.steps) > 1
+
+
+@lru_cache(maxsize=1024)
+def parse_hotkey(text: str) -> Hotkey:
+    """Parse "ctrl+alt+v, 1" style text (case-insensitive); ValueError if malformed"""
+    steps = []
+    for part in text.split(','):
+        modifiers = 0
+        keys = []
+        for name in part.split('+'):
+            key = canonical_key(name)
+            if not key:
+                raise ValueError(f"Empty key in hotkey: {text!r}")
+            bit = MODIFIER_BITS.get(key)
+            if bit is not None:
+                modifiers |= bit
+            elif key not in keys:
+                keys.append(key)
+        if not keys:
+            raise ValueError(f"Hotkey step without a non-modifier key: {text!r}")
+        steps.append(HotkeyStep(modifiers, tuple(sorted(keys))))
+    return Hotkey(tuple(steps))
+
+
+def is_valid_hotkey(text: str) -> bool:
+    """Hotkey parses and uses only letters, digits and F-keys besides modifiers"""
+    try:
+        hotkey = parse_hotkey(text)
+    except ValueError:
+        return False
+    return all(_VALID_KEY.fullmatch(key) for step in hotkey.steps for key in step.keys)
+
+
+def canonical_hotkey(text: str) -> str:
+    """Canonical text of a hotkey, or the lowercased input if it does not parse"""
+    try:
+        return str(parse_hotkey(text))
+    except ValueError:
+        return text.strip().lower()
@@ -3,164 +3,432 @@ Hotkey management for App Volume Control.
 Handles hotkey registration, profile execution, and state management.
 """
 
-import keyboard
-import re
+import time
 import logging
-from typing import Dict, List, Any, Callable
-from config import load_config, save_config
-from audio import audio_manager
+from types import MappingProxyType
+from typing import Dict, List, Any, Hashable, Mapping, NamedTuple, Optional, Set, Tuple
+from config import load_config_view, save_config
+from audio import audio_manager, AudioManager, AudioSession, VolumePlan
+from dispatcher import HotkeyDispatcher
+from ducking import DuckingController
+from keyboard_backend import KeyboardBackend, KeyEvent, create_default_keyboard_backend
+from hotkey_matcher import HotkeyMatcher
+from hotkey_parser import canonical_hotkey, is_valid_hotkey
+from models import Profile
+from profile_store import ProfileStore
+from tracing import tracer
+from state_store import StateStore
 
 logger = logging.getLogger(__name__)
 
+# A key-down of a hotkey whose release was not seen within this many seconds of its
+# previous key-down is OS auto-repeat; after that it counts as a new press (missed release)
+REPEAT_WINDOW = 1.0
+
+
+class CompiledHotkey(NamedTuple):
+    """All enabled profiles of one hotkey with their merged plans precomputed"""
+    hotkey: str
+    profiles: Tuple[Profile, ...]          # priority order (executed first to last)
+    block: bool
+    plans: Tuple[VolumePlan, VolumePlan]   # indexed by hotkey_state["volume_low"]
+    hold: bool                             # momentary: plans[False] on press, plans[True] on release
+    debounce: float                        # seconds, largest debounce_ms of the profiles
+    ignore_repeat: bool                    # unless every profile allows key repeat
+
+
+class ProfileSnapshot(NamedTuple):
+    """Compiled view of the configured profiles; replaced as a whole, never mutated"""
+    profiles: Tuple[Profile, ...]                 # config order
+    hotkeys: Mapping[str, CompiledHotkey]         # canonical hotkey: enabled profiles
+    by_hotkey: Mapping[str, Tuple[Profile, ...]]  # conflict index: all toggle profiles per canonical hotkey, config order
+
+
+def compile_hotkey(hotkey_lc: str, profiles: Tuple[Profile, ...]) -> Optional[CompiledHotkey]:
+    """Compile the profiles of one hotkey; None if none of them is enabled"""
+    # Sort by priority (lower numbers first)
+    group = sorted((p for p in profiles if p.enabled), key=lambda p: p.priority)
+    if not group:
+        return None
+    plans = []
+    for volume_low in (False, True):
+        plan = VolumePlan()
+        for profile in group:
+            profile.add_to_plan(plan, volume_low)
+        plans.append(plan)
+    hold = any(p.hold for p in group)
+    if hold and not all(p.hold for p in group):
+        logger.warning(f"Hotkey '{hotkey_lc.upper()}' mixes hold and toggle profiles; all of them act as hold")
+    return CompiledHotkey(hotkey_lc, tuple(group), any(p.block_hotkey for p in group),
+                          tuple(plans), hold, max(p.debounce_ms for p in group) / 1000.0,
+                          any(p.ignore_repeat for p in group))
+
+
+def build_snapshot(store: ProfileStore, previous: Optional[ProfileSnapshot] = None,
+                   affected: Optional[Set[str]] = None) -> ProfileSnapshot:
+    """
+    Snapshot of the profiles in store. With a previous snapshot only the
+    affected hotkeys are recompiled; the others are carried over.
+    """
+    by_hotkey = store.hotkey_index()
+    if previous is None or affected is None:
+        hotkeys: Dict[str, CompiledHotkey] = {}
+        affected = by_hotkey.keys()
+    else:
+        hotkeys = dict(previous.hotkeys)
+    for hotkey_lc in affected:
+        compiled = compile_hotkey(hotkey_lc, by_hotkey.get(hotkey_lc, ()))
+        if compiled is None:
+            hotkeys.pop(hotkey_lc, None)
+        else:
+            hotkeys[hotkey_lc] = compiled
+    return ProfileSnapshot(store.profiles, MappingProxyType(hotkeys), MappingProxyType(by_hotkey))
+
+
+def compile_profiles(config: Mapping[str, Any]) -> ProfileSnapshot:
+    """Compile the profiles of a config into an immutable snapshot"""
+    store = ProfileStore()
+    store.sync(config.get('profiles', ()))
+    return build_snapshot(store)
+
 
 class HotkeyManager:
     """Manages hotkey registration and profile execution"""
     
-    def __init__(self):
+    def __init__(self, audio: Optional[AudioManager] = None, keyboard: Optional[KeyboardBackend] = None):
+        self.audio_manager = audio or audio_manager
+        self._keyboard = keyboard
+        self.store = ProfileStore()  # indexed profiles the snapshot is built from
+        self.snapshot = ProfileSnapshot((), MappingProxyType({}), MappingProxyType({}))
         self.hotkey_profiles: Dict[str, List[int]] = {}  # hotkey: [profile_indices_in_priority_order]
         self.hotkey_states: Dict[str, Dict[str, bool]] = {}  # hotkey: {"volume_low": bool}
         self.profile_states: Dict[int, Dict[str, bool]] = {}  # profile_index: {"volume_low": bool}
+        self.state_store: Optional[StateStore] = None  # persists hotkey_states across restarts
+        self.registered: Dict[str, Tuple[Tuple[Any, ...], Tuple[bool, bool, bool]]] = {}  # hotkey: (matcher handles, hook_signature)
+        self.matcher = HotkeyMatcher(scan_codes=lambda name: self.keyboard.scan_codes(name))
+        self._hook: Optional[Tuple[Any, bool]] = None  # (keyboard hook handle, suppressing)
+        self._press_times: Dict[str, int] = {}  # hotkey: trace timestamp of the oldest unhandled press
+        self.keys_down: Set[str] = set()  # hold hotkeys currently pressed (updated by the keyboard hook)
+        self._toggle_down: Dict[str, float] = {}    # toggle hotkey: time of its last key-down while held
+        self._last_accepted: Dict[str, float] = {}  # toggle hotkey: time of its last accepted press
+        self.ignored_presses = 0  # key-downs dropped as auto-repeat or by debounce
+        self.held: Dict[str, Tuple[CompiledHotkey, List[AudioSession]]] = {}  # hold hotkey: what its press applied
+        self.dispatcher = HotkeyDispatcher(self._dispatch,
+                                           thread_init=lambda: self.audio_manager.backend.thread_init(),
+                                           thread_uninit=lambda: self.audio_manager.backend.thread_uninit())
+        self.ducking = DuckingController(self.audio_manager)
+    
+    @property
+    def keyboard(self) -> KeyboardBackend:
+        """Keyboard backend, created on first use"""
+        if self._keyboard is None:
+            self._keyboard = create_default_keyboard_backend()
+        return self._keyboard
+    
+    def set_state_store(self, store: Optional[StateStore]) -> None:
+        """Load saved toggle states from store and keep it updated (call before registering hotkeys)"""
+        if self.state_store is not None:
+            self.state_store.stop()
+        self.state_store = store
+        if store is not None:
+            saved = store.load()
+            store.start()
+            if saved:
+                logger.info(f"Restored toggle state for {len(saved)} hotkey(s)")
     
     def is_valid_hotkey(self, hotkey: str) -> bool:
-        """Validate hotkey format (case-insensitive)"""
-        pattern = r'^(ctrl\+|alt\+|shift\+|win\+)*([a-z0-9]|f([1-9]|1[0-9]|2[0-4]))(\+([a-z0-9]|ctrl|alt|shift|win|f([1-9]|1[0-9]|2[0-4])))*$'
-        return bool(re.fullmatch(pattern, hotkey.lower()))
+        """Validate hotkey format (case-insensitive), including sequences like 'ctrl+alt+v, 1'"""
+        return is_valid_hotkey(hotkey)
+    
+    def profiles_for_hotkey(self, hotkey: str) -> Tuple[Profile, ...]:
+        """Profiles bound to a hotkey in any spelling (enabled or not), from the conflict index"""
+        return self.snapshot.by_hotkey.get(canonical_hotkey(hotkey), ())
+    
+    def reload_profiles(self, config: Optional[Mapping[str, Any]] = None) -> ProfileSnapshot:
+        """
+        Recompile profiles and swap in the new snapshot (hotkey hooks are left untouched).
+        Only hotkeys whose profiles were added, edited or removed are recompiled.
+        Toggle states are kept for hotkeys still bound to the same set of profiles,
+        and restored from the state store for hotkeys that have none.
+        """
+        if config is None:
+            config = load_config_view()
+        affected = self.store.sync(config.get('profiles', ()))
+        snapshot = build_snapshot(self.store, self.snapshot, affected)
+        old_hotkeys = self.snapshot.hotkeys
+        for hotkey_lc in list(self.hotkey_states):
+            old, new = old_hotkeys.get(hotkey_lc), snapshot.hotkeys.get(hotkey_lc)
+            if old is new and old is not None:
+                continue
+            if old is None or new is None or {p.name for p in old.profiles} != {p.name for p in new.profiles}:
+                del self.hotkey_states[hotkey_lc]
+        if self.state_store is not None:
+            for hotkey_lc, compiled in snapshot.hotkeys.items():
+                if hotkey_lc in self.hotkey_states or compiled.hold:
+                    continue
+                volume_low = self.state_store.get(hotkey_lc, (p.name for p in compiled.profiles))
+                if volume_low is not None:
+                    self.hotkey_states[hotkey_lc] = {"volume_low": volume_low}
+        self.snapshot = snapshot
+        self.hotkey_profiles = {hotkey: [p.index for p in compiled.profiles]
+                                for hotkey, compiled in snapshot.hotkeys.items()}
+        self.ducking.configure(snapshot.profiles, by_app=self.store.by_app)
+        return snapshot
+    
+    def _execute_plan(self, profiles: Tuple[Profile, ...], plan: VolumePlan, volume_low: bool,
+                      sessions: Optional[List[AudioSession]] = None) -> None:
+        """Apply a merged plan (one session lookup, one write per session) and log per profile"""
+        results = self.audio_manager.apply_plan(plan, sessions)
+        
+        for profile in profiles:
+            target_volume = profile.target_volume(volume_low)
+            
+            # System volume
+            fade_note = f", fade {profile.fade_ms} ms" if profile.fade_ms else ""
+            if plan.system_owner == profile.index and results.get('system'):
+                logger.info(f"[{profile.name}] System volume changed to {target_volume}% (Hotkey: {profile.hotkey.upper()}{fade_note})")
+            
+            # App volumes (only the apps this profile was not overridden on)
+            if not profile.app_targets:
+                continue
+            owned = [t for t in profile.app_targets if plan.app_owners.get(t.lower()) == profile.index]
+            if not owned:
+                logger.info(f"[{profile.name}] Overridden by a higher priority profile for: {', '.join(profile.app_targets)}")
+                continue
+            if not any(app.lower() in results for app in owned):
+                logger.warning(f"[{profile.name}] No sessions found for: {', '.join(owned)}")
+            elif not any(results.get(app.lower()) for app in owned):
+                logger.warning(f"[{profile.name}] No sessions were controlled successfully.")
+            else:
+                logger.info(f"[{profile.name}] App volumes changed to {target_volume}% for: {', '.join(owned)} (Hotkey: {profile.hotkey.upper()}{fade_note})")
     
     def toggle_profile_volume(self, profile_index: int, hotkey_state: Dict[str, bool] = None) -> None:
         """Toggle volume for a specific profile"""
-        config = load_config()
-        profiles = config.get('profiles', [])
-        
+        profiles = self.snapshot.profiles
         if profile_index >= len(profiles):
             return
-        
         profile = profiles[profile_index]
-        profile_name = profile.get('name', f'Profile {profile_index+1}')
-        apps = profile.get('apps', [])
-        low = profile.get('low_volume', 20)
-        high = profile.get('high_volume', 100)
-        hotkey = profile.get('hotkey', '')
-        invert = profile.get('invert', False)
         
         # Use provided hotkey state (shared across all profiles with same hotkey)
         if hotkey_state is None:
             hotkey_state = {"volume_low": False}
-        
-        # Determine target volume based on current state and invert setting
-        if invert:
-            # Inverted logic: when state is low, go to low (but this is actually high volume)
-            # when state is high, go to high (but this is actually low volume)
-            target_volume = low if hotkey_state["volume_low"] else high
-        else:
-            # Normal logic: when state is low, go to high; when state is high, go to low
-            target_volume = high if hotkey_state["volume_low"] else low
-        
-        # System volume
-        if any(t.lower() == 'system' for t in apps):
-            if audio_manager.set_system_volume(target_volume):
-                logger.info(f"[{profile_name}] System volume changed to {target_volume}% (Hotkey: {hotkey.upper()})")
-        
-        # App volumes
-        app_targets = [t for t in apps if t.lower() != 'system']
-        if app_targets:
-            if audio_manager.set_app_volumes(app_targets, target_volume, profile_name):
-                logger.info(f"[{profile_name}] App volumes changed to {target_volume}% for: {', '.join(app_targets)} (Hotkey: {hotkey.upper()})")
-    
-    def execute_hotkey_profiles(self, hotkey: str) -> None:
-        """Execute all profiles for a given hotkey in priority order (case-insensitive)"""
-        hotkey_lc = hotkey.lower()
-        if hotkey_lc not in self.hotkey_profiles:
+        volume_low = hotkey_state["volume_low"]
+        self._execute_plan((profile,), profile.build_plan(volume_low), volume_low)
+    
+    def _accept_press(self, hotkey: str, compiled: CompiledHotkey) -> bool:
+        """Drop key-downs that are auto-repeat of a held key or fall inside the debounce window"""
+        now = time.monotonic()
+        if compiled.ignore_repeat:
+            last_down = self._toggle_down.get(hotkey)
+            self._toggle_down[hotkey] = now
+            if last_down is not None and now - last_down < REPEAT_WINDOW:
+                return False
+        if compiled.debounce:
+            last = self._last_accepted.get(hotkey)
+            if last is not None and now - last < compiled.debounce:
+                return False
+        self._last_accepted[hotkey] = now
+        return True
+    
+    def on_hotkey(self, hotkey: str) -> None:
+        """Keyboard hook callback: queue the press for the dispatcher thread and return"""
+        started = tracer.start()
+        compiled = self.snapshot.hotkeys.get(hotkey)
+        if compiled is not None and not self._accept_press(hotkey, compiled):
+            self.ignored_presses += 1
+            tracer.stop('hotkey.hook', started)
             return
-        profile_indices = self.hotkey_profiles[hotkey_lc]
-        if not profile_indices:
+        if started:
+            self._press_times.setdefault(hotkey, started)
+        self.dispatcher.submit(hotkey)
+        tracer.stop('hotkey.hook', started)
+    
+    def on_hotkey_release(self, hotkey: str) -> None:
+        """Keyboard hook callback on release of a toggle hotkey: the next key-down is a new press"""
+        self._toggle_down.pop(hotkey, None)
+    
+    def on_hold_key(self, hotkey: str, down: bool) -> None:
+        """Keyboard hook callback of hold hotkeys: track the key and queue a sync, ignoring auto-repeat"""
+        if down:
+            if hotkey in self.keys_down:
+                return  # OS auto-repeat while held
+            self.keys_down.add(hotkey)
+        else:
+            self.keys_down.discard(hotkey)
+        self.dispatcher.submit(('hold', hotkey))
+    
+    def on_key_event(self, event: KeyEvent) -> bool:
+        """Global keyboard hook: feed the matcher; False suppresses the event"""
+        return self.matcher.feed(event)
+    
+    def _dispatch(self, item: Hashable, presses: int) -> None:
+        """Dispatcher handler: toggle presses are hotkey names, hold events are ('hold', hotkey)"""
+        if isinstance(item, tuple):
+            self.sync_hold_hotkey(item[1])
+        else:
+            self.execute_hotkey_profiles(item, presses)
+    
+    def sync_hold_hotkey(self, hotkey: str) -> None:
+        """
+        Bring a hold hotkey's volumes in line with whether its key is down.
+        Press resolves the sessions once; release writes those same sessions back.
+        """
+        started = tracer.start()
+        down = hotkey in self.keys_down
+        if down == (hotkey in self.held):
+            return  # Already applied (or a tap that was released before it was handled)
+        try:
+            if down:
+                compiled = self.snapshot.hotkeys.get(hotkey)
+                if compiled is None:
+                    return
+                plan = compiled.plans[False]
+                sessions = self.audio_manager.resolve_sessions(plan)
+                self.held[hotkey] = (compiled, sessions)
+                self._execute_plan(compiled.profiles, plan, False, sessions)
+            else:
+                # Restore with the profiles that were pressed, even if they changed meanwhile
+                compiled, sessions = self.held.pop(hotkey)
+                self._execute_plan(compiled.profiles, compiled.plans[True], True, sessions)
+        except Exception as e:
+            logger.error(f"❌ Error executing hold hotkey '{hotkey.upper()}': {e}")
+        tracer.stop('hotkey.hold', started)
+    
+    def execute_hotkey_profiles(self, hotkey: str, presses: int = 1) -> None:
+        """
+        Execute all profiles for a given hotkey in priority order (case-insensitive).
+        presses > 1 applies a coalesced burst: only the volume of the last press is
+        written, and the toggle state ends up flipped once per press.
+        """
+        started = tracer.start()
+        pressed = self._press_times.pop(hotkey, 0) if started else 0
+        if pressed:
+            tracer.record('hotkey.queue', started - pressed)
+        hotkey_lc = canonical_hotkey(hotkey)
+        compiled = self.snapshot.hotkeys.get(hotkey_lc)
+        if compiled is None or presses < 1:
             return
-        if hotkey_lc not in self.hotkey_states:
-            self.hotkey_states[hotkey_lc] = {"volume_low": False}
-        hotkey_state = self.hotkey_states[hotkey_lc]
-        for profile_index in profile_indices:
-            try:
-                self.toggle_profile_volume(profile_index, hotkey_state)
-            except Exception as e:
-                logger.error(f"❌ Error executing profile {profile_index}: {e}")
-        hotkey_state["volume_low"] = not hotkey_state["volume_low"]
+        hotkey_state = self.hotkey_states.get(hotkey_lc)
+        if hotkey_state is None:
+            hotkey_state = self.hotkey_states[hotkey_lc] = {"volume_low": False}
+        # State seen by the last press of the burst
+        volume_low = hotkey_state["volume_low"] != ((presses - 1) % 2 == 1)
+        try:
+            self._execute_plan(compiled.profiles, compiled.plans[volume_low], volume_low)
+        except Exception as e:
+            logger.error(f"❌ Error executing profiles for hotkey '{hotkey_lc.upper()}': {e}")
+        hotkey_state["volume_low"] = not volume_low
+        if self.state_store is not None:
+            self.state_store.record(hotkey_lc, (p.name for p in compiled.profiles), not volume_low)
+        tracer.stop('hotkey.execute', started)
+        # Key event to volume applied
+        tracer.stop('hotkey.end_to_end', pressed)
     
-    def register_all_profile_hotkeys(self) -> None:
-        """Register all hotkeys for all profiles (case-insensitive)"""
-        config = load_config()
-        profiles = config.get('profiles', [])
-        self.hotkey_profiles.clear()
-        
-        # Clear all existing hotkeys first
-        keyboard.unhook_all()
+    def register_all_profile_hotkeys(self, config: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Bring the hotkey matcher in line with the profiles (case-insensitive).
+        Only hotkeys that were added, removed or changed blocking are re-bound;
+        the others stay active throughout. All hotkeys share one keyboard hook.
+        """
+        snapshot = self.reload_profiles(config)
+        self.dispatcher.start()
         
-        # Group profiles by hotkey and determine if any profile blocks the hotkey
-        hotkey_groups = {}  # hotkey: [(profile_index, priority, block_hotkey), ...]
+        # Remove hooks of hotkeys that are gone or whose blocking behavior or mode changed
+        for hotkey_lc, (handles, signature) in list(self.registered.items()):
+            compiled = snapshot.hotkeys.get(hotkey_lc)
+            if compiled is not None and self._hook_signature(compiled) == signature:
+                continue
+            self._unhook(hotkey_lc, handles)
+            del self.registered[hotkey_lc]
+            if compiled is None:
+                logger.info(f"Unregistered hotkey '{hotkey_lc.upper()}'")
         
-        for idx, profile in enumerate(profiles):
-            hotkey = profile.get('hotkey', '')
-            enabled = profile.get('enabled', True)
-            priority = profile.get('priority', 1)
-            block_hotkey = profile.get('block_hotkey', True)
-            
-            if hotkey and enabled:
-                hotkey_lc = hotkey.lower()
-                if hotkey_lc not in hotkey_groups:
-                    hotkey_groups[hotkey_lc] = []
-                hotkey_groups[hotkey_lc].append((idx, priority, block_hotkey))
-        
-        # Process each hotkey group
-        for hotkey_lc, profile_data in hotkey_groups.items():
-            # Sort by priority (lower numbers first)
-            profile_data.sort(key=lambda x: x[1], reverse=False)
-            
-            # Check if any profile in this group blocks the hotkey
-            should_block = any(block for _, _, block in profile_data)
-            
-            # Store profile indices for execution
-            self.hotkey_profiles[hotkey_lc] = [idx for idx, _, _ in profile_data]
-            
+        # Hook new hotkeys (profile changes on existing ones are picked up from the snapshot)
+        for hotkey_lc, compiled in snapshot.hotkeys.items():
+            if hotkey_lc in self.registered:
+                continue
             # Register the hotkey with appropriate blocking behavior
             try:
-                if should_block:
-                    keyboard.add_hotkey(hotkey_lc, lambda h=hotkey_lc: self.execute_hotkey_profiles(h), suppress=True)
+                if compiled.hold:
+                    handles = (self.matcher.add(hotkey_lc, lambda h=hotkey_lc: self.on_hold_key(h, True),
+                                                lambda h=hotkey_lc: self.on_hold_key(h, False),
+                                                suppress=compiled.block),)
                 else:
-                    keyboard.add_hotkey(hotkey_lc, lambda h=hotkey_lc: self.execute_hotkey_profiles(h), suppress=False)
-                
-                profile_names = []
-                for idx in self.hotkey_profiles[hotkey_lc]:
-                    profile_name = profiles[idx].get('name', f'Profile {idx+1}')
-                    profile_names.append(profile_name)
+                    on_release = (lambda h=hotkey_lc: self.on_hotkey_release(h)) if compiled.ignore_repeat else None
+                    handles = (self.matcher.add(hotkey_lc, lambda h=hotkey_lc: self.on_hotkey(h), on_release,
+                                                suppress=compiled.block),)
+                self.registered[hotkey_lc] = (handles, self._hook_signature(compiled))
                 
-                block_status = "blocked" if should_block else "not blocked"
+                profile_names = [p.name for p in compiled.profiles]
+                block_status = "blocked" if compiled.block else "not blocked"
+                if compiled.hold:
+                    block_status += ", hold"
                 logger.info(f"✅ Registered hotkey '{hotkey_lc.upper()}' ({block_status}) for profiles: {', '.join(profile_names)}")
                 
                 # Log which profiles are blocking the hotkey
-                if should_block:
-                    blocking_profiles = []
-                    for idx in self.hotkey_profiles[hotkey_lc]:
-                        if profiles[idx].get('block_hotkey', True):
-                            profile_name = profiles[idx].get('name', f'Profile {idx+1}')
-                            blocking_profiles.append(profile_name)
-                    if blocking_profiles:
-                        logger.info(f"🔒 Hotkey '{hotkey_lc.upper()}' will be intercepted by: {', '.join(blocking_profiles)}")
+                if compiled.block:
+                    blocking_profiles = [p.name for p in compiled.profiles if p.block_hotkey]
+                    logger.info(f"🔒 Hotkey '{hotkey_lc.upper()}' will be intercepted by: {', '.join(blocking_profiles)}")
                 
             except Exception as e:
                 logger.error(f"Error registering hotkey '{hotkey_lc}': {e}")
         
+        self._install_hook(any(c.block for c in snapshot.hotkeys.values() if c.hotkey in self.registered))
+        
         # Log disabled profiles
-        for idx, profile in enumerate(profiles):
-            hotkey = profile.get('hotkey', '')
-            enabled = profile.get('enabled', True)
-            if hotkey and not enabled:
-                profile_name = profile.get('name', f'Profile {idx+1}')
-                logger.info(f"⏸️ Skipped disabled profile: {profile_name} (hotkey: {hotkey.upper()})")
+        for profile in snapshot.profiles:
+            if profile.hotkey and not profile.enabled:
+                logger.info(f"⏸️ Skipped disabled profile: {profile.name} (hotkey: {profile.hotkey.upper()})")
+    
+    @staticmethod
+    def _hook_signature(compiled: CompiledHotkey) -> Tuple[bool, bool, bool]:
+        """Settings that decide how a hotkey is bound in the matcher"""
+        return compiled.block, compiled.hold, compiled.ignore_repeat
+    
+    def _install_hook(self, suppress: bool) -> None:
+        """Keep the one global keyboard hook installed while hotkeys exist (suppressing if any blocks)"""
+        if self._hook is not None and (not self.registered or self._hook[1] != suppress):
+            try:
+                self.keyboard.unhook(self._hook[0])
+            except (KeyError, ValueError) as e:
+                logger.debug(f"Keyboard hook was already removed: {e}")
+            self._hook = None
+        if self.registered and self._hook is None:
+            self._hook = (self.keyboard.hook(self.on_key_event, suppress=suppress), suppress)
+    
+    def _unhook(self, hotkey_lc: str, handles: Tuple[Any, ...]) -> None:
+        if hotkey_lc in self.keys_down:
+            # The release will never arrive: restore now
+            self.keys_down.discard(hotkey_lc)
+            self.dispatcher.submit(('hold', hotkey_lc))
+        for handle in handles:
+            try:
+                self.matcher.remove(handle)
+            except (KeyError, ValueError) as e:
+                logger.debug(f"Hotkey '{hotkey_lc}' was already unhooked: {e}")
     
     def clear_hotkeys(self) -> None:
-        keyboard.unhook_all()
+        """Remove every hotkey hook registered by this manager and reset toggle states"""
+        for hotkey_lc, (handles, _) in self.registered.items():
+            self._unhook(hotkey_lc, handles)
+        self.registered.clear()
+        self._install_hook(False)
+        self.matcher.reset()
+        self._toggle_down.clear()
+        self._last_accepted.clear()
         logger.info("All hotkeys unregistered.")
+        self.store = ProfileStore()
+        self.snapshot = ProfileSnapshot((), MappingProxyType({}), MappingProxyType({}))
         self.hotkey_profiles.clear()
         self.hotkey_states.clear()
         self.profile_states.clear()
+    
+    def shutdown(self) -> None:
+        """Stop the dispatcher thread after pending presses were handled, restore ducked apps and save toggle states"""
+        self.dispatcher.stop()
+        self.ducking.stop()
+        if self.state_store is not None:
+            self.state_store.stop()
 
 
 # Global hotkey manager instance
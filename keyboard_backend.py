@@ -0,0 +1,298 @@
+"""
+Keyboard backend interface for App Volume Control.
+Puts hotkey registration and key event delivery behind an interface so the
+system hook (keyboard module) can be swapped for an in-process fake.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class KeyEvent(NamedTuple):
+    """Key event as delivered to hook callbacks (same fields as keyboard.KeyboardEvent)"""
+    event_type: str   # 'down' or 'up'
+    name: str         # as typed with the current shift state and layout ('!' for shift+1)
+    scan_code: int = 0
+    time: float = 0.0
+
+
+HotkeyCallback = Callable[[], None]
+HookCallback = Callable[[KeyEvent], Optional[bool]]  # suppressing hooks return False to block the event
+
+
+class KeyboardBackend:
+    """Base class for keyboard backends"""
+
+    def add_hotkey(self, hotkey: str, callback: HotkeyCallback, suppress: bool = False,
+                   trigger_on_release: bool = False) -> Any:
+        """Call callback when hotkey is pressed (or released); returns a handle for remove_hotkey"""
+        raise NotImplementedError
+
+    def remove_hotkey(self, handle: Any) -> None:
+        """Remove a hotkey added by add_hotkey (KeyError if unknown)"""
+        raise NotImplementedError
+
+    def hook(self, callback: HookCallback, suppress: bool = False) -> Any:
+        """Call callback for every key event (with suppress, False blocks it); returns a handle for unhook"""
+        raise NotImplementedError
+
+    def unhook(self, handle: Any) -> None:
+        """Remove a hook added by hook"""
+        raise NotImplementedError
+
+    def modifier_names(self) -> FrozenSet[str]:
+        """Names of modifier keys as they appear in event names"""
+        raise NotImplementedError
+
+    def scan_codes(self, name: str) -> Tuple[int, ...]:
+        """Scan codes of the physical key(s) that produce a key name, () if unknown"""
+        return ()
+
+
+class SystemKeyboardBackend(KeyboardBackend):
+    """Global system keyboard hook through the keyboard module (imported on first use)"""
+
+    def __init__(self):
+        self._keyboard = None
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            import keyboard
+            self._keyboard = keyboard
+        return self._keyboard
+
+    def add_hotkey(self, hotkey: str, callback: HotkeyCallback, suppress: bool = False,
+                   trigger_on_release: bool = False) -> Any:
+        return self.keyboard.add_hotkey(hotkey, callback, suppress=suppress, trigger_on_release=trigger_on_release)
+
+    def remove_hotkey(self, handle: Any) -> None:
+        self.keyboard.remove_hotkey(handle)
+
+    def hook(self, callback: HookCallback, suppress: bool = False) -> Any:
+        return self.keyboard.hook(callback, suppress=suppress)
+
+    def unhook(self, handle: Any) -> None:
+        self.keyboard.unhook(handle)
+
+    def modifier_names(self) -> FrozenSet[str]:
+        from keyboard._canonical_names import all_modifiers
+        return frozenset(all_modifiers)
+
+    def scan_codes(self, name: str) -> Tuple[int, ...]:
+        return tuple(self.keyboard.key_to_scan_codes(name, error_if_missing=False))
+
+
+# Spellings the fake normalizes, mirroring the keyboard module's canonical names
+_KEY_ALIASES = {
+    'control': 'ctrl', 'left ctrl': 'ctrl', 'right ctrl': 'ctrl',
+    'left shift': 'shift', 'right shift': 'shift',
+    'left alt': 'alt', 'right alt': 'alt', 'alt gr': 'alt',
+    'win': 'windows', 'left windows': 'windows', 'right windows': 'windows',
+    'escape': 'esc', 'return': 'enter',
+}
+_MODIFIERS = frozenset({'ctrl', 'shift', 'alt', 'windows'})
+# Fake layout: scan codes of the keys the fake knows, and what shift turns them into
+_FAKE_SCAN_CODES = {key: code for code, key in enumerate(
+    list('1234567890abcdefghijklmnopqrstuvwxyz-=[];\',./`') + [f"f{n}" for n in range(1, 25)]
+    + ['space', 'enter', 'esc', 'tab', 'backspace'] + sorted(_MODIFIERS), start=2)}
+_SHIFTED = dict(zip('1234567890-=[];\',./`', '!@#$%^&*()_+{}:"<>?~'))
+
+
+def canonical_key(name: str) -> str:
+    """Lowercase key name with the fake backend's aliases applied"""
+    name = name.lower().strip()
+    return _KEY_ALIASES.get(name, name)
+
+
+class _FakeHotkey:
+    __slots__ = ('keys', 'callback', 'trigger_on_release', 'active')
+
+    def __init__(self, keys: FrozenSet[str], callback: HotkeyCallback, trigger_on_release: bool):
+        self.keys = keys
+        self.callback = callback
+        self.trigger_on_release = trigger_on_release
+        self.active = False  # combination fully pressed (for release triggers)
+
+
+class FakeKeyboardBackend(KeyboardBackend):
+    """
+    In-process keyboard that delivers injected key events synchronously on the
+    injecting thread, the way the system hook thread delivers real ones.
+
+    Hotkeys fire when their last key goes down while exactly their keys are
+    held, including repeated key-downs of a held key, as the keyboard module
+    does. send() takes unshifted key names; hook events carry a scan code and,
+    like the system hook, the name the key types with the current shift state
+    ('!' for shift+1, 'A' for shift+a). With measure=True the time spent inside
+    callbacks is recorded per event in callback_durations (seconds).
+    """
+
+    def __init__(self, measure: bool = False):
+        self.measure = measure
+        self.callback_durations: List[float] = []
+        self.suppressed_events = 0
+        self._lock = threading.Lock()
+        self._hotkeys: Dict[int, _FakeHotkey] = {}
+        self._hooks: Dict[int, HookCallback] = {}
+        self._suppressing: Dict[int, bool] = {}
+        self._next_handle = 1
+        self._pressed: set = set()
+
+    # --- KeyboardBackend ---
+
+    def add_hotkey(self, hotkey: str, callback: HotkeyCallback, suppress: bool = False,
+                   trigger_on_release: bool = False) -> Any:
+        keys = frozenset(canonical_key(part) for part in hotkey.split('+'))
+        with self._lock:
+            handle = self._next_handle
+            self._next_handle += 1
+            self._hotkeys[handle] = _FakeHotkey(keys, callback, trigger_on_release)
+            self._suppressing[handle] = suppress
+        return handle
+
+    def remove_hotkey(self, handle: Any) -> None:
+        with self._lock:
+            del self._hotkeys[handle]
+            self._suppressing.pop(handle, None)
+
+    def hook(self, callback: HookCallback, suppress: bool = False) -> Any:
+        with self._lock:
+            handle = self._next_handle
+            self._next_handle += 1
+            self._hooks[handle] = callback
+            self._suppressing[handle] = suppress
+        return handle
+
+    def unhook(self, handle: Any) -> None:
+        with self._lock:
+            del self._hooks[handle]
+            self._suppressing.pop(handle, None)
+
+    def modifier_names(self) -> FrozenSet[str]:
+        return _MODIFIERS
+
+    def scan_codes(self, name: str) -> Tuple[int, ...]:
+        code = _FAKE_SCAN_CODES.get(canonical_key(name))
+        return () if code is None else (code,)
+
+    # --- Injection ---
+
+    def send(self, name: str, event_type: str) -> None:
+        """Deliver one key event to hooks and matching hotkeys"""
+        key = canonical_key(name)
+        with self._lock:
+            typed = key
+            if 'shift' in self._pressed and key not in _MODIFIERS:
+                typed = _SHIFTED.get(key, key.upper() if len(key) == 1 else key)
+            event = KeyEvent(event_type, typed, _FAKE_SCAN_CODES.get(key, 0), time.time())
+            if event_type == 'down':
+                self._pressed.add(key)
+            pressed = frozenset(self._pressed)
+            if event_type == 'up':
+                self._pressed.discard(key)
+            hooks = list(self._hooks.items())
+            hotkeys = list(self._hotkeys.items())
+        started = time.perf_counter() if self.measure else 0.0
+        suppressed = False
+        for handle, callback in hooks:
+            if callback(event) is False and self._suppressing.get(handle, False):
+                suppressed = True
+        for handle, hotkey in hotkeys:
+            if event_type == 'down':
+                if key in hotkey.keys and pressed == hotkey.keys:
+                    hotkey.active = True
+                    suppressed = suppressed or self._suppressing.get(handle, False)
+                    if not hotkey.trigger_on_release:
+                        hotkey.callback()
+            elif hotkey.active and key in hotkey.keys:
+                hotkey.active = False
+                if hotkey.trigger_on_release:
+                    hotkey.callback()
+        if suppressed:
+            self.suppressed_events += 1
+        if self.measure:
+            self.callback_durations.append(time.perf_counter() - started)
+
+    def press(self, name: str) -> None:
+        self.send(name, 'down')
+
+    def release(self, name: str) -> None:
+        self.send(name, 'up')
+
+    def tap(self, hotkey: str) -> None:
+        """Press the keys of hotkey in order and release them in reverse"""
+        keys = hotkey.split('+')
+        for key in keys:
+            self.press(key)
+        for key in reversed(keys):
+            self.release(key)
+
+    def play(self, events: Iterable[Tuple[float, str, str]], speed: float = 1.0) -> None:
+        """
+        Replay (time, name, event_type) events, waiting between them so they arrive at
+        their recorded offsets divided by speed (speed=0 sends them back to back).
+        """
+        start = time.perf_counter()
+        first: Optional[float] = None
+        for at, name, event_type in events:
+            if first is None:
+                first = at
+            if speed > 0:
+                delay = (at - first) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            self.send(name, event_type)
+
+
+def typing_session(text: str, chars_per_second: float = 8.0, hotkeys: Iterable[str] = (),
+                   hotkey_every: int = 50, hold: float = 0.08,
+                   seed: Optional[int] = None) -> List[Tuple[float, str, str]]:
+    """
+    Synthetic recording of someone typing text with human-like timing, pressing
+    one of hotkeys (cycled) after every hotkey_every characters.
+    Returns (time, name, event_type) tuples for FakeKeyboardBackend.play.
+    """
+    rng = random.Random(seed)
+    hotkeys = list(hotkeys)
+    events: List[Tuple[float, str, str]] = []
+    now = 0.0
+    for i, char in enumerate(text):
+        name = 'space' if char == ' ' else char.lower()
+        shifted = char.isupper()
+        if shifted:
+            events.append((now, 'shift', 'down'))
+        events.append((now, name, 'down'))
+        events.append((now + hold * rng.uniform(0.6, 1.4), name, 'up'))
+        if shifted:
+            events.append((now + hold * 1.5, 'shift', 'up'))
+        now += rng.expovariate(chars_per_second)
+        if hotkeys and (i + 1) % hotkey_every == 0:
+            keys = hotkeys[(i // hotkey_every) % len(hotkeys)].split('+')
+            for key in keys:
+                events.append((now, key, 'down'))
+                now += 0.02
+            for key in reversed(keys):
+                events.append((now, key, 'up'))
+                now += 0.02
+            now += 0.2
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def create_keyboard_backend(name: str) -> KeyboardBackend:
+    """Create a keyboard backend by name ('system' or 'fake')"""
+    name = name.lower()
+    if name == 'system':
+        return SystemKeyboardBackend()
+    if name == 'fake':
+        return FakeKeyboardBackend()
+    raise ValueError(f"Unknown keyboard backend: {name}")
+
+
+def create_default_keyboard_backend() -> KeyboardBackend:
+    """Create the keyboard backend selected by APP_VOLUME_KEYBOARD (system by default)"""
+    return create_keyboard_backend(os.environ.get('APP_VOLUME_KEYBOARD', 'system'))
@@ -9,6 +9,11 @@ import logging
 from utils import hide_console_window
 from single_instance import single_instance_manager
 from hotkeys import hotkey_manager
+from audio import audio_manager
+from config import load_config_view, flush_config
+from models import config_model
+from tracing import tracer
+from state_store import StateStore, get_state_path
 from gui import AppVolumeControlGUI
 
 # Configure logging
@@ -27,8 +32,12 @@ logger = logging.getLogger(__name__)
 def cleanup_on_exit():
     """Cleanup function registered with atexit"""
     try:
+        flush_config()
         single_instance_manager.cleanup()
         hotkey_manager.clear_hotkeys()
+        hotkey_manager.shutdown()
+        audio_manager.shutdown()
+        tracer.log_summary()
         logger.info("Application shutdown complete")
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
@@ -48,8 +57,18 @@ def main():
         sys.exit(0)
     
     try:
+        config = load_config_view()
+        settings = config_model(config)
+        audio_manager.set_write_concurrency(settings.audio_write_workers)
+        audio_manager.set_verify_policy(settings.volume_verification)
+        audio_manager.set_meter_rate(settings.meter_rate_hz)
+        if settings.latency_tracing:
+            tracer.enable()
+        if settings.persist_toggle_state:
+            hotkey_manager.set_state_store(StateStore(get_state_path()))
+        
         # Register all hotkeys for all profiles
-        hotkey_manager.register_all_profile_hotkeys()
+        hotkey_manager.register_all_profile_hotkeys(config)
         
         # Create and initialize GUI
         is_autostart = '--autostart' in sys.argv
@@ -0,0 +1,221 @@
+"""
+Peak meter sampling for App Volume Control.
+Polls the peak level of every audio session into NumPy ring buffers so the
+GUI can show which apps are producing sound.
+"""
+
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from audio_backend import AudioBackend, BackendSession
+from session_index import SessionIndex
+
+logger = logging.getLogger(__name__)
+
+# Called on the sampling thread after every sample with the per-row levels
+# (valid only during the call) and the monotonic sample time
+SampleListener = Callable[[np.ndarray, float], None]
+
+
+class MeterSnapshot(NamedTuple):
+    """Decimated peak history; row i of levels belongs to names[i] / keys[i]"""
+    keys: Tuple[str, ...]
+    names: Tuple[str, ...]
+    levels: np.ndarray  # float32, shape (sessions, points), oldest column first
+
+
+class PeakMeter:
+    """
+    Samples the peak level of all indexed sessions on one thread.
+
+    Each session owns a row of a preallocated (sessions x history) float32 ring
+    buffer; all rows advance together, one column per sample. Sampling runs at
+    rate_hz while the meter is visible or has listeners and at hidden_rate_hz
+    otherwise (0 pauses it), so a window minimized to the tray costs nothing.
+    """
+
+    def __init__(self, backend: AudioBackend, session_index: SessionIndex,
+                 rate_hz: float = 30.0, hidden_rate_hz: float = 0.0, history: int = 90):
+        self.backend = backend
+        self.session_index = session_index
+        self.rate_hz = rate_hz
+        self.hidden_rate_hz = hidden_rate_hz
+        self.history = history
+        self.visible = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._index_version = -1
+        self._listeners: Tuple[SampleListener, ...] = ()
+        self.rows_version = 0  # Incremented whenever sessions are assigned to or released from rows
+        # Row bookkeeping; rows of expired sessions go to _free and are reused
+        self._rows: Dict[str, int] = {}
+        self._row_sessions: Dict[int, BackendSession] = {}
+        self._sampled: Tuple[Tuple[int, BackendSession], ...] = ()
+        self._free: List[int] = list(range(15, -1, -1))
+        self._buffer = np.zeros((16, history), dtype=np.float32)
+        self._current = np.zeros(16, dtype=np.float32)
+        self._pos = 0       # column the next sample is written to
+        self._filled = 0    # columns written so far (up to history)
+
+    def start(self) -> None:
+        """Start the sampling thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="PeakMeter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def set_visible(self, visible: bool) -> None:
+        """Switch between the visible and hidden sampling rates"""
+        if visible != self.visible:
+            self.visible = visible
+            self._wake.set()
+
+    def add_listener(self, listener: SampleListener) -> None:
+        """Call listener after every sample; keeps sampling at rate_hz while hidden"""
+        with self._lock:
+            self._listeners = self._listeners + (listener,)
+        self._wake.set()
+
+    def remove_listener(self, listener: SampleListener) -> None:
+        with self._lock:
+            self._listeners = tuple(l for l in self._listeners if l is not listener)
+        self._wake.set()
+
+    def current_rate(self) -> float:
+        """Sampling rate in effect right now (0 = paused)"""
+        return self.rate_hz if self.visible or self._listeners else self.hidden_rate_hz
+
+    def row_names(self) -> Dict[int, str]:
+        """Lowercase app name of every buffer row in use"""
+        with self._lock:
+            return {row: session.name.lower() for row, session in self._row_sessions.items()}
+
+    def sample_once(self) -> int:
+        """Take one sample of every session; returns the number of sessions sampled"""
+        self._sync_sessions()
+        current = self._current
+        get_peak = self.backend.get_session_peak
+        for row, session in self._sampled:
+            try:
+                current[row] = get_peak(session)
+            except Exception:
+                # Expired sessions read as silent until the index drops them
+                current[row] = 0.0
+        with self._lock:
+            self._buffer[:, self._pos] = current
+            self._pos = (self._pos + 1) % self.history
+            self._filled = min(self._filled + 1, self.history)
+        if self._listeners:
+            now = time.monotonic()
+            for listener in self._listeners:
+                try:
+                    listener(current, now)
+                except Exception as e:
+                    logger.error(f"❌ Peak meter listener failed: {e}")
+        return len(self._sampled)
+
+    def snapshot(self, points: int = 30) -> MeterSnapshot:
+        """Peak history of every session, max-pooled down to at most points columns"""
+        with self._lock:
+            filled = self._filled
+            rows = tuple(self._rows.items())
+            if not rows or not filled:
+                return MeterSnapshot((), (), np.zeros((0, 0), dtype=np.float32))
+            order = np.arange(self._pos - filled, self._pos) % self.history
+            data = self._buffer[[row for _, row in rows]][:, order]
+            names = tuple(self._row_sessions[row].name for _, row in rows)
+        points = max(1, min(points, filled))
+        bounds = np.linspace(0, filled, points, endpoint=False).astype(np.intp)
+        levels = np.maximum.reduceat(data, bounds, axis=1)
+        return MeterSnapshot(tuple(key for key, _ in rows), names, levels)
+
+    def app_levels(self, window: int = 1) -> Dict[str, float]:
+        """Highest peak per app (lowercase name) over the last window samples"""
+        with self._lock:
+            filled = min(window, self._filled)
+            if not filled:
+                return {}
+            order = np.arange(self._pos - filled, self._pos) % self.history
+            peaks = self._buffer[:, order].max(axis=1)
+            levels: Dict[str, float] = {}
+            for row, session in self._row_sessions.items():
+                name = session.name.lower()
+                levels[name] = max(levels.get(name, 0.0), float(peaks[row]))
+        return levels
+
+    def _sync_sessions(self) -> None:
+        """Assign buffer rows to new sessions and free the rows of expired ones"""
+        version = self.session_index.version
+        if version == self._index_version:
+            return
+        sessions = {session.key: session for session in self.session_index.sessions()}
+        with self._lock:
+            self._index_version = version
+            for key in [key for key in self._rows if key not in sessions]:
+                row = self._rows.pop(key)
+                del self._row_sessions[row]
+                self._buffer[row] = 0.0
+                self._current[row] = 0.0
+                self._free.append(row)
+            for key, session in sessions.items():
+                if key in self._rows:
+                    continue
+                if not self._free:
+                    self._grow()
+                row = self._free.pop()
+                self._rows[key] = row
+                self._row_sessions[row] = session
+            self._sampled = tuple(sorted(self._row_sessions.items()))
+            self.rows_version += 1
+
+    def _grow(self) -> None:
+        """Double the number of buffer rows (lock held)"""
+        old_rows = len(self._buffer)
+        buffer = np.zeros((old_rows * 2, self.history), dtype=np.float32)
+        buffer[:old_rows] = self._buffer
+        current = np.zeros(old_rows * 2, dtype=np.float32)
+        current[:old_rows] = self._current
+        self._buffer, self._current = buffer, current
+        self._free.extend(range(old_rows * 2 - 1, old_rows - 1, -1))
+
+    def _run(self) -> None:
+        self.backend.thread_init()
+        try:
+            next_sample = time.monotonic()
+            while not self._stop_event.is_set():
+                rate = self.current_rate()
+                if rate <= 0:
+                    self._wake.wait()
+                    self._wake.clear()
+                    next_sample = time.monotonic()
+                    continue
+                try:
+                    self.sample_once()
+                except Exception as e:
+                    logger.error(f"❌ Peak meter sampling failed: {e}")
+                next_sample += 1.0 / rate
+                delay = next_sample - time.monotonic()
+                if delay > 0:
+                    if self._wake.wait(delay):
+                        # Rate changed: restart the schedule from now
+                        self._wake.clear()
+                        next_sample = time.monotonic()
+                else:
+                    next_sample = time.monotonic()
+        finally:
+            self.backend.thread_uninit()
@@ -0,0 +1,228 @@
+"""
+Profile and config model for App Volume Control.
+Validates config dicts once and exposes them as frozen, slotted objects
+with derived fields precomputed for the hotkey path.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Set, Tuple
+
+from audio import VERIFY_POLICIES, VolumePlan
+from config_watcher import WATCH_BACKENDS
+from fade import FADE_CURVES
+from hotkey_parser import canonical_hotkey
+
+logger = logging.getLogger(__name__)
+
+# Defaults of profile fields, shared by the hotkey path, the GUI and the tray tooltip
+PROFILE_DEFAULTS: Mapping[str, Any] = {
+    'hotkey': '',
+    'low_volume': 20,
+    'high_volume': 100,
+    'apps': (),
+    'enabled': True,
+    'priority': 1,
+    'invert': False,
+    'block_hotkey': True,
+    'fade_ms': 0,
+    'fade_curve': 'linear',
+    'type': 'toggle',
+    'mode': 'toggle',
+    'debounce_ms': 0,
+    'ignore_repeat': True,
+    'trigger_apps': (),
+    'threshold': 0.05,
+    'hold_ms': 500,
+    'release_ms': 500,
+}
+
+# Defaults of the global settings
+CONFIG_DEFAULTS: Mapping[str, Any] = {
+    'autostart': False,
+    'minimize_on_start': False,
+    'audio_write_workers': 1,
+    'volume_verification': 'immediate',
+    'meter_rate_hz': 30.0,
+    'latency_tracing': False,
+    'persist_toggle_state': True,
+    'config_watch': 'auto',
+}
+
+_warned: Set[str] = set()
+
+
+def _warn_once(message: str) -> None:
+    """Log a config problem once instead of on every rebuild"""
+    if message not in _warned:
+        _warned.add(message)
+        logger.warning(message)
+
+
+def _number(data: Mapping[str, Any], key: str, where: str, low: float, high: Optional[float] = None,
+            kind: type = int, defaults: Mapping[str, Any] = PROFILE_DEFAULTS) -> Any:
+    """Field converted to kind and clamped to [low, high]; the default if it is not a number"""
+    default = defaults[key]
+    value = data.get(key, default)
+    try:
+        value = kind(value)
+    except (TypeError, ValueError, OverflowError):
+        _warn_once(f"Invalid {key} {value!r} in {where}, using {default}")
+        return default
+    if value < low or (high is not None and value > high):
+        clamped = max(low, value) if high is None else min(max(low, value), high)
+        _warn_once(f"{key} {value} in {where} is out of range, using {clamped}")
+        return kind(clamped)
+    return value
+
+
+def _choice(data: Mapping[str, Any], key: str, choices: Tuple[str, ...], where: str = 'config',
+            defaults: Mapping[str, Any] = CONFIG_DEFAULTS) -> str:
+    """Field that must be one of choices (case-insensitive), lowercased; the default otherwise"""
+    default = defaults[key]
+    value = str(data.get(key, default)).lower()
+    if value not in choices:
+        _warn_once(f"Unknown {key} {data.get(key)!r} in {where}, using '{default}'")
+        return default
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    """One configured profile with defaults applied (index is its position in the config)"""
+    index: int
+    name: str
+    hotkey: str                  # canonical text (see hotkey_parser), '' if none
+    hotkey_text: str             # as written in the config
+    apps: Tuple[str, ...]        # as configured, including 'system'
+    app_targets: Tuple[str, ...] # apps without 'system'
+    app_set: FrozenSet[str]      # lowercase app_targets
+    has_system: bool
+    low: int
+    high: int
+    invert: bool
+    priority: int
+    enabled: bool
+    block_hotkey: bool
+    fade_ms: int                 # 0 = switch instantly
+    fade_curve: str              # one of FADE_CURVES
+    kind: str                    # 'toggle' (hotkey) or 'duck' (automatic)
+    hold: bool                   # hotkey lowers while held and restores on release
+    debounce_ms: int             # presses closer than this to the last accepted one are dropped
+    ignore_repeat: bool          # a held key acts once, not at the OS key-repeat rate
+    trigger_set: FrozenSet[str]  # duck: lowercase apps whose sound ducks the targets
+    threshold: float             # duck: peak level (0.0-1.0) that counts as sound
+    hold_ms: int                 # duck: quiet time before restoring
+    release_ms: int              # duck: fade duration when restoring
+
+    @classmethod
+    def from_dict(cls, index: int, data: Mapping[str, Any]) -> 'Profile':
+        """Validate a profile dict from the config and precompute derived fields"""
+        name = str(data.get('name', f'Profile {index+1}'))
+        where = f"profile {name}"
+        apps = tuple(str(app) for app in data.get('apps', PROFILE_DEFAULTS['apps']))
+        app_targets = tuple(t for t in apps if t.lower() != 'system')
+        hotkey_text = str(data.get('hotkey', PROFILE_DEFAULTS['hotkey']) or '')
+        fade_curve = str(data.get('fade_curve', PROFILE_DEFAULTS['fade_curve'])).lower()
+        if fade_curve not in FADE_CURVES:
+            _warn_once(f"Unknown fade_curve '{fade_curve}' in profile {name}, using linear")
+            fade_curve = 'linear'
+        return cls(
+            index=index,
+            name=name,
+            hotkey=canonical_hotkey(hotkey_text) if hotkey_text.strip() else '',
+            hotkey_text=hotkey_text,
+            apps=apps,
+            app_targets=app_targets,
+            app_set=frozenset(t.lower() for t in app_targets),
+            has_system=len(app_targets) != len(apps),
+            low=_number(data, 'low_volume', where, 0, 100),
+            high=_number(data, 'high_volume', where, 0, 100),
+            invert=bool(data.get('invert', PROFILE_DEFAULTS['invert'])),
+            priority=_number(data, 'priority', where, 1, 100),
+            enabled=bool(data.get('enabled', PROFILE_DEFAULTS['enabled'])),
+            block_hotkey=bool(data.get('block_hotkey', PROFILE_DEFAULTS['block_hotkey'])),
+            fade_ms=_number(data, 'fade_ms', where, 0),
+            fade_curve=fade_curve,
+            kind=_choice(data, 'type', ('toggle', 'duck'), where, PROFILE_DEFAULTS),
+            hold=_choice(data, 'mode', ('toggle', 'hold'), where, PROFILE_DEFAULTS) == 'hold',
+            debounce_ms=_number(data, 'debounce_ms', where, 0),
+            ignore_repeat=bool(data.get('ignore_repeat', PROFILE_DEFAULTS['ignore_repeat'])),
+            trigger_set=frozenset(str(t).lower() for t in data.get('trigger_apps', PROFILE_DEFAULTS['trigger_apps'])),
+            threshold=_number(data, 'threshold', where, 0.0, 1.0, kind=float),
+            hold_ms=_number(data, 'hold_ms', where, 0),
+            release_ms=_number(data, 'release_ms', where, 0),
+        )
+
+    def target_volume(self, volume_low: bool) -> int:
+        """Volume this profile switches to for the given hotkey state"""
+        if self.invert:
+            # Inverted logic: when state is low, go to low (but this is actually high volume)
+            # when state is high, go to high (but this is actually low volume)
+            return self.low if volume_low else self.high
+        # Normal logic: when state is low, go to high; when state is high, go to low
+        return self.high if volume_low else self.low
+
+    def build_plan(self, volume_low: bool) -> VolumePlan:
+        """Volume plan of this profile alone"""
+        plan = VolumePlan()
+        self.add_to_plan(plan, volume_low)
+        return plan
+
+    def add_to_plan(self, plan: VolumePlan, volume_low: bool) -> None:
+        """Add this profile's targets to a plan"""
+        apps = self.app_targets + ('system',) if self.has_system else self.app_targets
+        plan.add(self.index, apps, self.target_volume(volume_low), self.fade_ms, self.fade_curve)
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Validated configuration: profiles plus the global settings (defaults in CONFIG_DEFAULTS)"""
+    profiles: Tuple[Profile, ...]
+    autostart: bool = CONFIG_DEFAULTS['autostart']
+    minimize_on_start: bool = CONFIG_DEFAULTS['minimize_on_start']
+    audio_write_workers: int = CONFIG_DEFAULTS['audio_write_workers']
+    volume_verification: str = CONFIG_DEFAULTS['volume_verification']  # one of VERIFY_POLICIES
+    meter_rate_hz: float = CONFIG_DEFAULTS['meter_rate_hz']
+    latency_tracing: bool = CONFIG_DEFAULTS['latency_tracing']
+    persist_toggle_state: bool = CONFIG_DEFAULTS['persist_toggle_state']
+    config_watch: str = CONFIG_DEFAULTS['config_watch']  # one of WATCH_BACKENDS or 'off'
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> 'Config':
+        """Build from a parsed config (dict or read-only view); invalid settings fall back to defaults"""
+        profiles = data.get('profiles') or ()
+        return cls(
+            profiles=tuple(Profile.from_dict(i, p) for i, p in enumerate(profiles)),
+            autostart=bool(data.get('autostart', CONFIG_DEFAULTS['autostart'])),
+            minimize_on_start=bool(data.get('minimize_on_start', CONFIG_DEFAULTS['minimize_on_start'])),
+            audio_write_workers=_number(data, 'audio_write_workers', 'config', 1, defaults=CONFIG_DEFAULTS),
+            volume_verification=_choice(data, 'volume_verification', VERIFY_POLICIES),
+            meter_rate_hz=_number(data, 'meter_rate_hz', 'config', 1.0, kind=float, defaults=CONFIG_DEFAULTS),
+            latency_tracing=bool(data.get('latency_tracing', CONFIG_DEFAULTS['latency_tracing'])),
+            persist_toggle_state=bool(data.get('persist_toggle_state', CONFIG_DEFAULTS['persist_toggle_state'])),
+            config_watch=_choice(data, 'config_watch', WATCH_BACKENDS + ('off',)),
+        )
+
+    @property
+    def enabled_profiles(self) -> Tuple[Profile, ...]:
+        return tuple(p for p in self.profiles if p.enabled)
+
+
+_model_cache: Dict[int, Tuple[Mapping[str, Any], Config]] = {}
+
+
+def config_model(data: Mapping[str, Any]) -> Config:
+    """
+    Config model of a parsed config. Read-only views from load_config_view are
+    built once and reused until the file changes; mutable dicts are rebuilt.
+    """
+    if isinstance(data, dict):
+        return Config.from_mapping(data)
+    cached = _model_cache.get(id(data))
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    model = Config.from_mapping(data)
+    _model_cache.clear()
+    _model_cache[id(data)] = (data, model)
+    return model
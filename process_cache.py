@@ -0,0 +1,66 @@
+"""
+Process name cache for App Volume Control.
+Resolves PIDs to process names once, validating entries against the process
+start time so a reused PID never returns the name of a dead process.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class ProcessNameCache:
+    """Bounded LRU cache of pid -> (create_time, name)"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[int, Tuple[float, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def name_of(self, proc: Any, create_time: Optional[float] = None) -> str:
+        """
+        Name of a psutil.Process. create_time may be passed when it is already
+        known (e.g. from process_iter attrs); otherwise proc.create_time() is used,
+        which psutil caches on the Process object.
+        """
+        if create_time is None:
+            create_time = proc.create_time()
+        pid = proc.pid
+        with self._lock:
+            entry = self._entries.get(pid)
+            if entry is not None and entry[0] == create_time:
+                self._entries.move_to_end(pid)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        name = proc.name()
+        self.put(pid, create_time, name)
+        return name
+
+    def put(self, pid: int, create_time: float, name: str) -> None:
+        """Store a resolved name, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[pid] = (create_time, name)
+            self._entries.move_to_end(pid)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, pid: int) -> None:
+        """Forget a PID (e.g. after its process exited)"""
+        with self._lock:
+            self._entries.pop(pid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global process name cache shared by audio enumeration and the process list
+process_names = ProcessNameCache()
@@ -0,0 +1,173 @@
+"""
+Profile storage for App Volume Control.
+Holds the configured profiles with name, hotkey and app indexes that are
+updated incrementally as profiles are added, edited, renamed or deleted.
+"""
+
+import bisect
+from dataclasses import replace
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from config import freeze_config, thaw_config
+from hotkey_parser import canonical_hotkey
+from models import Profile
+
+
+def _insert(index: Dict[str, Tuple[Profile, ...]], key: str, profile: Profile) -> None:
+    """Add profile to index[key], keeping config order"""
+    group = index.get(key, ())
+    position = bisect.bisect_left([p.index for p in group], profile.index)
+    index[key] = group[:position] + (profile,) + group[position:]
+
+
+def _discard(index: Dict[str, Tuple[Profile, ...]], key: str, profile: Profile) -> None:
+    group = tuple(p for p in index.get(key, ()) if p is not profile)
+    if group:
+        index[key] = group
+    else:
+        index.pop(key, None)
+
+
+def _copy(data: Mapping[str, Any]) -> Mapping[str, Any]:
+    # Views from load_config_view are read-only; the GUI edits its dicts in place, so keep a copy
+    return data if type(data) is MappingProxyType else thaw_config(data)
+
+
+def _same(stored: Mapping[str, Any], data: Mapping[str, Any]) -> bool:
+    if stored is data:
+        return True
+    if type(stored) is type(data):
+        return stored == data
+    # Read-only view against a dict: lists and tuples only compare equal once both are frozen
+    return freeze_config(stored) == freeze_config(data)
+
+
+class ProfileStore:
+    """
+    Profiles in config order with lookup indexes.
+
+    name -> profiles, canonical hotkey -> toggle profiles and lowercase app ->
+    profiles controlling it are kept in step with every change, so lookups are dictionary hits and an edit only touches
+    the entries of the profile that changed. Each change returns the canonical
+    hotkeys whose profiles were affected.
+    """
+
+    def __init__(self):
+        self._profiles: List[Profile] = []
+        self._raw: List[Mapping[str, Any]] = []  # copies of the dicts the profiles were built from
+        self._names: Dict[str, Tuple[Profile, ...]] = {}  # duplicates are possible in a hand-edited config
+        self._hotkeys: Dict[str, Tuple[Profile, ...]] = {}
+        self._apps: Dict[str, Tuple[Profile, ...]] = {}  # lowercase target app (or 'system') -> profiles
+
+    # --- Lookups ---
+
+    @property
+    def profiles(self) -> Tuple[Profile, ...]:
+        return tuple(self._profiles)
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __getitem__(self, index: int) -> Profile:
+        return self._profiles[index]
+
+    def built_from(self, index: int, data: Mapping[str, Any]) -> Optional[Profile]:
+        """The profile at index if it was built from data as it is now, None if data changed since"""
+        if 0 <= index < len(self._profiles) and _same(self._raw[index], data):
+            return self._profiles[index]
+        return None
+
+    def index_of(self, name: str) -> Optional[int]:
+        """Position of the first profile with this name, None if there is none"""
+        group = self._names.get(name)
+        return group[0].index if group else None
+
+    def by_hotkey(self, hotkey: str) -> Tuple[Profile, ...]:
+        """Toggle profiles bound to a hotkey in any spelling (enabled or not), in config order"""
+        return self._hotkeys.get(canonical_hotkey(hotkey), ())
+
+    def by_app(self, app: str) -> Tuple[Profile, ...]:
+        """Profiles of either kind whose targets include an app (any case, 'system' too), in config order"""
+        return self._apps.get(app.lower(), ())
+
+    def hotkey_index(self) -> Dict[str, Tuple[Profile, ...]]:
+        """Copy of the canonical hotkey -> toggle profiles index"""
+        return dict(self._hotkeys)
+
+    # --- Changes ---
+
+    def add(self, data: Mapping[str, Any]) -> Set[str]:
+        """Append a profile"""
+        return self._splice(len(self._profiles), len(self._profiles), [_copy(data)])
+
+    def update(self, index: int, data: Mapping[str, Any]) -> Set[str]:
+        """Replace the profile at index (edit or rename)"""
+        return self._splice(index, index + 1, [_copy(data)])
+
+    def remove(self, index: int) -> Set[str]:
+        """Delete the profile at index; later profiles move up one position"""
+        return self._splice(index, index + 1, [])
+
+    def sync(self, profiles: Sequence[Mapping[str, Any]]) -> Set[str]:
+        """
+        Make the store match a config's profile list. Unchanged profiles at the
+        start and end are kept, so a single add, edit or delete rebuilds one profile.
+        """
+        old = self._raw
+        start = 0
+        limit = min(len(old), len(profiles))
+        while start < limit and _same(old[start], profiles[start]):
+            start += 1
+        old_end, new_end = len(old), len(profiles)
+        while old_end > start and new_end > start and _same(old[old_end - 1], profiles[new_end - 1]):
+            old_end -= 1
+            new_end -= 1
+        # Unchanged profiles keep the caller's kind of copy (a read-only view at startup, dicts
+        # from the GUI later), so the next comparison does not have to freeze both sides
+        unchanged = [(i, i) for i in range(start)] + [(i, i - old_end + new_end) for i in range(old_end, len(old))]
+        for i, j in unchanged:
+            if type(old[i]) is not type(profiles[j]):
+                old[i] = _copy(profiles[j])
+        if start == old_end and start == new_end:
+            return set()
+        return self._splice(start, old_end, [_copy(data) for data in profiles[start:new_end]])
+
+    def _splice(self, start: int, stop: int, items: List[Mapping[str, Any]]) -> Set[str]:
+        """Replace profiles[start:stop] with profiles built from items; returns the affected hotkeys"""
+        shift = len(items) - (stop - start)
+        # Profiles after the spliced range only need re-indexing when their position moves
+        end = len(self._profiles) if shift else stop
+        affected: Set[str] = set()
+        for profile in self._profiles[start:end]:
+            self._unindex(profile)
+            if profile.hotkey:
+                affected.add(profile.hotkey)
+        built = [Profile.from_dict(start + i, data) for i, data in enumerate(items)]
+        moved = [replace(profile, index=profile.index + shift) for profile in self._profiles[stop:end]]
+        self._profiles[start:end] = built + moved
+        self._raw[start:stop] = items
+        for profile in self._profiles[start:end + shift]:
+            self._index(profile)
+            if profile.hotkey:
+                affected.add(profile.hotkey)
+        return affected
+
+    def _index(self, profile: Profile) -> None:
+        _insert(self._names, profile.name, profile)
+        # Duck profiles are started by audio, their hotkey field is not used
+        if profile.hotkey and profile.kind == 'toggle':
+            _insert(self._hotkeys, profile.hotkey, profile)
+        for app in profile.app_set:
+            _insert(self._apps, app, profile)
+        if profile.has_system:
+            _insert(self._apps, 'system', profile)
+
+    def _unindex(self, profile: Profile) -> None:
+        _discard(self._names, profile.name, profile)
+        if profile.hotkey and profile.kind == 'toggle':
+            _discard(self._hotkeys, profile.hotkey, profile)
+        for app in profile.app_set:
+            _discard(self._apps, app, profile)
+        if profile.has_system:
+            _discard(self._apps, 'system', profile)
@@ -0,0 +1,239 @@
+"""
+pycaw audio backend for App Volume Control.
+Talks to the Windows Core Audio API through pycaw/comtypes.
+"""
+
+import threading
+import logging
+from typing import Dict, List, Optional
+
+import comtypes
+from comtypes import CLSCTX_ALL, cast, POINTER
+from pycaw.pycaw import AudioUtilities, ISimpleAudioVolume, IAudioEndpointVolume, IAudioMeterInformation
+from pycaw.callbacks import AudioSessionNotification, AudioSessionEvents, MMNotificationClient
+
+from process_cache import process_names
+from audio_backend import (AudioBackend, AudioDevice, BackendSession, DefaultDeviceChangedCallback,
+                           SessionCreatedCallback, SessionExpiredCallback)
+
+logger = logging.getLogger(__name__)
+
+
+class _SessionCreatedListener(AudioSessionNotification):
+    """Forwards IAudioSessionNotification::OnSessionCreated to the backend"""
+
+    def __init__(self, backend: 'PycawAudioBackend'):
+        super().__init__()
+        self.backend = backend
+
+    def on_session_created(self, new_session):
+        # pycaw hands over an AudioSession already queried for IAudioSessionControl2
+        self.backend._emit_created_session(new_session)
+
+
+class _SessionStateListener(AudioSessionEvents):
+    """Reports expiry/disconnect of a single session to the backend"""
+
+    def __init__(self, backend: 'PycawAudioBackend', key: str):
+        super().__init__()
+        self.backend = backend
+        self.key = key
+
+    def on_state_changed(self, new_state, new_state_id):
+        if new_state == "Expired":
+            self.backend._emit_expired(self.key)
+
+    def on_session_disconnected(self, disconnect_reason, disconnect_reason_id):
+        self.backend._emit_expired(self.key)
+
+
+class _DeviceListener(MMNotificationClient):
+    """Reports default render device changes and removals to the backend"""
+
+    def __init__(self, callback: DefaultDeviceChangedCallback):
+        super().__init__()
+        self.callback = callback
+
+    def on_default_device_changed(self, flow, flow_id, role, role_id, default_device_id):
+        if flow == "eRender":
+            self.callback()
+
+    def on_device_removed(self, removed_device_id):
+        self.callback()
+
+    def on_device_state_changed(self, device_id, new_state, new_state_id):
+        self.callback()
+
+
+class PycawAudioBackend(AudioBackend):
+    """Audio backend built on pycaw"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._on_created: Optional[SessionCreatedCallback] = None
+        self._on_expired: Optional[SessionExpiredCallback] = None
+        self._session_manager = None
+        self._created_listener = None
+        self._known: Dict[str, BackendSession] = {}
+        self._device_enumerator = None
+        self._device_listener = None
+
+    def thread_init(self) -> None:
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+
+    def thread_uninit(self) -> None:
+        comtypes.CoUninitialize()
+
+    def _wrap_session(self, session) -> Optional[BackendSession]:
+        try:
+            proc = session.Process
+            if not proc:
+                return None
+            name = process_names.name_of(proc)
+        except Exception as e:
+            logger.debug(f"Failed to resolve process of PID {session.ProcessId}: {e}")
+            return None
+        try:
+            volume_interface = session._ctl.QueryInterface(ISimpleAudioVolume)
+            meter_interface = session._ctl.QueryInterface(IAudioMeterInformation)
+            key = session._ctl.GetSessionInstanceIdentifier()
+        except Exception as e:
+            logger.debug(f"Failed to get volume interface for {name}: {e}")
+            return None
+        return BackendSession(key, proc.pid, name, (session, volume_interface, meter_interface))
+
+    def list_sessions(self) -> List[BackendSession]:
+        found = self._enumerate()
+        # A reconciliation sweep: watch what it found and forget what is gone
+        self._track(found, prune=True)
+        return found
+
+    def _enumerate(self) -> List[BackendSession]:
+        found = []
+        for session in AudioUtilities.GetAllSessions():
+            wrapped = self._wrap_session(session)
+            if wrapped is not None:
+                found.append(wrapped)
+        return found
+
+    def start_session_notifications(self, on_created: SessionCreatedCallback,
+                                    on_expired: SessionExpiredCallback) -> None:
+        self._on_created = on_created
+        self._on_expired = on_expired
+        self._session_manager = AudioUtilities.GetAudioSessionManager()
+        self._created_listener = _SessionCreatedListener(self)
+        self._session_manager.RegisterSessionNotification(self._created_listener)
+        # Session notifications are only delivered after the enumerator was requested once
+        self._session_manager.GetSessionEnumerator()
+        self._emit_new_sessions()
+
+    def stop_session_notifications(self) -> None:
+        if self._session_manager is not None and self._created_listener is not None:
+            try:
+                self._session_manager.UnregisterSessionNotification(self._created_listener)
+            except Exception as e:
+                logger.debug(f"Failed to unregister session notification: {e}")
+        self._session_manager = None
+        self._created_listener = None
+        self._on_created = None
+        self._on_expired = None
+        with self._lock:
+            self._known.clear()
+
+    def _emit_new_sessions(self) -> None:
+        """Report sessions that appeared since the last enumeration"""
+        callback = self._on_created
+        if callback is not None:
+            for wrapped in self._track(self._enumerate(), prune=True):
+                callback(wrapped)
+
+    def _emit_created_session(self, session) -> None:
+        """Report a session from OnSessionCreated without re-enumerating the others"""
+        callback = self._on_created
+        if callback is None:
+            return
+        wrapped = self._wrap_session(session)
+        if wrapped is not None:
+            for new in self._track([wrapped]):
+                callback(new)
+
+    def _track(self, sessions: List[BackendSession], prune: bool = False) -> List[BackendSession]:
+        """
+        Watch sessions that are not known yet for expiry and return them. With prune
+        (sessions is a full enumeration) known sessions missing from it are dropped.
+        """
+        if self._on_created is None:
+            return []
+        with self._lock:
+            new_sessions = [wrapped for wrapped in sessions if wrapped.key not in self._known]
+            for wrapped in new_sessions:
+                self._known[wrapped.key] = wrapped
+            gone = []
+            if prune:
+                present = {wrapped.key for wrapped in sessions}
+                gone = [self._known.pop(key) for key in list(self._known) if key not in present]
+        for wrapped in gone:
+            try:
+                wrapped.handle[0].unregister_notification()
+            except Exception as e:
+                logger.debug(f"Failed to stop watching session {wrapped.key}: {e}")
+        for wrapped in new_sessions:
+            try:
+                wrapped.handle[0].register_notification(_SessionStateListener(self, wrapped.key))
+            except Exception as e:
+                logger.debug(f"Failed to watch session {wrapped.key}: {e}")
+        return new_sessions
+
+    def _emit_expired(self, key: str) -> None:
+        with self._lock:
+            if self._known.pop(key, None) is None:
+                return
+        callback = self._on_expired
+        if callback is not None:
+            callback(key)
+
+    def get_session_volume(self, session: BackendSession) -> float:
+        return session.handle[1].GetMasterVolume()
+
+    def set_session_volume(self, session: BackendSession, level: float) -> None:
+        session.handle[1].SetMasterVolume(level, None)
+
+    def get_session_peak(self, session: BackendSession) -> float:
+        return session.handle[2].GetPeakValue()
+
+    def get_default_endpoint(self):
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        return cast(interface, POINTER(IAudioEndpointVolume))
+
+    def get_endpoint_volume(self, endpoint) -> float:
+        return endpoint.GetMasterVolumeLevelScalar()
+
+    def set_endpoint_volume(self, endpoint, level: float) -> None:
+        endpoint.SetMasterVolumeLevelScalar(level, None)
+
+    def list_devices(self) -> List[AudioDevice]:
+        try:
+            default_id = AudioUtilities.GetSpeakers().GetId()
+        except Exception:
+            default_id = None
+        devices = []
+        for device in AudioUtilities.GetAllDevices():
+            if device.FriendlyName is None:
+                continue
+            devices.append(AudioDevice(device.id, device.FriendlyName, device.id == default_id))
+        return devices
+
+    def start_device_notifications(self, on_default_changed: DefaultDeviceChangedCallback) -> None:
+        self._device_enumerator = AudioUtilities.GetDeviceEnumerator()
+        self._device_listener = _DeviceListener(on_default_changed)
+        self._device_enumerator.RegisterEndpointNotificationCallback(self._device_listener)
+
+    def stop_device_notifications(self) -> None:
+        if self._device_enumerator is not None and self._device_listener is not None:
+            try:
+                self._device_enumerator.UnregisterEndpointNotificationCallback(self._device_listener)
+            except Exception as e:
+                logger.debug(f"Failed to unregister device notification: {e}")
+        self._device_enumerator = None
+        self._device_listener = None
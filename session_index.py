@@ -0,0 +1,169 @@
+"""
+Audio session index for App Volume Control.
+Keeps a name-keyed view of live audio sessions up to date from backend
+notifications, with a periodic reconciliation sweep as a safety net.
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from audio_backend import AudioBackend, BackendSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionIndex:
+    """Name-keyed index of audio sessions maintained by create/expire events"""
+
+    def __init__(self, backend: AudioBackend, reconcile_interval: float = 30.0,
+                 miss_reconcile_interval: float = 1.0):
+        self.backend = backend
+        self.reconcile_interval = reconcile_interval
+        self.miss_reconcile_interval = miss_reconcile_interval
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, BackendSession] = {}
+        # Values are replaced, never mutated, so readers can use them without the lock
+        self._by_name: Dict[str, Tuple[BackendSession, ...]] = {}
+        self._started = False
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_reconcile = 0.0
+        self._resubscribe = False
+        self.version = 0  # Incremented whenever the set of indexed sessions changes
+
+    def start(self) -> None:
+        """Subscribe to backend notifications and start the reconciliation thread"""
+        if self._started:
+            return
+        self._started = True
+        self._stop_event.clear()
+        try:
+            self.backend.start_session_notifications(self._on_session_created, self._on_session_expired)
+        except Exception as e:
+            logger.warning(f"Session notifications unavailable, relying on reconciliation: {e}")
+        self.reconcile()
+        if self.reconcile_interval > 0:
+            self._thread = threading.Thread(target=self._reconcile_loop, name="SessionIndexReconcile", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop notifications and the reconciliation thread"""
+        if not self._started:
+            return
+        self._started = False
+        self._stop_event.set()
+        self._wake_event.set()
+        try:
+            self.backend.stop_session_notifications()
+        except Exception as e:
+            logger.debug(f"Error stopping session notifications: {e}")
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def lookup(self, app_names: Iterable[str]) -> List[BackendSession]:
+        """Get sessions for the given process names (case-insensitive)"""
+        by_name = self._by_name
+        found: List[BackendSession] = []
+        for name in app_names:
+            sessions = by_name.get(name.lower())
+            if sessions:
+                found.extend(sessions)
+        return found
+
+    def lookup_or_reconcile(self, app_names: Iterable[str]) -> List[BackendSession]:
+        """Look up sessions, re-enumerating once (throttled) if none were found"""
+        app_names = list(app_names)
+        found = self.lookup(app_names)
+        if not found and time.monotonic() - self._last_reconcile >= self.miss_reconcile_interval:
+            self.reconcile()
+            found = self.lookup(app_names)
+        return found
+
+    def sessions(self) -> Tuple[BackendSession, ...]:
+        """Get all indexed sessions"""
+        with self._lock:
+            return tuple(self._by_key.values())
+
+    def names(self) -> List[str]:
+        """Get the original process names of all indexed sessions"""
+        with self._lock:
+            return sorted({session.name for session in self._by_key.values()})
+
+    def request_reconcile(self) -> None:
+        """Ask the reconciliation thread to sweep as soon as possible"""
+        self._wake_event.set()
+
+    def request_resubscribe(self) -> None:
+        """Re-create the backend subscription and sweep (e.g. after a default device change)"""
+        self._resubscribe = True
+        self._wake_event.set()
+    
+    def _resubscribe_now(self) -> None:
+        self._resubscribe = False
+        try:
+            self.backend.stop_session_notifications()
+            self.backend.start_session_notifications(self._on_session_created, self._on_session_expired)
+        except Exception as e:
+            logger.warning(f"Could not re-subscribe to session notifications: {e}")
+    
+    def reconcile(self) -> None:
+        """Replace the index contents with a fresh enumeration from the backend"""
+        try:
+            sessions = self.backend.list_sessions()
+        except Exception as e:
+            logger.error(f"Session reconciliation failed: {e}")
+            return
+        self._last_reconcile = time.monotonic()
+        with self._lock:
+            fresh = {session.key: session for session in sessions}
+            added = fresh.keys() - self._by_key.keys()
+            removed = self._by_key.keys() - fresh.keys()
+            if not added and not removed:
+                return
+            self._by_key = fresh
+            by_name: Dict[str, List[BackendSession]] = {}
+            for session in fresh.values():
+                by_name.setdefault(session.name.lower(), []).append(session)
+            self._by_name = {name: tuple(items) for name, items in by_name.items()}
+            self.version += 1
+        logger.debug(f"Session index reconciled: +{len(added)} -{len(removed)}")
+
+    def _on_session_created(self, session: BackendSession) -> None:
+        name = session.name.lower()
+        with self._lock:
+            if session.key in self._by_key:
+                return
+            self._by_key[session.key] = session
+            self._by_name[name] = self._by_name.get(name, ()) + (session,)
+            self.version += 1
+
+    def _on_session_expired(self, key: str) -> None:
+        with self._lock:
+            session = self._by_key.pop(key, None)
+            if session is None:
+                return
+            name = session.name.lower()
+            remaining = tuple(s for s in self._by_name.get(name, ()) if s.key != key)
+            if remaining:
+                self._by_name[name] = remaining
+            else:
+                self._by_name.pop(name, None)
+            self.version += 1
+
+    def _reconcile_loop(self) -> None:
+        self.backend.thread_init()
+        try:
+            while not self._stop_event.is_set():
+                self._wake_event.wait(self.reconcile_interval)
+                self._wake_event.clear()
+                if self._stop_event.is_set():
+                    break
+                if self._resubscribe:
+                    self._resubscribe_now()
+                self.reconcile()
+        finally:
+            self.backend.thread_uninit()
@@ -0,0 +1,142 @@
+"""
+Toggle state persistence for App Volume Control.
+Keeps per-hotkey toggle states in an append-only state file so the first
+press after a restart goes in the right direction.
+"""
+
+import os
+import json
+import threading
+import logging
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from config import get_exe_directory
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "state.jsonl"
+
+# hotkey: (names of the profiles it toggled, volume_low)
+SavedStates = Dict[str, Tuple[FrozenSet[str], bool]]
+
+
+def get_state_path() -> str:
+    """Get the path to the toggle state file (next to config.json)"""
+    return os.path.join(get_exe_directory(), STATE_FILE)
+
+
+class StateStore:
+    """
+    Append-only log of toggle states, written by a background thread.
+
+    record() only updates an in-memory map and wakes the writer, so it never
+    waits for the disk. The writer appends the latest state of every changed
+    hotkey once per flush_interval; load() replays the log (last line wins)
+    and compacts it once it holds many superseded lines.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.5, compact_lines: int = 1000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.compact_lines = compact_lines
+        self.states: SavedStates = {}
+        self._pending: SavedStates = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> SavedStates:
+        """Read the state file; unreadable lines (e.g. a torn last write) are skipped"""
+        states: SavedStates = {}
+        lines = 0
+        torn = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    lines += 1
+                    torn = not line.endswith('\n')
+                    try:
+                        entry = json.loads(line)
+                        states[entry['hotkey']] = (frozenset(entry['profiles']), bool(entry['volume_low']))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not read toggle states from {self.path}: {e}")
+        with self._lock:
+            self.states = states
+        # A torn last line would swallow the next append, so rewrite the file then too
+        if torn or lines > max(self.compact_lines, 2 * len(states)):
+            self._compact(states)
+        return dict(states)
+
+    def start(self) -> None:
+        """Start the writer thread if it is not running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="StateStore", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Write pending states and stop the writer thread"""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def record(self, hotkey: str, profiles: Iterable[str], volume_low: bool) -> None:
+        """Remember a hotkey's toggle state; written by the background thread"""
+        state = (frozenset(profiles), volume_low)
+        with self._lock:
+            if self.states.get(hotkey) == state:
+                return
+            self.states[hotkey] = state
+            self._pending[hotkey] = state
+        self._wake.set()
+
+    def get(self, hotkey: str, profiles: Iterable[str]) -> Optional[bool]:
+        """Saved volume_low of a hotkey, if it was saved for the same set of profiles"""
+        saved = self.states.get(hotkey)
+        if saved is None or saved[0] != frozenset(profiles):
+            return None
+        return saved[1]
+
+    def flush(self) -> None:
+        """Append the states recorded since the last flush"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(self._line(hotkey, state) for hotkey, state in pending.items()))
+        except OSError as e:
+            logger.warning(f"Could not save toggle states to {self.path}: {e}")
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait()
+            # Let a burst of toggles collect into one append (stop() cuts the wait short)
+            self._stopping.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _compact(self, states: SavedStates) -> None:
+        """Rewrite the log with one line per hotkey"""
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(self._line(hotkey, state) for hotkey, state in states.items()))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not compact toggle state file {self.path}: {e}")
+
+    @staticmethod
+    def _line(hotkey: str, state: Tuple[FrozenSet[str], bool]) -> str:
+        return json.dumps({'hotkey': hotkey, 'profiles': sorted(state[0]), 'volume_low': state[1]},
+                          ensure_ascii=False) + '\n'
@@ -0,0 +1,147 @@
+"""
+Latency tracing for App Volume Control.
+Times the stages of the hotkey path with the monotonic clock and aggregates
+them into per-stage log-linear histograms. Off unless enabled.
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of nanosecond durations.
+
+    Values below 2**SUB_BITS get one bucket each; above that every power of two
+    is split into 2**(SUB_BITS - 1) equal buckets, so any recorded value is
+    reported within ~3% while recording stays O(1) with no allocation.
+    """
+
+    SUB_BITS = 6
+    MAX_EXPONENT = 42  # ~73 minutes in nanoseconds; longer values land in the last bucket
+
+    def __init__(self):
+        half = 1 << (self.SUB_BITS - 1)
+        self._half = half
+        self._counts: List[int] = [0] * ((self.MAX_EXPONENT - self.SUB_BITS + 2) * half + half)
+        self._last = len(self._counts) - 1
+        self.count = 0
+        self.max = 0
+
+    def _value(self, index: int) -> int:
+        """Upper bound of a bucket"""
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        return ((index - shift * self._half + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        # No lock: a lost increment under a rare thread switch only nudges the estimate
+        shift = value.bit_length() - self.SUB_BITS
+        if shift <= 0:
+            index = value if value > 0 else 0
+        else:
+            index = (shift + 1) * self._half + (value >> shift) - self._half
+            if index >= self._last:
+                index = self._last
+        self._counts[index] += 1
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> int:
+        """Smallest bucket bound that covers percent of the recorded values"""
+        counts = self._counts
+        total = sum(counts)
+        if not total:
+            return 0
+        threshold = max(1, int(total * percent / 100.0 + 0.5))
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= threshold:
+                return min(self._value(index), self.max)
+        return self.max
+
+
+class Tracer:
+    """
+    Per-stage latency histograms.
+
+    Call sites use start()/stop() so the disabled path is one attribute check:
+        t0 = tracer.start()
+        ...
+        tracer.stop('stage', t0)
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+        logger.info("Latency tracing enabled")
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def start(self) -> int:
+        """Timestamp to pass to stop(), or 0 when tracing is off"""
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def stop(self, stage: str, started: int) -> None:
+        """Record the time since started under stage (no-op for started == 0)"""
+        if started:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histogram(stage)
+            histogram.record(time.perf_counter_ns() - started)
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histogram(stage)
+        histogram.record(duration_ns)
+
+    def _histogram(self, stage: str) -> LatencyHistogram:
+        with self._lock:
+            return self._histograms.setdefault(stage, LatencyHistogram())
+
+    def reset(self) -> None:
+        """Clear all recorded spans"""
+        with self._lock:
+            self._histograms = {}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count and p50/p95/p99/max in milliseconds per stage"""
+        result = {}
+        for stage, histogram in sorted(self._histograms.items()):
+            if not histogram.count:
+                continue
+            result[stage] = {
+                'count': histogram.count,
+                'p50': histogram.percentile(50) / 1e6,
+                'p95': histogram.percentile(95) / 1e6,
+                'p99': histogram.percentile(99) / 1e6,
+                'max': histogram.max / 1e6,
+            }
+        return result
+
+    def log_summary(self) -> None:
+        """Write the per-stage latency table to the log"""
+        summary = self.summary()
+        if not summary:
+            return
+        logger.info("Hotkey latency (ms):")
+        for stage, stats in summary.items():
+            logger.info(f"  {stage:<20} n={stats['count']:<6} p50 {stats['p50']:8.3f}  p95 {stats['p95']:8.3f}"
+                        f"  p99 {stats['p99']:8.3f}  max {stats['max']:8.3f}")
+
+
+# Global tracer instance
+tracer = Tracer()
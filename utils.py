@@ -8,6 +8,10 @@ import sys
 import ctypes
 from PIL import Image
 import logging
+from typing import Sequence
+
+from models import Profile
+from process_cache import process_names
 
 logger = logging.getLogger(__name__)
 
@@ -82,9 +86,14 @@ def get_all_processes() -> list:
     try:
         import psutil
         all_names = set()
-        for proc in psutil.process_iter(['name', 'username']):
-            name = proc.info['name']
-            if name and proc.info['username']:
+        for proc in psutil.process_iter(['create_time', 'username']):
+            if not proc.info['username'] or proc.info['create_time'] is None:
+                continue
+            try:
+                name = process_names.name_of(proc, proc.info['create_time'])
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if name:
                 all_names.add(name)
         return sorted(all_names)
     except Exception as e:
@@ -92,23 +101,16 @@ def get_all_processes() -> list:
         return []
 
 
-def format_tooltip(profiles: list) -> str:
+def format_tooltip(profiles: Sequence[Profile]) -> str:
     """Format tooltip text for tray icon"""
     if not profiles:
         return "App Volume Control\nNo enabled profiles"
     
     # Find first enabled profile
-    first_enabled_profile = None
-    for profile in profiles:
-        if profile.get('enabled', True):
-            first_enabled_profile = profile
-            break
+    first_enabled_profile = next((profile for profile in profiles if profile.enabled), None)
     
     if first_enabled_profile:
-        profile_name = first_enabled_profile.get('name', 'Profile 1')
-        hotkey = first_enabled_profile.get('hotkey', '').upper()
-        low = first_enabled_profile.get('low_volume', 0)
-        high = first_enabled_profile.get('high_volume', 0)
-        return f"App Volume Control\n{profile_name}: {hotkey}\nVolume: {low}% ↔ {high}%"
+        profile = first_enabled_profile
+        return f"App Volume Control\n{profile.name}: {profile.hotkey.upper()}\nVolume: {profile.low}% ↔ {profile.high}%"
     else:
         return "App Volume Control\nNo enabled profiles" 
\ No newline at end of file